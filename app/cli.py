@@ -0,0 +1,187 @@
+"""
+Command-line entry point.
+
+    python -m app.cli validate pack.ndjson --workers 8 --out results.ndjson
+    python -m app.cli convert pack.ndjson pack.tplp
+
+Reads one level per line without loading the pack into memory, validates
+levels through validate_levels' bounded window and writes one result per
+line as soon as it is available. Throughput and latency percentiles are
+printed to stderr at the end.
+
+`convert` turns an NDJSON pack into a binary level pack (services.level_codec);
+`validate` accepts either, and reads binary packs through a memory map.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+app_dir = Path(__file__).resolve().parent
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from services.validator import validate_levels  # noqa: E402
+from services.level_codec import BinaryLevel, LevelPack, is_level_pack, write_pack  # noqa: E402
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(pct / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def read_levels(lines: Iterator[str], pending: Dict[int, Tuple[int, str]],
+                out: TextIO, stats: dict, held: Optional[Dict[int, List[str]]] = None) -> Iterator[dict]:
+    """
+    Parse levels line by line. Every yielded level is recorded in `pending`
+    (validate_levels index -> (line number, levelId)); lines that are not JSON
+    objects never reach the validator. Their error records are written
+    straight to `out`, or, given `held`, kept there under the index of the
+    next level so they can be written in input order.
+    """
+    index = 0
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            level_data = json.loads(line)
+            if not isinstance(level_data, dict):
+                raise ValueError("line is not a JSON object")
+        except ValueError as e:
+            stats["invalid"] += 1
+            record = json.dumps({
+                "line": line_number,
+                "error": {"code": "INVALID_REQUEST", "message": f"Line is not a valid level: {e}"}
+            }) + "\n"
+            if held is None:
+                out.write(record)
+            else:
+                held.setdefault(index, []).append(record)
+            continue
+        pending[index] = (line_number, level_data.get("levelId"))
+        index += 1
+        yield level_data
+
+
+def read_binary_levels(pack: Iterable[memoryview], pending: Dict[int, Tuple[int, str]]) -> Iterator[bytes]:
+    """Binary counterpart of read_levels; the record number stands in for the line number"""
+    for index, blob in enumerate(pack):
+        level_data = blob.tobytes()
+        try:
+            level_id = BinaryLevel(level_data).level_id
+        except ValueError:
+            level_id = None  # validate_level reports the malformed record
+        pending[index] = (index + 1, level_id)
+        yield level_data
+
+
+def validate_pack(lines: Union[Iterator[str], LevelPack], out: TextIO, workers: int = None,
+                  chunksize: int = 16, ordered: bool = False, window: int = None) -> dict:
+    """
+    Validate an NDJSON stream of levels, or a binary LevelPack, writing NDJSON
+    results; returns summary stats
+    """
+    stats = {"levels": 0, "invalid": 0, "solvable": 0, "unsolvable": 0, "errors": 0}
+    latencies: List[float] = []
+    pending: Dict[int, Tuple[int, str]] = {}
+    # Unparseable lines waiting for the results before them, when ordered
+    held: Optional[Dict[int, List[str]]] = {} if ordered else None
+
+    start = time.perf_counter()
+    if isinstance(lines, LevelPack):
+        levels = read_binary_levels(lines, pending)
+    else:
+        levels = read_levels(lines, pending, out, stats, held)
+    for index, result in validate_levels(levels, workers=workers, chunksize=chunksize,
+                                         ordered=ordered, window=window):
+        if held:
+            out.writelines(held.pop(index, ()))
+        line_number, level_id = pending.pop(index)
+        stats["levels"] += 1
+        latencies.append(result["executionTimeMs"])
+        if "error" in result:
+            stats["errors"] += 1
+        elif result["solvable"]:
+            stats["solvable"] += 1
+        else:
+            stats["unsolvable"] += 1
+        out.write(json.dumps({"line": line_number, "levelId": level_id, **result}) + "\n")
+    # Unparseable lines after the last level
+    for index in sorted(held or ()):
+        out.writelines(held[index])
+
+    stats["elapsedSeconds"] = time.perf_counter() - start
+    latencies.sort()
+    stats["latencyMs"] = {f"p{pct}": percentile(latencies, pct) for pct in (50, 90, 99)}
+    stats["latencyMs"]["max"] = latencies[-1] if latencies else 0.0
+    return stats
+
+
+def print_summary(stats: dict, stream: TextIO):
+    elapsed = stats["elapsedSeconds"]
+    throughput = stats["levels"] / elapsed if elapsed > 0 else 0.0
+    latency = stats["latencyMs"]
+    print(f"Validated {stats['levels']} levels in {elapsed:.2f}s ({throughput:.1f} levels/s): "
+          f"{stats['solvable']} solvable, {stats['unsolvable']} unsolvable, "
+          f"{stats['errors']} errors, {stats['invalid']} unparseable lines", file=stream)
+    print(f"Latency ms: p50={latency['p50']:.2f} p90={latency['p90']:.2f} "
+          f"p99={latency['p99']:.2f} max={latency['max']:.2f}", file=stream)
+
+
+def convert_pack(lines: Iterator[str], path: str) -> int:
+    """Write an NDJSON stream of levels into a binary level pack; returns the level count"""
+    return write_pack(path, (json.loads(line) for line in lines if line.strip()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Traffic puzzle level tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser("validate", help="validate an NDJSON level pack")
+    validate.add_argument("pack", help="NDJSON file with one level per line, binary level pack, or - for stdin")
+    validate.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    validate.add_argument("--out", default="-", help="NDJSON results file (default: stdout)")
+    validate.add_argument("--chunksize", type=int, default=16, help="levels per worker task")
+    validate.add_argument("--window", type=int, default=None, help="maximum levels held in memory")
+    validate.add_argument("--ordered", action="store_true", help="write results in input order")
+
+    convert = commands.add_parser("convert", help="convert an NDJSON level pack to a binary level pack")
+    convert.add_argument("pack", help="NDJSON file with one level per line, or - for stdin")
+    convert.add_argument("out", help="binary level pack to write")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        source = sys.stdin if args.pack == "-" else open(args.pack)
+        try:
+            count = convert_pack(source, args.out)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        print(f"Wrote {count} levels to {args.out}", file=sys.stderr)
+        return
+
+    if args.pack == "-":
+        source = sys.stdin
+    elif is_level_pack(args.pack):
+        source = LevelPack(args.pack)
+    else:
+        source = open(args.pack)
+    out = sys.stdout if args.out == "-" else open(args.out, "w")
+    try:
+        stats = validate_pack(source, out, workers=args.workers, chunksize=args.chunksize,
+                              ordered=args.ordered, window=args.window)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    print_summary(stats, sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Exhaustive reachability analysis with the visited set and frontier on disk.
+
+ReachabilityExplorer runs a layered breadth-first search in the style of
+external-memory BFS with delayed duplicate detection. States are integer
+keys (see core.state_keys). Each layer lives in a file
+of sorted, unique, fixed-width keys. The visited set is one such file
+holding every layer so far.
+
+Expanding a layer streams its file, buffers successor keys up to
+`batch_size`, and writes each full buffer as a sorted run. The runs are
+merged `fan_in` at a time until one pass can merge them all. That last
+pass is walked in step with the visited file. Keys not yet visited form
+the next layer, and the union becomes the new visited file. RAM stays at
+one buffer plus `fan_in` read buffers, whatever the number of states.
+
+    python -m app.tools.reachability level.json --work-dir /scratch
+"""
+import heapq
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Set
+from models.game_state import GameState
+from models.graph import RoadGraph
+from core.solver import Solver, SearchState
+
+# Keys read or written per file call
+_IO_RECORDS = 1 << 14
+
+
+@dataclass
+class ReachabilityReport:
+    """Outcome of an exhaustive exploration"""
+    states: int  # distinct reachable states, including the initial one
+    layers: List[int] = field(default_factory=list)  # new states per number of transitions
+    dead_ends: int = 0  # unsolved states with no successor
+    solvable: bool = False
+    solution_depth: Optional[int] = None  # fewest transitions to a solved state
+    bytes_written: int = 0  # spilled to disk in total
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "states": self.states,
+            "layers": self.layers,
+            "deadEnds": self.dead_ends,
+            "solvable": self.solvable,
+            "solutionDepth": self.solution_depth,
+            "bytesWritten": self.bytes_written,
+        }
+
+
+class KeyFile:
+    """A file of sorted fixed-width unsigned keys, big-endian so byte order is key order"""
+
+    def __init__(self, path: str, width: int):
+        self.path = path
+        self.width = width
+
+    def __iter__(self) -> Iterator[int]:
+        width = self.width
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(width * _IO_RECORDS)
+                if not chunk:
+                    return
+                for offset in range(0, len(chunk), width):
+                    yield int.from_bytes(chunk[offset:offset + width], "big")
+
+    @property
+    def count(self) -> int:
+        return os.path.getsize(self.path) // self.width
+
+
+class KeyWriter:
+    """Buffered writer of a KeyFile"""
+
+    def __init__(self, path: str, width: int):
+        self.file: BinaryIO = open(path, "wb")
+        self.key_file = KeyFile(path, width)
+        self.buffer: List[bytes] = []
+        self.written = 0
+
+    def write(self, key: int):
+        self.buffer.append(key.to_bytes(self.key_file.width, "big"))
+        if len(self.buffer) >= _IO_RECORDS:
+            self._flush()
+
+    def _flush(self):
+        data = b"".join(self.buffer)
+        self.file.write(data)
+        self.written += len(data)
+        self.buffer.clear()
+
+    def close(self) -> KeyFile:
+        self._flush()
+        self.file.close()
+        return self.key_file
+
+
+class ReachabilityExplorer(Solver):
+    """
+    Counts every state reachable from a level's initial state, keeping the
+    search on disk under `work_dir` (a temporary directory by default).
+    Transitions are the solver's: exits, plus waits for lights and pedestrians.
+    """
+
+    def __init__(self, graph: RoadGraph, work_dir: Optional[str] = None,
+                 batch_size: int = 1 << 20, fan_in: int = 64):
+        super().__init__(graph)
+        if batch_size < 1 or fan_in < 2:
+            raise ValueError("batch_size must be >= 1 and fan_in >= 2")
+        self.work_dir = work_dir
+        self.batch_size = batch_size
+        self.fan_in = fan_in
+
+    def explore(self, initial_state: GameState) -> ReachabilityReport:
+        self._prepare(initial_state)
+        self._keys = keys = self._state_keys(initial_state)
+        width = keys.width
+
+        directory = tempfile.mkdtemp(prefix="reachability-", dir=self.work_dir)
+        self._files = 0
+        try:
+            report = ReachabilityReport(states=1, layers=[1])
+            frontier, visited = (self._write_run({keys.root}, width, directory, report) for _ in range(2))
+            if not keys.full_mask:
+                report.solvable, report.solution_depth = True, 0
+
+            while frontier.count:
+                runs = self._expand_layer(frontier, directory, report)
+                next_frontier, next_visited = self._merge_layer(runs, visited, directory, report)
+                os.remove(frontier.path)
+                os.remove(visited.path)
+                frontier, visited = next_frontier, next_visited
+                if frontier.count:
+                    report.layers.append(frontier.count)
+                    report.states += frontier.count
+            return report
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _expand_layer(self, frontier: KeyFile, directory: str, report: ReachabilityReport) -> List[KeyFile]:
+        """Successor keys of a layer, as sorted runs of at most batch_size unique keys"""
+        keys = self._keys
+        depth = len(report.layers)
+        runs: List[KeyFile] = []
+        buffer: Set[int] = set()
+        for key in frontier:
+            mask = keys.mask(key)
+            if not mask:
+                continue  # solved: nothing left to move
+            successors = 0
+            for successor in self._successors(SearchState(keys.decode(key), [], None)):
+                successors += 1
+                successor_mask = mask
+                if successor.move_sequence:
+                    successor_mask ^= keys.bits[successor.move_sequence[-1]]
+                    if not successor_mask and not report.solvable:
+                        report.solvable, report.solution_depth = True, depth
+                buffer.add(keys.key(successor_mask, successor.game_state.turn_number))
+                if len(buffer) >= self.batch_size:
+                    runs.append(self._write_run(buffer, frontier.width, directory, report))
+            if not successors:
+                report.dead_ends += 1
+        if buffer or not runs:
+            runs.append(self._write_run(buffer, frontier.width, directory, report))
+        return runs
+
+    def _merge_layer(self, runs: List[KeyFile], visited: KeyFile, directory: str,
+                     report: ReachabilityReport):
+        """
+        Merge the runs down to fan_in - 1 files, then walk their merge in step
+        with the visited file: (next layer, visited plus next layer). The runs
+        are deleted once merged.
+        """
+        while len(runs) > self.fan_in - 1:
+            merged = []
+            for start in range(0, len(runs), self.fan_in):
+                group = runs[start:start + self.fan_in]
+                writer = KeyWriter(self._new_path(directory), visited.width)
+                for key in _unique(heapq.merge(*group)):
+                    writer.write(key)
+                merged.append(writer.close())
+                report.bytes_written += writer.written
+                for key_file in group:
+                    os.remove(key_file.path)
+            runs = merged
+
+        layer = KeyWriter(self._new_path(directory), visited.width)
+        union = KeyWriter(self._new_path(directory), visited.width)
+        seen = iter(visited)
+        next_seen = next(seen, None)
+        for key in _unique(heapq.merge(*runs)):
+            while next_seen is not None and next_seen < key:
+                union.write(next_seen)
+                next_seen = next(seen, None)
+            if next_seen != key:
+                layer.write(key)
+            union.write(key)
+            if next_seen == key:
+                next_seen = next(seen, None)
+        while next_seen is not None:
+            union.write(next_seen)
+            next_seen = next(seen, None)
+        next_frontier, next_visited = layer.close(), union.close()
+        report.bytes_written += layer.written + union.written
+        for key_file in runs:
+            os.remove(key_file.path)
+        return next_frontier, next_visited
+
+    def _write_run(self, buffer: Set[int], width: int, directory: str, report: ReachabilityReport) -> KeyFile:
+        writer = KeyWriter(self._new_path(directory), width)
+        for key in sorted(buffer):
+            writer.write(key)
+        buffer.clear()
+        report.bytes_written += writer.written
+        return writer.close()
+
+    def _new_path(self, directory: str) -> str:
+        self._files += 1
+        return os.path.join(directory, str(self._files - 1))
+
+
+def _unique(keys: Iterable[int]) -> Iterator[int]:
+    """Drop repeats from a sorted stream"""
+    last = None
+    for key in keys:
+        if key != last:
+            yield key
+            last = key
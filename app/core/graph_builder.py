@@ -5,10 +5,20 @@ from models.graph import RoadGraph, Node, Position
 class GraphBuilder:
     """Builds graph structure from grid layout"""
     
-    def build_graph(self, width: int, height: int, layout: List[List[str]]) -> RoadGraph:
-        """Build graph from grid dimensions and layout"""
-        graph = RoadGraph(width, height)
-        self._create_nodes(graph, layout)
+    def build_graph(self, width: int, height: int, layout: List[List[str]],
+                    exit_border: bool = False) -> RoadGraph:
+        """
+        Build graph from grid dimensions and layout.
+        With exit_border, width/height describe the layout as given and the graph
+        gets a ring of exit nodes around it (shifting coordinates by +1) without
+        a bordered copy of the layout ever being created.
+        """
+        if exit_border:
+            graph = RoadGraph(width + 2, height + 2)
+            self._create_bordered_nodes(graph, layout)
+        else:
+            graph = RoadGraph(width, height)
+            self._create_nodes(graph, layout)
         self._establish_neighbors(graph)
         return graph
     
@@ -22,6 +32,20 @@ class GraphBuilder:
                 node = Node(node_id, pos, cell_type)
                 graph.add_node(node)
     
+    def _create_bordered_nodes(self, graph: RoadGraph, layout: List[List[str]]):
+        """Create nodes for each cell, treating cells outside the layout as exits"""
+        inner_width = graph.width - 2
+        inner_height = graph.height - 2
+        for y in range(graph.height):
+            row = layout[y - 1] if 1 <= y <= inner_height else None
+            for x in range(graph.width):
+                if row is not None and 1 <= x <= inner_width:
+                    cell_type = CellType(row[x - 1])
+                else:
+                    cell_type = CellType.EXIT
+                node = Node(graph.get_node_id(x, y), Position(x, y), cell_type)
+                graph.add_node(node)
+    
     def _establish_neighbors(self, graph: RoadGraph):
         """Establish neighbor relationships based on explicit road types"""
         for node in graph.nodes.values():
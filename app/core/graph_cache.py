@@ -1,24 +1,91 @@
-import hashlib
-from typing import Dict, Tuple, List, Optional
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
 from models.graph import RoadGraph
+from core.graph_store import DiskGraphCache, GraphSnapshot
+from core.layout_digest import encode_layout, layout_digest
+from core.layout_symmetry import Transform, IDENTITY, TransformedGraph, canonicalize, inverse
+
+
+@dataclass(frozen=True)
+class LayoutKey:
+    """Cache key of a layout, shared by all of its rotations and mirrors"""
+    digest: str           # digest of the canonical layout
+    transform: Transform  # maps the requested layout onto the canonical one
+
 
 class GraphCache:
-    def __init__(self, max_size: int = 100):
-        self.cache: Dict[str, Tuple[RoadGraph, dict]] = {}
+    """
+    Caches compiled graphs by canonical layout.
+    Only the canonical orientation of a layout is compiled and stored; rotated
+    or mirrored variants are served through a TransformedGraph view.
+    Lookups go memory -> bundled snapshot -> disk cache.
+    """
+
+    def __init__(self, max_size: int = 100, disk_cache: Optional[DiskGraphCache] = None,
+                 snapshot: Optional[GraphSnapshot] = None):
+        self.cache: Dict[str, RoadGraph] = {}
         self.max_size = max_size
+        self.disk_cache = disk_cache
+        self.snapshot = snapshot
+        # Raw layout digest -> canonical key, so repeat layouts skip canonicalization
+        self.aliases: Dict[str, LayoutKey] = {}
+        self.views: Dict[Tuple[str, Transform], RoadGraph] = {}
     
-    def get_cache_key(self, layout: List[List[str]]) -> str:
-        """Generate hash key for layout"""
-        layout_str = ''.join([''.join(row) for row in layout])
-        return hashlib.md5(layout_str.encode()).hexdigest()
+    def get_cache_key(self, layout: List[List[str]], width: int, height: int) -> LayoutKey:
+        """
+        Generate hash key for a layout as given (without exit border).
+        Compute it once per request and pass it to get/put/orient.
+        """
+        return self.get_cache_key_encoded(encode_layout(layout, width, height), lambda: layout)
+
+    def get_cache_key_encoded(self, encoded: bytes, get_layout: Callable[[], List[List[str]]]) -> LayoutKey:
+        """
+        Same as get_cache_key for a layout already in encode_layout form
+        (e.g. from a binary level). get_layout is only called when the layout
+        has not been seen before and must be canonicalized.
+        """
+        raw_digest = layout_digest(encoded)
+        key = self.aliases.get(raw_digest)
+        if key is None:
+            canonical, transform = canonicalize(get_layout())
+            key = LayoutKey(layout_digest(canonical), transform)
+            self._bounded_put(self.aliases, raw_digest, key, self.max_size * 8)
+        return key
     
-    def get(self, layout: List[List[str]]) -> Optional[Tuple[RoadGraph, dict]]:
-        key = self.get_cache_key(layout)
-        return self.cache.get(key)
+    def get(self, key: LayoutKey) -> Optional[RoadGraph]:
+        """Return the graph for the requested orientation, or None on a miss"""
+        graph = self.cache.get(key.digest)
+        if graph is None and self.snapshot is not None:
+            # Snapshot entries stay decoded inside the snapshot, outside the LRU
+            graph = self.snapshot.get(key.digest)
+        if graph is None and self.disk_cache is not None:
+            # Second tier: compiled graph written by an earlier process
+            graph = self.disk_cache.get(key.digest)
+            if graph is not None:
+                self._bounded_put(self.cache, key.digest, graph, self.max_size)
+        if graph is None:
+            return None
+        return self.orient(key, graph)
     
-    def put(self, layout: List[List[str]], graph: RoadGraph):
-        if len(self.cache) >= self.max_size:
+    def put(self, key: LayoutKey, graph: RoadGraph):
+        """Store a graph compiled from the canonical layout (see transform_layout)"""
+        self._bounded_put(self.cache, key.digest, graph, self.max_size)
+        if self.disk_cache is not None:
+            self.disk_cache.put(key.digest, graph)
+
+    def orient(self, key: LayoutKey, graph: RoadGraph) -> RoadGraph:
+        """View a canonical graph in the orientation of the requested layout"""
+        if key.transform == IDENTITY:
+            return graph
+        view_key = (key.digest, key.transform)
+        view = self.views.get(view_key)
+        if view is None or view.base is not graph:
+            view = TransformedGraph(graph, inverse(key.transform))
+            self._bounded_put(self.views, view_key, view, self.max_size)
+        return view
+
+    def _bounded_put(self, store: dict, key, value, max_size: int):
+        if key not in store and len(store) >= max_size:
             # Remove oldest entry (simple LRU)
-            self.cache.pop(next(iter(self.cache)))
-        key = self.get_cache_key(layout)
-        self.cache[key] = graph
\ No newline at end of file
+            store.pop(next(iter(store)))
+        store[key] = value
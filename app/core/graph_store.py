@@ -0,0 +1,190 @@
+import mmap
+import os
+import struct
+from typing import Dict, Optional, Tuple
+from models.graph import RoadGraph
+
+# pickle and tempfile are imported where used: without a snapshot or disk
+# cache configured, a cold start never needs them.
+
+# Bump whenever RoadGraph, Node or PathInfo change shape, or when the path
+# calculator produces different paths. Files written by another version are
+# treated as misses and overwritten on the next put.
+FORMAT_VERSION = 1
+
+# Snapshot bundled with the deployment, written by `python -m app.tools.bake_cache`
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     "graph_snapshot.bin")
+
+_MAGIC = b"TPGC"
+_HEADER = struct.Struct("<4sHQ")  # magic, format version, payload length
+
+
+def serialize_graph(graph: RoadGraph) -> bytes:
+    """Serialize a compiled graph (nodes + path lookup) with a versioned header"""
+    import pickle
+    payload = pickle.dumps(graph, protocol=pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(_MAGIC, FORMAT_VERSION, len(payload)) + payload
+
+
+def deserialize_graph(buffer) -> Optional[RoadGraph]:
+    """
+    Rebuild a graph from a buffer produced by serialize_graph.
+    Accepts any object supporting the buffer protocol (bytes, mmap, memoryview).
+    Returns None if the header is missing, foreign or from another version.
+    """
+    import pickle
+    view = memoryview(buffer)
+    if len(view) < _HEADER.size:
+        return None
+    magic, version, length = _HEADER.unpack_from(view, 0)
+    if magic != _MAGIC or version != FORMAT_VERSION:
+        return None
+    if len(view) < _HEADER.size + length:
+        return None
+    return pickle.loads(view[_HEADER.size:_HEADER.size + length])
+
+
+class DiskGraphCache:
+    """
+    Second-tier graph cache stored as one file per layout digest.
+    Files are read through mmap so worker processes on the same host share the
+    page cache, and written atomically so concurrent writers never expose a
+    partial file. Only point this at a directory you control: entries are pickles.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional['DiskGraphCache']:
+        """Create a disk cache from GRAPH_CACHE_DIR, or None if it is not set"""
+        directory = os.environ.get("GRAPH_CACHE_DIR")
+        if not directory:
+            return None
+        try:
+            return cls(directory)
+        except OSError:
+            return None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.v{FORMAT_VERSION}.graph")
+
+    def get(self, key: str) -> Optional[RoadGraph]:
+        import pickle
+        try:
+            with open(self._path(key), "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return deserialize_graph(mm)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+            # Missing, empty (mmap of a 0-byte file) or corrupt entries are misses
+            return None
+
+    def put(self, key: str, graph: RoadGraph):
+        import tempfile
+        data = serialize_graph(graph)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        except OSError:
+            # The disk tier is best effort; a read-only or full disk must not fail requests
+            pass
+
+
+_SNAPSHOT_MAGIC = b"TPGS"
+_SNAPSHOT_HEADER = struct.Struct("<4sHQ")  # magic, format version, index length
+
+
+def write_snapshot(path: str, graphs: Dict[str, RoadGraph]):
+    """
+    Write many compiled graphs into a single snapshot file.
+    Layout: header, pickled index {key: (offset, length)}, then one
+    serialize_graph blob per key, so readers can decode entries individually.
+    """
+    import pickle
+    blobs = {key: serialize_graph(graph) for key, graph in graphs.items()}
+
+    # Offsets are relative to the end of the index
+    index: Dict[str, Tuple[int, int]] = {}
+    offset = 0
+    for key, blob in blobs.items():
+        index[key] = (offset, len(blob))
+        offset += len(blob)
+    index_bytes = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, FORMAT_VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        for blob in blobs.values():
+            f.write(blob)
+    os.replace(tmp_path, path)
+
+
+class GraphSnapshot:
+    """
+    Read-only set of compiled graphs baked at build time (see app.tools.bake_cache).
+    The file is memory-mapped once; entries are decoded on first access and kept,
+    since the snapshot is expected to hold exactly the layouts worth keeping warm.
+    """
+
+    def __init__(self, path: str):
+        import pickle
+        self.path = path
+        self.graphs: Dict[str, RoadGraph] = {}
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_length = _SNAPSHOT_HEADER.unpack_from(self._mm, 0)
+        if magic != _SNAPSHOT_MAGIC or version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} graph snapshot")
+        start = _SNAPSHOT_HEADER.size
+        self.index: Dict[str, Tuple[int, int]] = pickle.loads(self._mm[start:start + index_length])
+        self._data_start = start + index_length
+
+    @classmethod
+    def from_env(cls) -> Optional['GraphSnapshot']:
+        """
+        Open the snapshot named by GRAPH_SNAPSHOT, or the bundled default if present.
+        GRAPH_SNAPSHOT_PRELOAD=eager decodes every entry now instead of on first use.
+        """
+        path = os.environ.get("GRAPH_SNAPSHOT", DEFAULT_SNAPSHOT_PATH)
+        if not path or not os.path.exists(path):
+            return None
+        import pickle
+        try:
+            snapshot = cls(path)
+        except (OSError, ValueError, pickle.UnpicklingError, struct.error):
+            return None
+        if os.environ.get("GRAPH_SNAPSHOT_PRELOAD", "lazy").lower() == "eager":
+            snapshot.load_all()
+        return snapshot
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get(self, key: str) -> Optional[RoadGraph]:
+        graph = self.graphs.get(key)
+        if graph is None and key in self.index:
+            offset, length = self.index[key]
+            offset += self._data_start
+            graph = deserialize_graph(memoryview(self._mm)[offset:offset + length])
+            if graph is not None:
+                self.graphs[key] = graph
+        return graph
+
+    def load_all(self):
+        """Decode every entry up front (eager preload)"""
+        for key in self.index:
+            self.get(key)
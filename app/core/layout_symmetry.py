@@ -0,0 +1,208 @@
+from typing import List, Tuple
+from models.enums import CellType, Orientation, MovementRule, Direction
+from models.graph import RoadGraph, Node, Position
+from models.path import PathInfo
+from core.layout_digest import encode_layout
+
+# A dihedral transform of the grid, stored as the 2x2 integer matrix (a, b, c, d):
+#   x' = a*x + b*y (+ offset),  y' = c*x + d*y (+ offset)
+# Offsets shift mirrored axes back into range, see transform_point.
+Transform = Tuple[int, int, int, int]
+
+IDENTITY: Transform = (1, 0, 0, 1)
+
+TRANSFORMS: List[Transform] = [
+    (1, 0, 0, 1),     # identity
+    (0, -1, 1, 0),    # rotate 90°
+    (-1, 0, 0, -1),   # rotate 180°
+    (0, 1, -1, 0),    # rotate 270°
+    (-1, 0, 0, 1),    # mirror left-right
+    (1, 0, 0, -1),    # mirror top-bottom
+    (0, 1, 1, 0),     # transpose
+    (0, -1, -1, 0),   # anti-transpose
+]
+
+_ORIENTATION_VECTORS = {
+    Orientation.NORTH: (0, -1),
+    Orientation.SOUTH: (0, 1),
+    Orientation.EAST: (1, 0),
+    Orientation.WEST: (-1, 0),
+}
+_VECTOR_ORIENTATIONS = {v: o for o, v in _ORIENTATION_VECTORS.items()}
+
+# Mirroring swaps left and right, so LEFT rules become RIGHT rules and vice versa
+_MIRRORED_RULES = {
+    MovementRule.STRAIGHT: MovementRule.STRAIGHT,
+    MovementRule.LEFT: MovementRule.RIGHT,
+    MovementRule.RIGHT: MovementRule.LEFT,
+    MovementRule.LEFT_U_TURN: MovementRule.RIGHT_U_TURN,
+    MovementRule.RIGHT_U_TURN: MovementRule.LEFT_U_TURN,
+}
+_MIRRORED_DIRECTIONS = {
+    Direction.FORWARD: Direction.FORWARD,
+    Direction.BACKWARD: Direction.BACKWARD,
+    Direction.LEFT: Direction.RIGHT,
+    Direction.RIGHT: Direction.LEFT,
+}
+
+_SWAPPED_CELLS = {
+    CellType.HORIZONTAL_ROAD.value: CellType.VERTICAL_ROAD.value,
+    CellType.VERTICAL_ROAD.value: CellType.HORIZONTAL_ROAD.value,
+}
+
+
+def inverse(t: Transform) -> Transform:
+    """Inverse of a dihedral transform (its matrix is orthogonal)"""
+    a, b, c, d = t
+    return (a, c, b, d)
+
+
+def swaps_axes(t: Transform) -> bool:
+    """True for 90°/270° rotations and (anti-)transposes"""
+    return t[0] == 0
+
+
+def is_mirror(t: Transform) -> bool:
+    """True if the transform reverses handedness (determinant -1)"""
+    a, b, c, d = t
+    return a * d - b * c < 0
+
+
+def transform_dims(width: int, height: int, t: Transform) -> Tuple[int, int]:
+    """Grid dimensions after applying the transform"""
+    return (height, width) if swaps_axes(t) else (width, height)
+
+
+def transform_point(t: Transform, x: int, y: int, width: int, height: int) -> Tuple[int, int]:
+    """Map a cell of a width x height grid to its cell in the transformed grid"""
+    a, b, c, d = t
+    new_width, new_height = transform_dims(width, height, t)
+    nx = a * x + b * y
+    ny = c * x + d * y
+    if a < 0 or b < 0:
+        nx += new_width - 1
+    if c < 0 or d < 0:
+        ny += new_height - 1
+    return nx, ny
+
+
+def transform_orientation(t: Transform, orientation: Orientation) -> Orientation:
+    a, b, c, d = t
+    vx, vy = _ORIENTATION_VECTORS[orientation]
+    return _VECTOR_ORIENTATIONS[(a * vx + b * vy, c * vx + d * vy)]
+
+
+def transform_rule(t: Transform, movement_rule: MovementRule) -> MovementRule:
+    return _MIRRORED_RULES[movement_rule] if is_mirror(t) else movement_rule
+
+
+def transform_cell(t: Transform, cell_value: str) -> str:
+    if swaps_axes(t):
+        return _SWAPPED_CELLS.get(cell_value, cell_value)
+    return cell_value
+
+
+def transform_layout(layout: List[List[str]], t: Transform) -> List[List[str]]:
+    """Apply a dihedral transform to a layout, swapping '-' and '|' on quarter turns"""
+    height = len(layout)
+    width = len(layout[0]) if height > 0 else 0
+    if t == IDENTITY:
+        return layout
+    new_width, new_height = transform_dims(width, height, t)
+    result = [[""] * new_width for _ in range(new_height)]
+    for y, row in enumerate(layout):
+        for x, cell_value in enumerate(row):
+            nx, ny = transform_point(t, x, y, width, height)
+            result[ny][nx] = transform_cell(t, cell_value)
+    return result
+
+
+def canonicalize(layout: List[List[str]]) -> Tuple[bytes, Transform]:
+    """
+    Pick the canonical representative among the 8 dihedral variants of a layout.
+    Returns the canonical layout encoded with encode_layout, and the transform
+    mapping the given layout onto it.
+    """
+    best = None
+    best_transform = IDENTITY
+    for t in TRANSFORMS:
+        variant = transform_layout(layout, t)
+        height = len(variant)
+        width = len(variant[0]) if height > 0 else 0
+        encoded = encode_layout(variant, width, height)
+        if best is None or encoded < best:
+            best = encoded
+            best_transform = t
+    return best, best_transform
+
+
+class _TransformedPathLookup(dict):
+    """
+    Lazily remapped view of a path lookup table.
+    Entries are rebuilt per node on first access; node ids and exit paths are
+    shared with the base table, only orientation/rule keys and exit points are remapped.
+    """
+
+    def __init__(self, base_graph: RoadGraph, t: Transform):
+        super().__init__()
+        self._base_graph = base_graph
+        self._base = base_graph.path_lookup
+        self._t = t
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._base
+
+    def __missing__(self, node_id):
+        by_orientation = self._base[node_id]
+        remapped = {}
+        for orientation, by_rule in by_orientation.items():
+            remapped[transform_orientation(self._t, orientation)] = {
+                transform_rule(self._t, movement_rule): self._remap_path(path_info)
+                for movement_rule, path_info in by_rule.items()
+            }
+        self[node_id] = remapped
+        return remapped
+
+    def get(self, node_id, default=None):
+        return self[node_id] if node_id in self._base else default
+
+    def _remap_path(self, path_info: PathInfo) -> PathInfo:
+        if path_info.exit_point is None:
+            return path_info
+        x, y = transform_point(self._t, path_info.exit_point.x, path_info.exit_point.y,
+                               self._base_graph.width, self._base_graph.height)
+        return PathInfo(exit_path=path_info.exit_path, exit_point=Position(x, y), valid=path_info.valid)
+
+
+class TransformedGraph(RoadGraph):
+    """
+    Read-only view of a compiled RoadGraph under a dihedral transform.
+    Node ids (and therefore every exit_path) are those of the base graph;
+    positions, cell types, neighbor orientations and movement rules are
+    remapped so the solver and validator see the transformed layout.
+    """
+
+    def __init__(self, base: RoadGraph, t: Transform):
+        width, height = transform_dims(base.width, base.height, t)
+        super().__init__(width, height)
+        self.base = base
+        self.transform = t
+        self._inverse = inverse(t)
+        mirrored = is_mirror(t)
+
+        for node in base.nodes.values():
+            x, y = transform_point(t, node.position.x, node.position.y, base.width, base.height)
+            view_node = Node(node.id, Position(x, y), CellType(transform_cell(t, node.cell_type.value)))
+            for orientation, by_direction in node.neighbors.items():
+                for direction, neighbor_id in by_direction.items():
+                    if mirrored:
+                        direction = _MIRRORED_DIRECTIONS[direction]
+                    view_node.add_neighbor(transform_orientation(t, orientation), direction, neighbor_id)
+            self.add_node(view_node)
+
+        self.path_lookup = _TransformedPathLookup(base, t)
+
+    def get_node_id(self, x: int, y: int) -> str:
+        """Node ids stay those of the base graph, so map back before generating"""
+        bx, by = transform_point(self._inverse, x, y, self.width, self.height)
+        return self.base.get_node_id(bx, by)
@@ -0,0 +1,191 @@
+"""
+The greedy fixpoint (Solver strategy "greedy") for many levels on one
+layout at once.
+
+Generated packs hold hundreds of vehicle configurations on one layout. Each
+level is reduced to bitmasks on the shared compiled graph:
+- for every vehicle, the vehicles standing on its exit path;
+- the boulders on that path, which hold it back unless it is a bulldozer;
+- the boulders it clears as a bulldozer.
+No search state is built. The levels then advance together, one greedy
+round per step: every vehicle whose path is clear of remaining vehicles and
+boulders exits. With NumPy (see core.movability) the masks of all levels
+are stacked into padded boolean arrays, and a round is a few array
+operations across the whole group. Otherwise each level runs the same
+rounds on Python ints, which already avoids building a GameState per exit.
+
+Solutions match Solver(graph, "greedy") exactly. A round's vehicles exit
+in level order, as Solver._solve_greedy exits them. Levels with traffic
+lights or pedestrians are not monotone and need a search; they are left to
+the caller.
+"""
+import sys
+from typing import Dict, List, Optional
+from models.game_state import GameState
+from models.graph import Position, RoadGraph
+from models.obstacles import ObstacleType
+from core.movability import load_numpy
+from core.solver import Solver, SolverResult
+from core.timeline import TIMED_TYPES
+
+
+def _cell(position: Position) -> int:
+    # Positions hash in Python; plain ints keep the per-cell lookups cheap
+    return position.x << 16 | position.y & 0xFFFF
+
+
+class _LevelMasks:
+    """A level's vehicles and boulders as indices, and who blocks whom"""
+
+    def __init__(self, state: GameState, solver: Solver, path_cells: Dict[tuple, Optional[List[int]]]):
+        self.vehicle_ids = list(state.active_vehicles)
+        owner: Dict[int, int] = {}
+        for index, vehicle in enumerate(state.active_vehicles.values()):
+            for position in vehicle.get_occupied_cells():
+                owner[_cell(position)] = index
+        boulders: Dict[int, int] = {}
+        self.boulder_positions: List[Position] = []
+        for position, obstacle in state.obstacles.items():
+            if obstacle.type == ObstacleType.BOULDER:
+                boulders[_cell(position)] = len(boulders)
+                self.boulder_positions.append(position)
+        self.boulders = len(boulders)
+
+        self.valid: List[bool] = []
+        self.blockers: List[List[int]] = []  # vehicle indices on each path
+        self.needs: List[List[int]] = []     # boulder indices holding each vehicle back
+        self.clears: List[List[int]] = []    # boulder indices each bulldozer clears
+        for index, vehicle in enumerate(state.active_vehicles.values()):
+            blockers, needs, clears = [], [], []
+            # Levels on one layout share start cells, so each path is resolved once per group
+            start = (vehicle.position.x, vehicle.position.y, vehicle.orientation, vehicle.movement_rule)
+            if start not in path_cells:
+                path_info = solver._path_info(vehicle)
+                path_cells[start] = None if path_info is None or not path_info.valid else [
+                    _cell(solver.graph.nodes[node_id].position) for node_id in path_info.exit_path]
+            cells = path_cells[start]
+            if cells is not None:
+                bulldozer = vehicle.can_clear_obstacles()
+                for cell in cells:
+                    other = owner.get(cell)
+                    if other is not None and other != index:
+                        blockers.append(other)
+                    boulder = boulders.get(cell)
+                    if boulder is not None:
+                        (clears if bulldozer else needs).append(boulder)
+                # Trucks cover several path cells, and paths may cross themselves
+                blockers, needs, clears = (list(dict.fromkeys(indices)) for indices in (blockers, needs, clears))
+            self.valid.append(cells is not None)
+            self.blockers.append(blockers)
+            self.needs.append(needs)
+            self.clears.append(clears)
+
+    def rounds(self) -> List[int]:
+        """Round in which each vehicle exits, -1 for the vehicles left stuck"""
+        blockers = [sum(1 << other for other in others) for others in self.blockers]
+        needs = [sum(1 << boulder for boulder in boulders) for boulders in self.needs]
+        clears = [sum(1 << boulder for boulder in boulders) for boulders in self.clears]
+        remaining = (1 << len(self.vehicle_ids)) - 1
+        present = (1 << self.boulders) - 1
+        rounds = [-1] * len(self.vehicle_ids)
+        round_number = 0
+        while True:
+            movers = [index for index in range(len(rounds))
+                      if remaining >> index & 1 and self.valid[index]
+                      and not blockers[index] & remaining and not needs[index] & present]
+            if not movers:
+                return rounds
+            for index in movers:
+                remaining ^= 1 << index
+                present &= ~clears[index]
+                rounds[index] = round_number
+            round_number += 1
+
+
+def _stacked_rounds(np, levels: List[_LevelMasks]) -> List[List[int]]:
+    """_LevelMasks.rounds for every level at once, on padded NumPy arrays"""
+    count = len(levels)
+    vehicles = max(len(level.vehicle_ids) for level in levels)
+    boulders = max(level.boulders for level in levels)
+    blockers = np.zeros((count, vehicles, vehicles), dtype=bool)
+    needs = np.zeros((count, vehicles, boulders), dtype=bool)
+    clears = np.zeros((count, vehicles, boulders), dtype=bool)
+    remaining = np.zeros((count, vehicles), dtype=bool)
+    valid = np.zeros((count, vehicles), dtype=bool)
+    present = np.zeros((count, boulders), dtype=bool)
+    for array, attribute in ((blockers, "blockers"), (needs, "needs"), (clears, "clears")):
+        # One fancy assignment per array from the (level, vehicle, other) triples
+        triples = [(l, v, other) for l, level in enumerate(levels)
+                   for v, others in enumerate(getattr(level, attribute)) for other in others]
+        if triples:
+            array[tuple(np.array(triples, dtype=np.intp).T)] = True
+    for l, level in enumerate(levels):
+        remaining[l, :len(level.vehicle_ids)] = True
+        valid[l, :len(level.valid)] = level.valid
+        present[l, :level.boulders] = True
+
+    rounds = np.full((count, vehicles), -1, dtype=np.intp)
+    round_number = 0
+    while True:
+        blocked = (blockers & remaining[:, None, :]).any(axis=2)
+        if boulders:
+            blocked |= (needs & present[:, None, :]).any(axis=2)
+        movers = remaining & valid & ~blocked
+        if not movers.any():
+            break
+        rounds[movers] = round_number
+        remaining &= ~movers
+        if boulders:
+            present &= ~(clears & movers[:, :, None]).any(axis=1)
+        round_number += 1
+    return [row[:len(level.vehicle_ids)] for level, row in zip(levels, rounds.tolist())]
+
+
+class LockstepGreedy:
+    """Solves many static levels sharing one compiled graph together"""
+
+    def __init__(self, graph: RoadGraph, vectorize: Optional[bool] = None):
+        self.graph = graph
+        # Blocking analysis of stuck levels; no MovabilityIndex needed for that
+        self.solver = Solver(graph, "greedy", vectorize=False)
+        # None: stack the levels when NumPy is already imported. Importing it
+        # costs more than the stacked rounds save on a chunk of levels.
+        self.vectorize = vectorize
+        self.path_cells: Dict[tuple, Optional[List[int]]] = {}
+
+    def solve(self, states: List[GameState]) -> List[SolverResult]:
+        for state in states:
+            if any(obstacle.type in TIMED_TYPES for obstacle in state.obstacles.values()):
+                raise ValueError("The greedy engine is only exact for levels without traffic lights or pedestrians")
+        levels = [_LevelMasks(state, self.solver, self.path_cells) for state in states]
+        np = None
+        if self.vectorize or (self.vectorize is None and "numpy" in sys.modules):
+            np = load_numpy()
+            if self.vectorize and np is None:
+                raise ImportError("Stacked lockstep rounds need numpy")
+        if np is not None and levels:
+            all_rounds = _stacked_rounds(np, levels)
+        else:
+            all_rounds = [level.rounds() for level in levels]
+        return [self._result(state, level, rounds) for state, level, rounds in zip(states, levels, all_rounds)]
+
+    def _result(self, state: GameState, level: _LevelMasks, rounds: List[int]) -> SolverResult:
+        """The SolverResult Solver(graph, "greedy").solve(state) gives"""
+        order = sorted((round_number, index) for index, round_number in enumerate(rounds) if round_number >= 0)
+        solution = [level.vehicle_ids[index] for _, index in order]
+        explored = len(solution) + 1
+        stats = self.solver._stats(explored, 0, 1, explored)
+        if len(solution) == len(rounds):
+            return SolverResult(solvable=True, solution=solution, total_moves=len(solution), stats=stats)
+        # Rebuild the state the greedy engine stops at, only for the blocking analysis
+        cleared = {level.boulder_positions[boulder] for index, _ in order for boulder in level.clears[index]}
+        stuck = GameState(
+            active_vehicles={vehicle_id: vehicle for vehicle_id, vehicle, round_number
+                             in zip(level.vehicle_ids, state.active_vehicles.values(), rounds) if round_number < 0},
+            obstacles={position: obstacle for position, obstacle in state.obstacles.items()
+                       if position not in cleared},
+            exited_vehicles=solution,
+            turn_number=state.turn_number + len(solution)
+        )
+        self.solver._prepare(state)
+        return self.solver._stuck(stuck, solution, stats)
@@ -0,0 +1,126 @@
+"""
+Vectorized static movability check over all vehicles of a state.
+
+Solver._scan asks every vehicle whether its exit path is clear of other
+vehicles and boulders, one GameState.is_path_clear call each. With NumPy,
+MovabilityIndex answers for all vehicles at once. The cells on every
+vehicle's exit path are stacked into a padded index matrix when the level
+is prepared. Per state, the cells that are blocked go into one boolean
+vector, a gather of that vector through the matrix gives each path's cells,
+and an any() per row gives the vehicles that are not blocked.
+
+NumPy is optional; without it the solver keeps the pure-Python check.
+The vectorized check is faster from a handful of vehicles on, but
+importing NumPy costs a few hundred ms, more than a whole cold start. So a
+process only imports it for a level of at least MIN_VEHICLES vehicles,
+and vectorizes every level once it is loaded.
+"""
+import os
+import sys
+from typing import Dict, List, Optional
+from models.game_state import GameState
+from models.graph import Position, RoadGraph
+from models.obstacles import ObstacleType
+from models.path import PathInfo
+
+# Vehicles from which Solver uses MovabilityIndex when NumPy is installed
+MIN_VEHICLES = int(os.environ.get("NUMPY_MOVABILITY_MIN_VEHICLES", "64"))
+
+_numpy = None
+
+
+def load_numpy():
+    """The numpy module, or None if it is not installed (imported on first use)"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+class MovabilityIndex:
+    """Exit-path cells of a level's vehicles as a padded NumPy index matrix"""
+
+    def __init__(self, state: GameState, paths: Dict[str, PathInfo], graph: RoadGraph):
+        np = load_numpy()
+        if np is None:
+            raise ImportError("MovabilityIndex needs numpy")
+        self.np = np
+        self.row: Dict[str, int] = {}
+        cells: Dict[Position, int] = {}
+
+        def index(position: Position) -> int:
+            return cells.setdefault(position, len(cells) + 1)  # 0 is the padding cell
+
+        vehicle_cells: List[List[int]] = []
+        path_cells: List[Optional[List[int]]] = []
+        bulldozer: List[bool] = []
+        for vehicle_id, vehicle in state.active_vehicles.items():
+            path_info = paths.get(vehicle_id)
+            own = vehicle.get_occupied_cells()
+            self.row[vehicle_id] = len(vehicle_cells)
+            vehicle_cells.append([index(position) for position in own])
+            if path_info is None or not path_info.valid:
+                path_cells.append(None)
+            else:
+                # The vehicle's own cells never block it
+                path_cells.append([index(graph.nodes[node_id].position) for node_id in path_info.exit_path
+                                   if graph.nodes[node_id].position not in own])
+            bulldozer.append(vehicle.can_clear_obstacles())
+
+        self.obstacle_cells = {position: index(position) for position in state.obstacles}
+        self.size = len(cells) + 1
+        width = max((len(c) for c in path_cells if c is not None), default=0) or 1
+        self.paths = np.zeros((len(path_cells), width), dtype=np.intp)
+        for row, path in enumerate(path_cells):
+            if path:
+                self.paths[row, :len(path)] = path
+        length = max((len(c) for c in vehicle_cells), default=1)
+        self.vehicle_cells = np.zeros((len(vehicle_cells), length), dtype=np.intp)
+        for row, own in enumerate(vehicle_cells):
+            self.vehicle_cells[row, :len(own)] = own
+        self.valid = np.array([path is not None for path in path_cells], dtype=bool)
+        self.bulldozer = np.array(bulldozer, dtype=bool)
+
+    def clear(self, state: GameState) -> List[bool]:
+        """Whether each of state.active_vehicles, in order, has a path clear of vehicles and static obstacles"""
+        np = self.np
+        rows = np.fromiter((self.row[vehicle_id] for vehicle_id in state.active_vehicles),
+                           dtype=np.intp, count=len(state.active_vehicles))
+        # Blocked for everyone: vehicle cells and obstacles other than boulders
+        blocked = np.zeros(self.size, dtype=bool)
+        blocked[self.vehicle_cells[rows]] = True
+        boulders = np.zeros(self.size, dtype=bool)
+        for position, obstacle in state.obstacles.items():
+            if obstacle.type == ObstacleType.BOULDER:
+                boulders[self.obstacle_cells[position]] = True
+            elif obstacle.type not in (ObstacleType.TRAFFIC_LIGHT, ObstacleType.PEDESTRIAN):
+                blocked[self.obstacle_cells[position]] = True
+        blocked[0] = False  # padding
+
+        paths = self.paths[rows]
+        hit = blocked[paths].any(axis=1)
+        if boulders.any():
+            hit |= boulders[paths].any(axis=1) & ~self.bulldozer[rows]
+        return (self.valid[rows] & ~hit).tolist()
+
+
+def build_index(state: GameState, paths: Dict[str, PathInfo], graph: RoadGraph,
+                vectorize: Optional[bool] = None) -> Optional[MovabilityIndex]:
+    """
+    MovabilityIndex for a level, or None to keep the pure-Python check.
+    vectorize=None vectorizes when NumPy is installed and either already
+    imported or worth importing (MIN_VEHICLES); True requires NumPy; False
+    never vectorizes.
+    """
+    if vectorize is False:
+        return None
+    if vectorize is None:
+        if "numpy" not in sys.modules and len(state.active_vehicles) < MIN_VEHICLES:
+            return None
+        if load_numpy() is None:
+            return None
+    return MovabilityIndex(state, paths, graph)
@@ -0,0 +1,231 @@
+"""
+Layered breadth-first search across worker processes.
+
+Every state key (see core.state_keys) belongs to one partition, picked by a
+hash of the key. A partition owns the visited entries and the frontier of
+its keys. Each layer runs in two rounds:
+
+1. every partition expands its frontier into successor keys, bucketed by
+   owning partition;
+2. the parent routes each bucket to its owner. The owner drops keys it has
+   already visited and records a parent for each new one.
+
+Only lists of ints cross the pipes. A successor is a (key, parent key,
+move) triple, and no GameState is built for it.
+
+A key reached several times in a layer keeps the smallest (parent, move).
+The smallest solved key of the first layer that has one is the answer. The
+solution therefore depends only on the level. It does not depend on the
+number of workers or on which worker finishes first. It has the fewest
+transitions, as with bfs.
+
+Workers are forked after Solver._prepare. They inherit the compiled graph
+and the timeline instead of receiving them pickled.
+"""
+import multiprocessing
+from typing import Dict, List, Optional, Tuple
+from core.solver import Solver, SearchState, SolverResult
+from core.state_keys import StateKeys, mix
+
+# Move of a successor that waits for a light or pedestrian instead of exiting
+WAIT = -1
+# Parent recorded for the initial state
+NO_PARENT = -1
+
+
+def _owner(key: int, partitions: int) -> int:
+    return mix(key) % partitions
+
+
+class _Partition:
+    """Visited entries and frontier of the keys one worker owns"""
+
+    def __init__(self, solver: Solver, keys: StateKeys, partitions: int):
+        self.solver = solver
+        self.keys = keys
+        self.partitions = partitions
+        self.vehicle_index = {vehicle_id: i for i, vehicle_id in enumerate(keys.vehicle_ids)}
+        self.parents: Dict[int, Tuple[int, int]] = {}
+        self.frontier: List[int] = []
+
+    def expand(self) -> Tuple[List[List[int]], int, Optional[int]]:
+        """
+        Successors of the frontier as flat [key, parent, move, ...] lists, one
+        per owning partition, plus the number of states expanded and the
+        smallest key that had no successor
+        """
+        keys, solver = self.keys, self.solver
+        buckets: List[List[int]] = [[] for _ in range(self.partitions)]
+        dead_end = None
+        for key in sorted(self.frontier):
+            state = keys.decode(key)
+            mask = keys.mask(key)
+            movable, wait_until = solver._scan(state)
+            if not movable and wait_until is None:
+                if dead_end is None:
+                    dead_end = key
+                continue
+            if wait_until is not None:
+                successor = keys.key(mask, wait_until)
+                buckets[_owner(successor, self.partitions)] += (successor, key, WAIT)
+            for vehicle, _ in movable:
+                successor = keys.key(mask ^ keys.bits[vehicle.id], state.turn_number + 1)
+                buckets[_owner(successor, self.partitions)] += (successor, key, self.vehicle_index[vehicle.id])
+        expanded = len(self.frontier)
+        self.frontier = []
+        return buckets, expanded, dead_end
+
+    def insert(self, triples: List[int]) -> Tuple[int, Optional[int]]:
+        """
+        Record the unvisited keys among `triples` as the next frontier:
+        (new keys, smallest solved key among them)
+        """
+        parents = self.parents
+        layer: Dict[int, Tuple[int, int]] = {}
+        for i in range(0, len(triples), 3):
+            key = triples[i]
+            if key in parents:
+                continue
+            candidate = (triples[i + 1], triples[i + 2])
+            best = layer.get(key)
+            if best is None or candidate < best:
+                layer[key] = candidate
+        parents.update(layer)
+        self.frontier = list(layer)
+        # A solved state has no vehicle bit left, so its key is just its phase
+        solved = min((key for key in layer if key < self.keys.period), default=None)
+        return len(layer), solved
+
+    def parent(self, key: int) -> Tuple[int, int]:
+        return self.parents[key]
+
+
+class _Inline:
+    """A partition called in this process (one worker)"""
+
+    def __init__(self, partition: _Partition):
+        self.partition = partition
+        self.pending = None
+
+    def submit(self, method: str, *args):
+        self.pending = getattr(self.partition, method)(*args)
+
+    def result(self):
+        return self.pending
+
+    def close(self):
+        pass
+
+
+class _Forked:
+    """A partition served by a forked worker process over a pipe"""
+
+    def __init__(self, partition: _Partition):
+        context = multiprocessing.get_context("fork")
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(partition, child), daemon=True)
+        self.process.start()
+        child.close()
+
+    def submit(self, method: str, *args):
+        self.connection.send((method, args))
+
+    def result(self):
+        ok, value = self.connection.recv()
+        if not ok:
+            raise value
+        return value
+
+    def close(self):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+def _serve(partition: _Partition, connection):
+    """Worker loop: run partition methods until told to stop"""
+    while True:
+        request = connection.recv()
+        if request is None:
+            return
+        method, args = request
+        try:
+            connection.send((True, getattr(partition, method)(*args)))
+        except Exception as e:
+            connection.send((False, e))
+
+
+def solve_parallel(solver: Solver, initial_search_state: SearchState, workers: int) -> SolverResult:
+    """Solver.solve for the 'parallel' strategy, once the solver is prepared"""
+    keys = solver._state_keys(initial_search_state.game_state)
+    # Partitions are built before forking so workers inherit them
+    partitions = [_Partition(solver, keys, workers) for _ in range(workers)]
+    handles = [_Inline(partitions[0])] if workers == 1 else [_Forked(p) for p in partitions]
+    try:
+        root = keys.root
+        owner = handles[_owner(root, workers)]
+        owner.submit("insert", [root, NO_PARENT, WAIT])
+        owner.result()
+
+        states_explored = generated = 0
+        visited = peak_frontier = 1
+        depth = 0
+        last_blocked = None
+        while True:
+            for handle in handles:
+                handle.submit("expand")
+            expansions = [handle.result() for handle in handles]
+            states_explored += sum(expanded for _, expanded, _ in expansions)
+            dead_ends = [dead_end for _, _, dead_end in expansions if dead_end is not None]
+            if dead_ends:
+                last_blocked = min(dead_ends)
+
+            for index, handle in enumerate(handles):
+                # Buckets are concatenated in worker order, but insert is order-independent
+                triples = [value for buckets, _, _ in expansions for value in buckets[index]]
+                generated += len(triples) // 3
+                handle.submit("insert", triples)
+            insertions = [handle.result() for handle in handles]
+            new = sum(count for count, _ in insertions)
+            visited += new
+            peak_frontier = max(peak_frontier, new)
+            stats = solver._stats(states_explored, generated - (visited - 1), peak_frontier, visited)
+            stats["workers"] = workers
+
+            solved = [key for _, key in insertions if key is not None]
+            if solved:
+                return solver._solved(_replay(solver, keys, handles, initial_search_state, min(solved)), stats)
+            if not new:
+                blocked_state = keys.decode(last_blocked) if last_blocked is not None else None
+                return solver._unsolvable(states_explored, depth, blocked_state, stats)
+            depth += 1
+    finally:
+        for handle in handles:
+            handle.close()
+
+
+def _replay(solver: Solver, keys: StateKeys, handles, initial_search_state: SearchState,
+            solved: int) -> SearchState:
+    """Follow parents back from `solved`, then replay the moves to get the exit ticks"""
+    moves = []
+    key = solved
+    while True:
+        handle = handles[_owner(key, len(handles))]
+        handle.submit("parent", key)
+        key, move = handle.result()
+        if key == NO_PARENT:
+            break
+        moves.append(move)
+    search_state = initial_search_state
+    for move in reversed(moves):
+        exits = len(search_state.move_sequence) + (move != WAIT)
+        search_state = next(
+            successor for successor in solver._successors(search_state)
+            if len(successor.move_sequence) == exits
+            and (move == WAIT or successor.move_sequence[-1] == keys.vehicle_ids[move])
+        )
+    return search_state
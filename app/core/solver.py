@@ -1,10 +1,27 @@
-from typing import List, Dict, Set, Tuple, Optional
+import heapq
+import os
+from typing import List, Dict, Set, Tuple, Optional, Iterator
 from collections import deque
 from dataclasses import dataclass
-from models.graph import RoadGraph
+from models.graph import RoadGraph, Position
 from models.game_state import GameState
 from models.vehicles import Vehicle
 from models.path import PathInfo
+from models.obstacles import ObstacleType
+from core.timeline import Timeline, TIMED_TYPES
+from core.transposition import TranspositionTable, EXHAUSTED
+from core.state_keys import StateKeys
+from core.movability import MovabilityIndex, build_index
+
+STRATEGIES = ("bfs", "astar", "greedy", "iddfs", "parallel")
+HEURISTICS = ("remaining", "chain")
+
+# Slots of the iddfs transposition table: two lists of ints, ~16 MB at this size
+DEFAULT_TABLE_SIZE = 1 << 20
+
+# Processes the parallel strategy forks unless told otherwise; raise it only
+# where one solve may use several CPUs, not per request on a shared host
+DEFAULT_WORKERS = int(os.environ.get("SOLVER_WORKERS", "1"))
 
 
 @dataclass
@@ -15,6 +32,8 @@ class SolverResult:
     total_moves: int
     blocking_details: List[Dict[str, str]] = None
     reason: str = None
+    stats: Dict[str, int] = None  # search counters, see Solver.solve
+    exit_ticks: List[int] = None  # tick of each exit in solution, for levels with lights or pedestrians
 
 
 @dataclass
@@ -22,137 +41,549 @@ class SearchState:
     """State in the search tree"""
     game_state: GameState
     move_sequence: List[str]  # Vehicle IDs in order of exit
+    exit_ticks: Optional[List[int]] = None  # tick of each exit, tracked when time matters
     
-    def get_hash(self) -> str:
-        """Create unique hash for this state for cycle detection"""
+    def get_hash(self, period: int = 1) -> str:
+        """
+        Create unique hash for this state for cycle detection.
+        Time-dependent obstacles follow a schedule repeating every `period`
+        ticks, so the tick modulo the period stands in for all of them.
+        """
         # Hash based on active vehicles and their positions
         vehicle_parts = []
         for vid in sorted(self.game_state.active_vehicles.keys()):
             v = self.game_state.active_vehicles[vid]
             vehicle_parts.append(f"{vid}:{v.position.x},{v.position.y}")
         
-        # Include obstacle positions that can change (traffic lights, pedestrians)
-        obstacle_parts = []
-        for pos in sorted(self.game_state.obstacles.keys(), key=lambda p: (p.x, p.y)):
-            obs = self.game_state.obstacles[pos]
-            if obs.type.value == "TRAFFIC_LIGHT":
-                obstacle_parts.append(f"TL:{pos.x},{pos.y}:{obs.current_state}")
-            elif obs.type.value == "PEDESTRIAN":
-                obstacle_parts.append(f"PED:{pos.x},{pos.y}:{obs.current_progress}")
+        # Traffic lights and pedestrians are all determined by the tick
+        if period > 1:
+            vehicle_parts.append(f"T:{self.game_state.turn_number % period}")
         
-        return "|".join(vehicle_parts + obstacle_parts)
+        return "|".join(vehicle_parts)
+
+
+def select_strategy(state: GameState) -> str:
+    """
+    Cheapest exact engine for a level. Without traffic lights or pedestrians
+    a level is monotone whatever its boulders, bulldozers or vehicle count:
+    exits only free cells, so the polynomial greedy fixpoint decides it.
+    Time-dependent obstacles make the order and timing of exits matter, which
+    needs a search; astar explores no more states than bfs on those levels.
+    """
+    if any(obstacle.type in TIMED_TYPES for obstacle in state.obstacles.values()):
+        return "astar"
+    return "greedy"
+
+
+class _Frame:
+    """One state on the iddfs path, with its lazily generated successors"""
+    __slots__ = ("search_state", "mask", "key", "successors", "expanded", "cut_off", "partial")
+
+    def __init__(self, search_state: SearchState, mask: int, key: int, successors: Iterator[SearchState]):
+        self.search_state = search_state
+        self.mask = mask
+        self.key = key
+        self.successors = successors
+        self.expanded = False  # had at least one successor
+        self.cut_off = False   # a descendant hit the depth limit
+        self.partial = False   # a descendant was skipped for being on the path
 
 
 class Solver:
     """Determines if a traffic puzzle level is solvable"""
     
-    def __init__(self, graph: RoadGraph):
+    def __init__(self, graph: RoadGraph, strategy: str = "bfs", heuristic: str = "remaining",
+                 table_size: int = DEFAULT_TABLE_SIZE, workers: Optional[int] = None,
+                 vectorize: Optional[bool] = None):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown solver strategy {strategy!r}; expected one of {', '.join(STRATEGIES)}")
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Unknown heuristic {heuristic!r}; expected one of {', '.join(HEURISTICS)}")
         self.graph = graph
+        self.strategy = strategy
+        self.heuristic = heuristic
+        self.table_size = table_size
+        self.workers = workers or DEFAULT_WORKERS
+        # None: NumPy movability checks for big levels when it is installed (core.movability)
+        self.vectorize = vectorize
+        self.movability: Optional[MovabilityIndex] = None
+        # Set per solve from the level's traffic lights and pedestrians
+        self.timeline = Timeline([])
+        self.path_masks: Dict[str, int] = {}
     
     def solve(self, initial_state: GameState) -> SolverResult:
         """
-        Attempt to solve the puzzle using breadth-first search.
-        Returns detailed results including solution path or blocking reasons.
+        Attempt to solve the puzzle with the configured strategy:
+        
+        bfs     breadth-first search; finds a solution with the fewest
+                transitions (exits plus waits)
+        astar   best-first search on elapsed ticks plus an admissible
+                heuristic; finds a solution with the fewest ticks
+        greedy  exits every movable vehicle until none is left; exact and
+                polynomial, but only for levels without lights or
+                pedestrians (see select_strategy)
+        iddfs   iterative-deepening depth-first search; same solutions as
+                bfs in O(depth x V) memory plus a transposition table of
+                table_size slots (0 disables it)
+        parallel  layered breadth-first search split across `workers`
+                forked processes (default SOLVER_WORKERS, 1 if unset;
+                core.parallel_search); fewest transitions,
+                and the same solution whatever the number of workers
+        
+        Returns detailed results including solution path or blocking reasons,
+        and search counters in result.stats.
+        
+        With traffic lights or pedestrians, every exit takes one tick and a
+        state may also wait: it jumps straight to the next tick where a vehicle
+        held only by them gets a clear path. Ticks in between change nothing a
+        vehicle could use, so they are never expanded.
         """
         # Quick check: if no vehicles, it's already solved
         if initial_state.is_solved():
             return SolverResult(
                 solvable=True,
                 solution=[],
-                total_moves=0
+                total_moves=0,
+                stats=self._stats(0, 0, 0, 1)
             )
         
-        # BFS for finding shortest solution
-        queue = deque([SearchState(initial_state, [])])
-        visited = {SearchState(initial_state, []).get_hash()}
+        self._prepare(initial_state)
+        initial_search_state = SearchState(initial_state, [], None if self.timeline.is_static else [])
+        
+        if self.strategy == "astar":
+            return self._solve_best_first(initial_search_state)
+        if self.strategy == "greedy":
+            return self._solve_greedy(initial_search_state)
+        if self.strategy == "iddfs":
+            return self._solve_iterative_deepening(initial_search_state)
+        if self.strategy == "parallel":
+            from core.parallel_search import solve_parallel
+            return solve_parallel(self, initial_search_state, self.workers)
+        return self._solve_breadth_first(initial_search_state)
+    
+    def _prepare(self, initial_state: GameState):
+        """Per-level precomputation shared by every strategy"""
+        self.timeline = Timeline(initial_state.obstacles.values(), self.graph)
+        # Vehicles never move until they exit, so each one's path mask is fixed
+        self.path_masks = self._path_masks(initial_state) if not self.timeline.is_static else {}
+        paths = {vehicle.id: self._path_info(vehicle) for vehicle in initial_state.active_vehicles.values()}
+        self.movability = build_index(initial_state, paths, self.graph, self.vectorize)
+    
+    def _solve_greedy(self, initial_search_state: SearchState) -> SolverResult:
+        """
+        Fixpoint of exiting movable vehicles, in rounds. Without time-dependent
+        obstacles an exit never blocks anyone (vehicles only leave, bulldozers
+        only remove boulders), so a vehicle movable at the start of a round is
+        still movable after the others exit, and the vehicles left at the
+        fixpoint are stuck whatever the order. O(V^2) path checks.
+        """
+        if not self.timeline.is_static:
+            raise ValueError("The greedy engine is only exact for levels without traffic lights or pedestrians")
+        search_state = initial_search_state
+        states_explored = 1
+        while not search_state.game_state.is_solved():
+            movable_vehicles = self._find_movable_vehicles(search_state.game_state)
+            if not movable_vehicles:
+                return self._stuck(search_state.game_state, search_state.move_sequence,
+                                   self._stats(states_explored, 0, 1, states_explored))
+            for vehicle, path_info in movable_vehicles:
+                search_state = SearchState(
+                    search_state.game_state.apply_vehicle_exit(vehicle.id, path_info.exit_path, self.graph),
+                    search_state.move_sequence + [vehicle.id]
+                )
+                states_explored += 1
+        return self._solved(search_state, self._stats(states_explored, 0, 1, states_explored))
+    
+    def _solve_breadth_first(self, initial_search_state: SearchState) -> SolverResult:
+        period = self.timeline.period
+        queue = deque([initial_search_state])
+        visited = {initial_search_state.get_hash(period)}
         
         # Track states for detecting true deadlock
         states_explored = 0
         max_depth = 0
-        last_blocking_details = []
+        last_blocked_state = None
+        deduplicated = 0
+        peak_frontier = 1
         
         while queue:
+            if len(queue) > peak_frontier:
+                peak_frontier = len(queue)
             current_search_state = queue.popleft()
-            current_game_state = current_search_state.game_state
-            move_sequence = current_search_state.move_sequence
             
             states_explored += 1
-            max_depth = max(max_depth, len(move_sequence))
+            max_depth = max(max_depth, len(current_search_state.move_sequence))
             
             # Check if solved
-            if current_game_state.is_solved():
-                return SolverResult(
-                    solvable=True,
-                    solution=move_sequence,
-                    total_moves=len(move_sequence)
-                )
+            if current_search_state.game_state.is_solved():
+                return self._solved(current_search_state,
+                                    self._stats(states_explored, deduplicated, peak_frontier, len(visited)))
             
-            # Find all vehicles that can move in current state
-            movable_vehicles = self._find_movable_vehicles(current_game_state)
+            successors = self._expand(current_search_state)
             
-            # If no vehicles can move, this branch is blocked
-            if not movable_vehicles:
-                # Analyze why it's blocked
-                blocking_details = self._analyze_blocking(current_game_state)
-                last_blocking_details = blocking_details
+            # If nothing can move or wait, this branch is blocked. Only the last
+            # blocked state is reported, so it is analyzed once the search ends
+            if not successors:
+                last_blocked_state = current_search_state.game_state
                 continue
             
-            # Try moving each movable vehicle
-            for vehicle, path_info in movable_vehicles:
-                # Apply the move
-                new_game_state = current_game_state.apply_vehicle_exit(
-                    vehicle.id, 
-                    path_info.exit_path,
-                    self.graph
-                )
-                
-                new_search_state = SearchState(
-                    new_game_state,
-                    move_sequence + [vehicle.id]
-                )
-                
+            for new_search_state in successors:
                 # Check if we've seen this state before
-                state_hash = new_search_state.get_hash()
+                state_hash = new_search_state.get_hash(period)
                 if state_hash not in visited:
                     visited.add(state_hash)
                     queue.append(new_search_state)
+                else:
+                    deduplicated += 1
         
         # No solution found
+        return self._unsolvable(states_explored, max_depth, last_blocked_state,
+                                self._stats(states_explored, deduplicated, peak_frontier, len(visited)))
+    
+    def _solve_best_first(self, initial_search_state: SearchState) -> SolverResult:
+        """
+        A* over elapsed ticks. The open list is a heap ordered by
+        f = ticks + h, then by h (deeper states first), then by the
+        heuristic's tie-breaker, then by insertion order. A state reached
+        again in fewer ticks is pushed again; stale heap entries are skipped.
+        """
+        period = self.timeline.period
+        start_tick = initial_search_state.game_state.turn_number
+        initial_hash = initial_search_state.get_hash(period)
+        best_ticks = {initial_hash: 0}
+        counter = 0
+        open_list = [(self._priority(initial_search_state, 0), counter, 0, initial_hash, initial_search_state)]
+        
+        states_explored = 0
+        max_depth = 0
+        last_blocked_state = None
+        deduplicated = 0
+        peak_frontier = 1
+        
+        while open_list:
+            if len(open_list) > peak_frontier:
+                peak_frontier = len(open_list)
+            _, _, ticks, state_hash, current_search_state = heapq.heappop(open_list)
+            if ticks > best_ticks[state_hash]:
+                continue  # reached again in fewer ticks since it was pushed
+            
+            states_explored += 1
+            max_depth = max(max_depth, len(current_search_state.move_sequence))
+            
+            if current_search_state.game_state.is_solved():
+                return self._solved(current_search_state,
+                                    self._stats(states_explored, deduplicated, peak_frontier, len(best_ticks)))
+            
+            successors = self._expand(current_search_state)
+            if not successors:
+                last_blocked_state = current_search_state.game_state
+                continue
+            
+            for new_search_state in successors:
+                new_ticks = new_search_state.game_state.turn_number - start_tick
+                new_hash = new_search_state.get_hash(period)
+                if new_ticks >= best_ticks.get(new_hash, new_ticks + 1):
+                    deduplicated += 1
+                    continue
+                best_ticks[new_hash] = new_ticks
+                counter += 1
+                heapq.heappush(open_list, (self._priority(new_search_state, new_ticks), counter,
+                                           new_ticks, new_hash, new_search_state))
+        
+        return self._unsolvable(states_explored, max_depth, last_blocked_state,
+                                self._stats(states_explored, deduplicated, peak_frontier, len(best_ticks)))
+    
+    def _solve_iterative_deepening(self, initial_search_state: SearchState) -> SolverResult:
+        """
+        Depth-first search under a limit on transitions, raised by one until a
+        solution is found or an iteration cuts nothing off. Only the current
+        path is held, one _Frame per transition, so memory is O(depth x V)
+        plus the fixed-size transposition table, where the BFS queue and
+        visited set grow with the number of states.
+        
+        Every remaining vehicle still needs an exit, so a state deeper than
+        the limit minus its remaining vehicles is cut off, as in IDA*. A state
+        on the current path is skipped: reaching it again only adds transitions.
+        
+        States are tracked by their StateKeys key.
+        """
+        keys = self._state_keys(initial_search_state.game_state)
+        bits = keys.bits
+        initial_mask, root_key = keys.full_mask, keys.root
+        # No bigger than the number of keys the level can have
+        table = TranspositionTable(min(self.table_size, keys.count))
+        
+        states_explored = 0
+        generated = 0
+        deduplicated = 0
+        peak_frontier = 1
+        max_depth = 0
+        last_blocked_state = None
+        iterations = 0
+        limit = len(bits)
+        
+        def stats() -> Dict[str, int]:
+            counters = self._stats(states_explored, deduplicated, peak_frontier, table.used + 1)
+            counters["statesGenerated"] = generated
+            counters["iterations"] = iterations
+            return counters
+        
+        while True:
+            iterations += 1
+            stack = [_Frame(initial_search_state, initial_mask, root_key, self._successors(initial_search_state))]
+            on_path = {root_key}
+            states_explored += 1
+            while stack:
+                frame = stack[-1]
+                child = next(frame.successors, None)
+                if child is None:
+                    stack.pop()
+                    on_path.discard(frame.key)
+                    if not frame.expanded:
+                        last_blocked_state = frame.search_state.game_state
+                    # Only a subtree searched in full is known dead at any budget
+                    complete = not frame.cut_off and not frame.partial
+                    if complete:
+                        table.store(frame.key, EXHAUSTED)
+                    else:
+                        table.store(frame.key, limit - len(stack), frame.cut_off)
+                    if stack:
+                        stack[-1].cut_off |= frame.cut_off
+                        stack[-1].partial |= frame.partial
+                    continue
+                
+                frame.expanded = True
+                generated += 1
+                mask = frame.mask
+                if len(child.move_sequence) > len(frame.search_state.move_sequence):
+                    mask ^= bits[child.move_sequence[-1]]
+                if not mask:
+                    return self._solved(child, stats())
+                key = keys.key(mask, child.game_state.turn_number)
+                budget = limit - len(stack)
+                if key in on_path:
+                    deduplicated += 1
+                    frame.partial = True
+                    continue
+                searched = table.lookup(key)
+                if searched is not None and searched[0] >= budget:
+                    # Searched before with at least this budget: its outcome stands
+                    deduplicated += 1
+                    if searched[1]:
+                        frame.cut_off = True
+                    elif searched[0] != EXHAUSTED:
+                        frame.partial = True
+                    continue
+                if len(child.game_state.active_vehicles) > budget:
+                    frame.cut_off = True
+                    continue
+                
+                states_explored += 1
+                on_path.add(key)
+                stack.append(_Frame(child, mask, key, self._successors(child)))
+                if len(stack) > peak_frontier:
+                    peak_frontier = len(stack)
+                max_depth = max(max_depth, len(child.move_sequence))
+            
+            if not frame.cut_off:
+                return self._unsolvable(states_explored, max_depth, last_blocked_state, stats())
+            limit += 1
+    
+    def _priority(self, search_state: SearchState, ticks: int) -> Tuple[int, ...]:
+        """
+        Heap key of a state. Every remaining vehicle needs one more tick to
+        exit, so the remaining count never overestimates and never drops by
+        more than a transition costs (admissible and consistent). The 'chain'
+        heuristic breaks ties by the longest chain of vehicles blocking one
+        another, preferring states closer to unblocking everything.
+        """
+        remaining = len(search_state.game_state.active_vehicles)
+        if self.heuristic == "chain":
+            return ticks + remaining, remaining, self._blocked_chain_depth(search_state.game_state)
+        return ticks + remaining, remaining
+    
+    def _blocked_chain_depth(self, state: GameState) -> int:
+        """
+        Length of the longest chain of vehicles each blocked by the next,
+        ending in a vehicle no other vehicle blocks. Vehicles blocked in a
+        cycle, or with no valid path, count every vehicle left.
+        """
+        owner = {}
+        for vehicle in state.active_vehicles.values():
+            for position in vehicle.get_occupied_cells():
+                owner[position] = vehicle.id
+        blockers: Dict[str, Set[str]] = {}
+        for vehicle in state.active_vehicles.values():
+            path_info = self._path_info(vehicle)
+            if path_info is None or not path_info.valid:
+                continue
+            found = blockers[vehicle.id] = set()
+            for node_id in path_info.exit_path:
+                other = owner.get(self.graph.nodes[node_id].position)
+                if other is not None and other != vehicle.id:
+                    found.add(other)
+        
+        depths: Dict[str, int] = {}
+        
+        def depth(vehicle_id: str, trail: Set[str]) -> int:
+            if vehicle_id in depths:
+                return depths[vehicle_id]
+            if vehicle_id in trail or vehicle_id not in blockers:
+                return len(state.active_vehicles)
+            trail.add(vehicle_id)
+            result = 1 + max((depth(other, trail) for other in blockers[vehicle_id]), default=0)
+            trail.discard(vehicle_id)
+            depths[vehicle_id] = result = min(result, len(state.active_vehicles))
+            return result
+        
+        return max((depth(vehicle_id, set()) for vehicle_id in state.active_vehicles), default=0)
+    
+    def _expand(self, search_state: SearchState) -> List[SearchState]:
+        """Successors of a state: one per movable vehicle, plus a wait if any helps"""
+        return list(self._successors(search_state))
+    
+    def _successors(self, search_state: SearchState) -> Iterator[SearchState]:
+        """_expand, generating each successor only when it is asked for"""
+        game_state = search_state.game_state
+        movable_vehicles, wait_until = self._scan(game_state)
+        timed = search_state.exit_ticks is not None
+        if wait_until is not None:
+            yield SearchState(
+                game_state.advance(wait_until - game_state.turn_number),
+                search_state.move_sequence,
+                search_state.exit_ticks
+            )
+        
+        # Try moving each movable vehicle
+        for vehicle, path_info in movable_vehicles:
+            # Apply the move
+            new_game_state = game_state.apply_vehicle_exit(
+                vehicle.id,
+                path_info.exit_path,
+                self.graph
+            )
+            yield SearchState(
+                new_game_state,
+                search_state.move_sequence + [vehicle.id],
+                search_state.exit_ticks + [game_state.turn_number] if timed else None
+            )
+    
+    def _solved(self, search_state: SearchState, stats: Dict[str, int]) -> SolverResult:
+        return SolverResult(
+            solvable=True,
+            solution=search_state.move_sequence,
+            total_moves=len(search_state.move_sequence),
+            stats=stats,
+            exit_ticks=search_state.exit_ticks
+        )
+    
+    def _stuck(self, state: GameState, solution: List[str], stats: Dict[str, int]) -> SolverResult:
+        """Result of the greedy engine when it stops at `state` after the exits in `solution`"""
+        return SolverResult(
+            solvable=False,
+            solution=solution,
+            total_moves=0,
+            blocking_details=self._analyze_blocking(state),
+            reason=f"No vehicle can move after {len(solution)} exits; "
+                   f"exits never block other vehicles, so no order gets further.",
+            stats=stats
+        )
+    
+    def _unsolvable(self, states_explored: int, max_depth: int, last_blocked_state: Optional[GameState],
+                    stats: Dict[str, int]) -> SolverResult:
         return SolverResult(
             solvable=False,
             solution=[],
             total_moves=0,
-            blocking_details=last_blocking_details,
-            reason=f"Exhausted all possibilities. Explored {states_explored} states up to depth {max_depth}."
+            blocking_details=self._analyze_blocking(last_blocked_state) if last_blocked_state else [],
+            reason=f"Exhausted all possibilities. Explored {states_explored} states up to depth {max_depth}.",
+            stats=stats
         )
     
+    def _stats(self, explored: int, deduplicated: int, peak_frontier: int, visited: int) -> Dict[str, int]:
+        """
+        Search counters. The visited set only grows, so its final size is its peak,
+        and every generated state was either new (visited) or a duplicate.
+        """
+        return {
+            "statesExplored": explored,
+            "statesGenerated": visited - 1 + deduplicated,
+            "statesDeduplicated": deduplicated,
+            "peakFrontier": peak_frontier,
+            "peakVisited": visited
+        }
+    
+    def _state_keys(self, initial_state: GameState) -> StateKeys:
+        """Integer keys for the states reachable from `initial_state` (after _prepare)"""
+        boulders = {position for position, obstacle in initial_state.obstacles.items()
+                    if obstacle.type == ObstacleType.BOULDER}
+        cleared: Dict[str, Set[Position]] = {}
+        for vehicle in initial_state.active_vehicles.values():
+            path_info = self._path_info(vehicle)
+            if vehicle.can_clear_obstacles() and path_info is not None and path_info.valid:
+                cleared[vehicle.id] = boulders.intersection(
+                    self.graph.nodes[node_id].position for node_id in path_info.exit_path)
+        return StateKeys(initial_state, self.timeline.period, cleared)
+    
+    def _path_masks(self, state: GameState) -> Dict[str, int]:
+        """Time-dependent cells on each vehicle's exit path, as Timeline bits"""
+        masks = {}
+        for vehicle in state.active_vehicles.values():
+            path_info = self._path_info(vehicle)
+            if path_info is not None and path_info.valid:
+                masks[vehicle.id] = self.timeline.path_mask(
+                    self.graph.nodes[node_id].position for node_id in path_info.exit_path)
+        return masks
+    
+    def _path_info(self, vehicle: Vehicle) -> Optional[PathInfo]:
+        """Pre-calculated path for a vehicle, or None if there is none"""
+        node = self.graph.get_node(vehicle.position.x, vehicle.position.y)
+        if not node:
+            return None
+        return self.graph.path_lookup.get(node.id, {}).get(vehicle.orientation, {}).get(vehicle.movement_rule)
+    
     def _find_movable_vehicles(self, state: GameState) -> List[Tuple[Vehicle, PathInfo]]:
         """
         Find all vehicles that can move in the current state.
         Returns list of (vehicle, path_info) tuples.
         """
+        return self._scan(state)[0]
+    
+    def _scan(self, state: GameState) -> Tuple[List[Tuple[Vehicle, PathInfo]], Optional[int]]:
+        """
+        Movable vehicles, plus the tick to wait for: the earliest later tick at
+        which a vehicle blocked by nothing but the timeline gets a clear path
+        it did not have the tick before (None if there is none). Waiting to
+        any other tick only delays the same choices.
+        """
         movable = []
+        wait_until = None
+        blocked_mask = self.timeline.blocked_mask(state.turn_number)
+        # Static check for every vehicle at once, when vectorized
+        clear = self.movability.clear(state) if self.movability is not None else None
         
-        for vehicle in state.active_vehicles.values():
+        for index, vehicle in enumerate(state.active_vehicles.values()):
             # Get the pre-calculated path for this vehicle
-            node = self.graph.get_node(vehicle.position.x, vehicle.position.y)
-            if not node:
-                continue
+            path_info = self._path_info(vehicle)
             
-            # Look up the path
-            if (node.id in self.graph.path_lookup and
-                vehicle.orientation in self.graph.path_lookup[node.id] and
-                vehicle.movement_rule in self.graph.path_lookup[node.id][vehicle.orientation]):
-                
-                path_info = self.graph.path_lookup[node.id][vehicle.orientation][vehicle.movement_rule]
-                
-                # Check if the path is valid and clear
-                if path_info.valid:
-                    is_clear, blocking_reason = state.is_path_clear(path_info.exit_path, vehicle, self.graph)
-                    if is_clear:
-                        movable.append((vehicle, path_info))
+            # Check the path is valid and clear of vehicles and boulders, then
+            # of lights and pedestrians at this tick with one mask lookup
+            if path_info is None or not path_info.valid:
+                continue
+            if clear is not None:
+                if not clear[index]:
+                    continue
+            elif not state.is_path_clear(path_info.exit_path, vehicle, self.graph)[0]:
+                continue
+            mask = self.path_masks.get(vehicle.id, 0)
+            if not mask & blocked_mask:
+                movable.append((vehicle, path_info))
+            if mask:
+                tick = self.timeline.next_clear(mask, state.turn_number)
+                if tick is not None and (wait_until is None or tick < wait_until):
+                    wait_until = tick
         
-        return movable
+        return movable, wait_until
     
     def _analyze_blocking(self, state: GameState) -> List[Dict[str, str]]:
         """
@@ -202,6 +633,15 @@ class Solver:
                         "blockedBy": blocker,
                         "reason": blocking_reason or f"{blocker} blocks {vehicle.id}'s path"
                     })
+                elif self.path_masks.get(vehicle.id, 0) & self.timeline.blocked_mask(state.turn_number):
+                    # Clear but for lights or pedestrians, which never all clear at once
+                    obstacle = self.timeline.blocker(
+                        (self.graph.nodes[node_id].position for node_id in path_info.exit_path), state.turn_number)
+                    blocking_details.append({
+                        "blocked": vehicle.id,
+                        "blockedBy": obstacle.id,
+                        "reason": f"{obstacle.type.value} blocks path"
+                    })
         
         return blocking_details
     
@@ -211,8 +651,8 @@ class Solver:
         for node_id in path_node_ids:
             position = self.graph.nodes[node_id].position
             
-            # Check obstacles
-            if position in state.obstacles:
+            # Check static obstacles (a bulldozer passes boulders)
+            if position in state.obstacles and state.obstacle_blocks(state.obstacles[position], blocked_vehicle):
                 return state.obstacles[position].id
             
             # Check other vehicles
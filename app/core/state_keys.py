@@ -0,0 +1,74 @@
+from typing import Dict, List, Set
+from models.game_state import GameState
+from models.graph import Position
+
+
+def mix(key: int) -> int:
+    """
+    Hash of a state key, reduced modulo a table size or a partition count.
+    Keys are vehicle bitmasks, so their high bits are mixed in first; the
+    product's high half is folded onto its low half, as the modulus may be
+    a power of two (a transposition table) or tiny (a few workers).
+    """
+    mixed = (key ^ (key >> 29)) * 0x9E3779B97F4A7C15
+    return mixed ^ (mixed >> 32)
+
+
+class StateKeys:
+    """
+    Integer keys of a level's search states: one bit per vehicle still in the
+    level, times the timeline period, plus the tick's phase.
+
+    That is all a state is. Vehicles only ever leave, which boulders are left
+    follows from which bulldozers exited, and the tick only matters modulo
+    the period. Searches that outgrow SearchState objects (iddfs, the
+    disk-backed and parallel searches) keep keys instead and decode a key
+    back into a GameState when it is expanded.
+    """
+
+    def __init__(self, initial_state: GameState, period: int, cleared: Dict[str, Set[Position]]):
+        self.initial_state = initial_state
+        self.period = period
+        self.vehicle_ids: List[str] = list(initial_state.active_vehicles)
+        self.bits: Dict[str, int] = {vehicle_id: 1 << i for i, vehicle_id in enumerate(self.vehicle_ids)}
+        self.full_mask = (1 << len(self.vehicle_ids)) - 1
+        # Boulder positions each bulldozer clears when it exits
+        self.cleared = cleared
+
+    @property
+    def count(self) -> int:
+        """Number of possible keys; every key is below it"""
+        return (self.full_mask + 1) * self.period
+
+    @property
+    def width(self) -> int:
+        """Bytes needed to store any key"""
+        return max(1, ((self.count - 1).bit_length() + 7) // 8)
+
+    @property
+    def root(self) -> int:
+        return self.key(self.full_mask, self.initial_state.turn_number)
+
+    def key(self, mask: int, tick: int) -> int:
+        return mask * self.period + tick % self.period
+
+    def mask(self, key: int) -> int:
+        return key // self.period
+
+    def decode(self, key: int) -> GameState:
+        """The state of a key, at the tick of its phase"""
+        mask, phase = divmod(key, self.period)
+        vehicles = self.initial_state.active_vehicles
+        active, exited = {}, []
+        for vehicle_id in self.vehicle_ids:
+            if mask & self.bits[vehicle_id]:
+                active[vehicle_id] = vehicles[vehicle_id]
+            else:
+                exited.append(vehicle_id)
+        obstacles = self.initial_state.obstacles
+        cleared = set().union(*(self.cleared.get(vehicle_id, ()) for vehicle_id in exited))
+        if cleared:
+            obstacles = {position: obstacle for position, obstacle in obstacles.items()
+                         if position not in cleared}
+        return GameState(active_vehicles=active, obstacles=obstacles, exited_vehicles=exited,
+                         turn_number=phase)
@@ -0,0 +1,132 @@
+from bisect import bisect_right
+from math import lcm
+from typing import Dict, Iterable, List, Optional
+from models.enums import CellType
+from models.graph import Position, RoadGraph
+from models.obstacles import Obstacle, ObstacleType
+
+# Levels whose obstacle schedules only repeat after more ticks than this are
+# rejected: the per-phase masks below would not fit a Lambda comfortably
+MAX_PERIOD = 100_000
+
+TIMED_TYPES = (ObstacleType.TRAFFIC_LIGHT, ObstacleType.PEDESTRIAN)
+
+
+class Timeline:
+    """
+    Precomputed schedule of a level's time-dependent obstacles.
+
+    Every cell a traffic light or pedestrian can block gets a bit, and
+    masks[phase] has the bits of the cells blocked at any tick with
+    tick % period == phase. The whole schedule repeats every `period` ticks
+    (the LCM of the obstacle periods), so the solver only needs
+    tick % period in its state key, and checking a path at a tick is one AND
+    of its path_mask against blocked_mask(tick).
+    """
+
+    def __init__(self, obstacles: Iterable[Obstacle], graph: Optional[RoadGraph] = None):
+        self.obstacles = [o for o in obstacles if o.type in TIMED_TYPES]
+        # Cells each obstacle can block; a light blocks its own cell
+        self.crossings: Dict[str, List[Position]] = {}
+        for obstacle in self.obstacles:
+            if obstacle.type == ObstacleType.PEDESTRIAN:
+                self.crossings[obstacle.id] = crossing_cells(obstacle, graph)
+            else:
+                self.crossings[obstacle.id] = [obstacle.position]
+
+        self.cells: Dict[Position, int] = {}
+        for cells in self.crossings.values():
+            for position in cells:
+                self.cells.setdefault(position, 1 << len(self.cells))
+
+        self.period = lcm(*(o.period for o in self.obstacles)) if self.obstacles else 1
+        if self.period > MAX_PERIOD:
+            raise ValueError(f"Traffic light and pedestrian schedules repeat every {self.period} ticks, "
+                             f"more than the supported {MAX_PERIOD}")
+        self.masks: List[int] = [0] * self.period
+        for obstacle in self.obstacles:
+            # Each obstacle's own cycle is tiled over the common period
+            for phase in range(obstacle.period):
+                mask = self.path_mask(self.blocked_cells(obstacle, phase))
+                if mask:
+                    for tick in range(phase, self.period, obstacle.period):
+                        self.masks[tick] |= mask
+        # path mask -> sorted phases where that path turns clear
+        self._edges: Dict[int, List[int]] = {}
+
+    @property
+    def is_static(self) -> bool:
+        """True when no obstacle depends on time"""
+        return not self.obstacles
+
+    def blocked_cells(self, obstacle: Obstacle, tick: int) -> List[Position]:
+        """Cells `obstacle` blocks at `tick`"""
+        if obstacle.type == ObstacleType.TRAFFIC_LIGHT:
+            return [obstacle.position] if obstacle.is_red_at(tick) else []
+        crossing = self.crossings[obstacle.id]
+        return [crossing[i] for i in obstacle.cells_at(tick, len(crossing))]
+
+    def path_mask(self, positions: Iterable[Position]) -> int:
+        """Bits of the time-dependent cells among `positions`"""
+        mask = 0
+        for position in positions:
+            mask |= self.cells.get(position, 0)
+        return mask
+
+    def blocked_mask(self, tick: int) -> int:
+        return self.masks[tick % self.period]
+
+    def blocker(self, positions: Iterable[Position], tick: int) -> Optional[Obstacle]:
+        """First obstacle blocking one of `positions` at `tick`, in path order"""
+        for position in positions:
+            for obstacle in self.obstacles:
+                if position in self.blocked_cells(obstacle, tick):
+                    return obstacle
+        return None
+
+    def next_clear(self, path_mask: int, tick: int) -> Optional[int]:
+        """
+        First tick after `tick` at which the cells of `path_mask` become clear,
+        having been blocked the tick before; None if that never happens.
+        """
+        edges = self._edges.get(path_mask)
+        if edges is None:
+            masks = self.masks
+            edges = self._edges[path_mask] = [
+                phase for phase in range(self.period)
+                if not masks[phase] & path_mask and masks[phase - 1] & path_mask
+            ]
+        if not edges:
+            return None
+        phase = tick % self.period
+        index = bisect_right(edges, phase)
+        if index < len(edges):
+            return tick + edges[index] - phase
+        return tick + self.period - phase + edges[0]
+
+
+def crossing_cells(pedestrian: Obstacle, graph: Optional[RoadGraph]) -> List[Position]:
+    """
+    The cells a pedestrian walks over, from the north or west end: every lane
+    of the road at its position, i.e. the run of cells of the same road type
+    across the road's direction.
+    """
+    position = pedestrian.position
+    node = graph.get_node(position.x, position.y) if graph is not None else None
+    if node is None or node.cell_type not in (CellType.HORIZONTAL_ROAD, CellType.VERTICAL_ROAD):
+        raise ValueError(f"Pedestrian {pedestrian.id} must stand on a horizontal or vertical road cell")
+    # A horizontal road is crossed north to south, a vertical one west to east
+    dx, dy = (0, 1) if node.cell_type == CellType.HORIZONTAL_ROAD else (1, 0)
+    x, y = position.x, position.y
+    while _same_road(graph, x - dx, y - dy, node.cell_type):
+        x, y = x - dx, y - dy
+    cells = []
+    while _same_road(graph, x, y, node.cell_type):
+        cells.append(Position(x, y))
+        x, y = x + dx, y + dy
+    return cells
+
+
+def _same_road(graph: RoadGraph, x: int, y: int, cell_type: CellType) -> bool:
+    node = graph.get_node(x, y)
+    return node is not None and node.cell_type == cell_type
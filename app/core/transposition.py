@@ -0,0 +1,59 @@
+from typing import List, Optional, Tuple
+from core.state_keys import mix
+
+# Budget recorded for states whose whole subtree was searched without a
+# solution: no later visit, however deep its budget, needs to search them again
+EXHAUSTED = 1 << 62
+
+_EMPTY = -1
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of search results keyed by integer state keys.
+
+    A slot records a state key, the budget (transitions left before the
+    depth limit) with which that state was searched without finding a
+    solution, and whether that search was cut off by the limit; a later
+    visit with no more budget can be skipped. Memory is two lists of `size`
+    ints whatever the number of states searched.
+
+    Keys hash to one slot each. On a collision the entry with the larger
+    budget stays (depth-preferred replacement): it stands for the bigger
+    subtree, so it saves the most work when hit again. size=0 disables the
+    table.
+    """
+
+    def __init__(self, size: int):
+        if size < 0:
+            raise ValueError(f"Transposition table size must be >= 0, got {size}")
+        self.size = size
+        self.keys: List[int] = [_EMPTY] * size
+        self.entries: List[int] = [0] * size  # budget << 1 | cut_off
+        self.used = 0
+
+    def _slot(self, key: int) -> int:
+        return mix(key) % self.size
+
+    def lookup(self, key: int) -> Optional[Tuple[int, bool]]:
+        """(budget, cut_off) `key` was searched with, or None if the table does not know it"""
+        if not self.size:
+            return None
+        slot = self._slot(key)
+        if self.keys[slot] != key:
+            return None
+        entry = self.entries[slot]
+        return entry >> 1, bool(entry & 1)
+
+    def store(self, key: int, budget: int, cut_off: bool = False):
+        if not self.size:
+            return
+        slot = self._slot(key)
+        entry = budget << 1 | cut_off
+        stored = self.keys[slot]
+        if stored == _EMPTY:
+            self.used += 1
+        elif self.entries[slot] > entry:
+            return  # the same key or another one, searched deeper
+        self.keys[slot] = key
+        self.entries[slot] = entry
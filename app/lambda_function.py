@@ -1,6 +1,82 @@
 import json
+import os
 import time
-from services.validator import validate_level
+from services.validator import validate_level, profile_level
+from services.instrumentation import Instrumentation
+from services.profiling import PROFILING_ENABLED
+
+# Engines a request may never force: parallel forks SOLVER_WORKERS processes per solve
+REQUEST_DENIED_ENGINES = ("parallel",)
+
+# Stop starting new levels of a batch when less than this much time remains
+BATCH_DEADLINE_MARGIN_MS = int(os.environ.get("BATCH_DEADLINE_MARGIN_MS", "1000"))
+
+
+def _flag(event: dict, body, name: str) -> bool:
+    """A request option given as a query string parameter or a top-level body field"""
+    query = event.get('queryStringParameters') or {}
+    if str(query.get(name, '')).lower() in ('1', 'true', 'yes'):
+        return True
+    return isinstance(body, dict) and body.get(name) is True
+
+
+def _option(event: dict, body, name: str):
+    """A string request option from the query string or a top-level body field"""
+    query = event.get('queryStringParameters') or {}
+    if query.get(name):
+        return str(query[name])
+    value = body.get(name) if isinstance(body, dict) else None
+    return value if isinstance(value, str) else None
+
+
+def validate_batch(levels: list, context, instrument: bool = False, engine=None) -> dict:
+    """
+    Validate the levels of a {"levels": [...]} request one after another.
+    They share the process-wide graph and result caches, so a chapter reusing
+    a layout compiles it once. Before each level the remaining invocation time
+    is checked; once it drops below BATCH_DEADLINE_MARGIN_MS the remaining
+    levels are returned as NOT_REACHED instead of timing out the whole batch.
+    """
+    get_remaining_ms = getattr(context, 'get_remaining_time_in_millis', None)
+    batch_start = time.perf_counter()
+    results = []
+    not_reached = 0
+
+    for index, level_data in enumerate(levels):
+        level_id = level_data.get('levelId') if isinstance(level_data, dict) else None
+        if get_remaining_ms is not None and get_remaining_ms() < BATCH_DEADLINE_MARGIN_MS:
+            not_reached += 1
+            results.append({
+                'index': index,
+                'levelId': level_id,
+                'error': {
+                    'code': 'NOT_REACHED',
+                    'message': 'Level was not validated before the invocation deadline'
+                }
+            })
+            continue
+
+        start_time = time.perf_counter()
+        if isinstance(level_data, dict):
+            result = validate_level(level_data, Instrumentation.for_request(instrument), engine)
+        else:
+            # A client error like a missing field, not a SERVER_ERROR from indexing it
+            result = {
+                'error': {
+                    'code': 'INVALID_REQUEST',
+                    'message': 'Each entry of levels must be a level object'
+                }
+            }
+        result['executionTimeMs'] = round((time.perf_counter() - start_time) * 1000, 3)
+        results.append({'index': index, 'levelId': level_id, **result})
+
+    return {
+        'results': results,
+        'validated': len(results) - not_reached,
+        'notReached': not_reached,
+        'executionTimeMs': round((time.perf_counter() - batch_start) * 1000, 3)
+    }
+
 
 def lambda_handler(event, context):
     """AWS Lambda handler for level validation"""
@@ -16,16 +92,68 @@ def lambda_handler(event, context):
             }
 
         # Handle different event sources (API Gateway, direct invocation, etc.)
+        parse_start = time.perf_counter()
         if isinstance(event.get('body'), str):
             body = json.loads(event['body'])
         elif isinstance(event.get('body'), dict):
             body = event['body']
         else:
             body = event
+        parse_ms = (time.perf_counter() - parse_start) * 1000
+
+        # Opt-in phase timings and solver counters (also VALIDATOR_INSTRUMENTATION=1)
+        instrument = _flag(event, body, 'instrument')
+        # Forces a solver engine instead of the automatic choice; a debug option
+        # like profile, since bfs or iddfs on a large static level costs far more
+        # than the greedy engine it replaces
+        engine = _option(event, body, 'engine') if PROFILING_ENABLED else None
+        if engine in REQUEST_DENIED_ENGINES:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({
+                    'error': {
+                        'code': 'INVALID_REQUEST',
+                        'message': f"Engine {engine!r} forks worker processes and cannot be requested"
+                    }
+                })
+            }
+
+        if isinstance(body, dict) and 'levels' in body:
+            if not isinstance(body['levels'], list):
+                result = {
+                    'error': {
+                        'code': 'INVALID_REQUEST',
+                        'message': 'levels must be an array of level objects'
+                    }
+                }
+                status_code = 400
+            else:
+                # Per-level outcomes are reported inside the batch result
+                result = validate_batch(body['levels'], context, instrument, engine)
+                status_code = 200
+            return {
+                'statusCode': status_code,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps(result)
+            }
+
+        instrumentation = Instrumentation.for_request(instrument)
+        instrumentation.record('parse', parse_ms)
 
         # Time the validation
         start_time = time.perf_counter()
-        result = validate_level(body)
+        if PROFILING_ENABLED and _flag(event, body, 'profile'):
+            # Debug capture, only honoured where VALIDATOR_PROFILING=1
+            result = profile_level(body, instrumentation, engine)
+        else:
+            result = validate_level(body, instrumentation, engine)
         duration_ms = round((time.perf_counter() - start_time) * 1000, 3)  # milliseconds with precision
 
         # Include timing in response
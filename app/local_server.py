@@ -0,0 +1,199 @@
+"""
+Local HTTP stand-in for the Lambda deployment.
+
+    python -m app.local_server --port 8080 --workers 8 --warm levels/
+
+Speaks the lambda_handler contract over plain HTTP/1.1 (keep-alive
+supported): each request becomes an API Gateway style event and the
+handler's statusCode, headers and body become the response. An asyncio
+loop accepts connections and hands events to a pool of worker processes.
+
+Workers are forked once, after the parent has loaded the graph snapshot
+and validated the --warm levels, so every worker starts with the same warm
+GraphCache shared copy-on-write. gc.freeze() before the fork keeps the
+collector from touching (and thereby copying) those pages.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+app_dir = Path(__file__).resolve().parent
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from lambda_function import lambda_handler  # noqa: E402
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+            422: "Unprocessable Entity", 500: "Internal Server Error", 504: "Gateway Timeout"}
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class LocalContext:
+    """Minimal Lambda context: the remaining time counts down from the request timeout"""
+
+    def __init__(self, timeout_ms: int):
+        self.deadline = time.monotonic() + timeout_ms / 1000
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self.deadline - time.monotonic()) * 1000))
+
+
+def handle_event(event: Dict[str, Any], timeout_ms: int) -> Dict[str, Any]:
+    """Worker entry point"""
+    return lambda_handler(event, LocalContext(timeout_ms))
+
+
+def _warm_worker():
+    """No-op task used to make the pool fork every worker up front"""
+    return os.getpid()
+
+
+def warm_up(paths: Iterable[str]) -> int:
+    """Load the snapshot and validate the levels in `paths` in this process; returns the count"""
+    from services.level_loader import LevelLoader
+    from tools.bake_cache import iter_levels
+
+    snapshot = LevelLoader.graph_cache.snapshot
+    if snapshot is not None:
+        snapshot.load_all()
+    count = 0
+    for level_data in iter_levels(list(paths)):
+        lambda_handler(level_data, None)
+        count += 1
+    return count
+
+
+def create_pool(workers: int) -> ProcessPoolExecutor:
+    """Fork `workers` processes now, inheriting this process's warm caches"""
+    gc.collect()
+    gc.freeze()
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"))
+    # With the fork start method every worker is launched on the first submit
+    for future in [pool.submit(_warm_worker) for _ in range(workers)]:
+        future.result()
+    return pool
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """Parse one HTTP/1.1 request; None when the client closed the connection"""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", "0"))
+    if length > MAX_BODY_BYTES:
+        raise ValueError("body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body
+
+
+def _to_event(method: str, target: str, headers: Dict[str, str], body: bytes) -> Dict[str, Any]:
+    url = urlsplit(target)
+    return {
+        "httpMethod": method,
+        "path": url.path,
+        "queryStringParameters": dict(parse_qsl(url.query)) or None,
+        "headers": headers,
+        "body": body.decode("utf-8") if body else None,
+    }
+
+
+def _write_response(writer: asyncio.StreamWriter, status: int, headers: Dict[str, str], body: str,
+                    keep_alive: bool):
+    payload = body.encode("utf-8")
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}"]
+    for name, value in headers.items():
+        lines.append(f"{name}: {value}")
+    lines.append(f"Content-Length: {len(payload)}")
+    lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + payload)
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                            pool: ProcessPoolExecutor, timeout_ms: int):
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except (ValueError, asyncio.IncompleteReadError):
+                _write_response(writer, 400, {"Content-Type": "application/json"},
+                                json.dumps({"error": {"code": "INVALID_REQUEST",
+                                                      "message": "Malformed HTTP request"}}), False)
+                break
+            if request is None:
+                break
+            method, target, headers, body = request
+            keep_alive = headers.get("connection", "keep-alive").lower() != "close"
+
+            try:
+                response = await asyncio.wait_for(
+                    loop.run_in_executor(pool, handle_event, _to_event(method, target, headers, body), timeout_ms),
+                    timeout=timeout_ms / 1000)
+            except asyncio.TimeoutError:
+                # Like API Gateway, give up on the client side; the worker finishes in the background
+                response = {"statusCode": 504, "headers": {"Content-Type": "application/json"},
+                            "body": json.dumps({"error": {"code": "TIMEOUT",
+                                                          "message": "Validation did not finish in time"}})}
+            _write_response(writer, response["statusCode"], response.get("headers", {}),
+                            response.get("body", ""), keep_alive)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str, port: int, pool: ProcessPoolExecutor, timeout_ms: int,
+                ready: Optional[asyncio.Future] = None):
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(reader, writer, pool, timeout_ms), host, port)
+    if ready is not None:
+        ready.set_result(server.sockets[0].getsockname()[1])
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.local_server", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--timeout-ms", type=int, default=29000, help="per-request budget (API Gateway: 29s)")
+    parser.add_argument("--warm", nargs="*", default=[], help="level files/directories to validate before forking")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    warmed = warm_up(args.warm)
+    pool = create_pool(args.workers)
+    print(f"Warmed {warmed} levels and forked {args.workers} workers in {time.perf_counter() - start:.2f}s; "
+          f"listening on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        asyncio.run(serve(args.host, args.port, pool, args.timeout_ms))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -59,15 +59,22 @@ class GameState:
         # Check for obstacles
         if position in self.obstacles:
             obstacle = self.obstacles[position]
-            
-            # Bulldozers can clear boulders
-            if obstacle.type.value == "BOULDER" and vehicle.can_clear_obstacles():
-                return False, None
-            else:
+            if self.obstacle_blocks(obstacle, vehicle):
                 return True, f"{obstacle.type.value} blocks path"
         
         return False, None
     
+    def obstacle_blocks(self, obstacle: Obstacle, vehicle: Vehicle) -> bool:
+        """
+        Check if a static obstacle blocks a vehicle. Traffic lights and
+        pedestrians block by schedule; the solver checks them per tick
+        against a core.timeline.Timeline.
+        """
+        # Bulldozers can clear boulders
+        if obstacle.type.value == "BOULDER":
+            return not vehicle.can_clear_obstacles()
+        return obstacle.type.value not in ("TRAFFIC_LIGHT", "PEDESTRIAN")
+    
     def is_path_clear(self, path_node_ids: List[str], vehicle: Vehicle, graph: RoadGraph) -> Tuple[bool, Optional[str]]:
         """
         Check if an entire path is clear for a vehicle.
@@ -114,6 +121,15 @@ class GameState:
             turn_number=self.turn_number + 1
         )
     
+    def advance(self, ticks: int) -> 'GameState':
+        """Create a new state where `ticks` ticks pass without any vehicle moving"""
+        return GameState(
+            active_vehicles=self.active_vehicles,
+            obstacles=self.obstacles,
+            exited_vehicles=self.exited_vehicles,
+            turn_number=self.turn_number + ticks
+        )
+    
     def is_solved(self) -> bool:
         """Check if all vehicles have exited"""
         return len(self.active_vehicles) == 0
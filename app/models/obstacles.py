@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from enum import Enum
 from models.graph import Position
 
@@ -20,7 +20,7 @@ class Obstacle:
         """Check if this obstacle blocks a vehicle"""
         if self.type == ObstacleType.BOULDER:
             return not vehicle_can_clear
-        return False  # Traffic lights and pedestrians should not block (for future implementation)
+        return False  # Traffic lights and pedestrians block by schedule, see core.timeline
     
     def to_dict(self) -> dict:
         """Base conversion to JSON"""
@@ -37,6 +37,113 @@ class Boulder(Obstacle):
         super().__init__(id, ObstacleType.BOULDER, position)
 
 
+class LightState(Enum):
+    RED = "RED"
+    GREEN = "GREEN"
+
+
+@dataclass
+class TrafficLight(Obstacle):
+    """
+    A light cycling RED for red_duration ticks, then GREEN for green_duration
+    ticks. At tick 0 it shows current_state, which flips after current_timer
+    more ticks (a full duration when omitted). While red it blocks every
+    vehicle, bulldozers included.
+    """
+    current_state: LightState
+    red_duration: int
+    green_duration: int
+    current_timer: int
+
+    def __init__(self, id: str, position: Position, current_state: LightState,
+                 red_duration: int, green_duration: int, current_timer: Optional[int] = None):
+        super().__init__(id, ObstacleType.TRAFFIC_LIGHT, position)
+        if red_duration < 1 or green_duration < 1:
+            raise ValueError(f"Traffic light {id} needs positive red and green durations")
+        duration = red_duration if current_state == LightState.RED else green_duration
+        if current_timer is None:
+            current_timer = duration
+        if not 0 < current_timer <= duration:
+            raise ValueError(f"Traffic light {id} timer {current_timer} is outside its "
+                             f"{current_state.value} duration of {duration}")
+        self.current_state = current_state
+        self.red_duration = red_duration
+        self.green_duration = green_duration
+        self.current_timer = current_timer
+
+    @property
+    def period(self) -> int:
+        return self.red_duration + self.green_duration
+
+    def is_red_at(self, tick: int) -> bool:
+        """Whether the light is red `tick` ticks after the level starts"""
+        # Position in the RED-then-GREEN cycle at tick 0
+        if self.current_state == LightState.RED:
+            start = self.red_duration - self.current_timer
+        else:
+            start = self.period - self.current_timer
+        return (start + tick) % self.period < self.red_duration
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data["currentState"] = self.current_state.value
+        data["timing"] = {
+            "redDuration": self.red_duration,
+            "greenDuration": self.green_duration,
+            "currentTimer": self.current_timer
+        }
+        return data
+
+
+@dataclass
+class Pedestrian(Obstacle):
+    """
+    A pedestrian walking back and forth across the road at `position`, over
+    every lane of it (see core.timeline for how the crossing is found). One
+    crossing takes crossing_time ticks, so the walk repeats every
+    2 * crossing_time ticks; current_progress is the tick of that cycle at
+    tick 0, starting from the north or west end. The cells under the
+    pedestrian block every vehicle, bulldozers included.
+    """
+    crossing_time: int
+    current_progress: int
+
+    def __init__(self, id: str, position: Position, crossing_time: int, current_progress: int = 0):
+        super().__init__(id, ObstacleType.PEDESTRIAN, position)
+        if crossing_time < 1:
+            raise ValueError(f"Pedestrian {id} needs a positive crossing time")
+        if not 0 <= current_progress < 2 * crossing_time:
+            raise ValueError(f"Pedestrian {id} progress {current_progress} is outside its "
+                             f"walk of {2 * crossing_time} ticks")
+        self.crossing_time = crossing_time
+        self.current_progress = current_progress
+
+    @property
+    def period(self) -> int:
+        return 2 * self.crossing_time
+
+    def cells_at(self, tick: int, crossing_length: int) -> List[int]:
+        """
+        Indices (from the north/west end) of the crossing cells the pedestrian
+        covers during `tick`; several when the crossing is faster than one
+        cell per tick.
+        """
+        step = (self.current_progress + tick) % self.period
+        forward = step < self.crossing_time
+        if not forward:
+            step -= self.crossing_time
+        first = step * crossing_length // self.crossing_time
+        last = ((step + 1) * crossing_length - 1) // self.crossing_time
+        cells = range(first, last + 1)
+        return list(cells) if forward else [crossing_length - 1 - i for i in cells]
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data["crossingTime"] = self.crossing_time
+        data["currentProgress"] = self.current_progress
+        return data
+
+
 def obstacle_from_dict(data: dict) -> Obstacle:
     """function to create appropriate obstacle type from JSON"""
     obs_type = ObstacleType(data["type"])
@@ -45,8 +152,10 @@ def obstacle_from_dict(data: dict) -> Obstacle:
     if obs_type == ObstacleType.BOULDER:
         return Boulder(data["id"], position)
     elif obs_type == ObstacleType.TRAFFIC_LIGHT:
-        pass    
+        timing = data["timing"]
+        return TrafficLight(data["id"], position, LightState(data["currentState"]),
+                            timing["redDuration"], timing["greenDuration"], timing.get("currentTimer"))
     elif obs_type == ObstacleType.PEDESTRIAN:
-        pass    
+        return Pedestrian(data["id"], position, data["crossingTime"], data.get("currentProgress", 0))
     else:
         raise ValueError(f"Unknown obstacle type: {obs_type}")
\ No newline at end of file
@@ -0,0 +1,91 @@
+import os
+import time
+from typing import Any, Dict
+
+# Instrument every request, not only those asking for it
+INSTRUMENTATION_ENABLED = os.environ.get("VALIDATOR_INSTRUMENTATION", "").lower() in ("1", "true", "yes")
+
+
+class _Phase:
+    """Context manager adding its elapsed time to one phase of an Instrumentation"""
+    __slots__ = ("phases", "name", "start")
+
+    def __init__(self, phases: Dict[str, float], name: str):
+        self.phases = phases
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        self.phases[self.name] = self.phases.get(self.name, 0.0) + elapsed
+
+
+class Instrumentation:
+    """
+    Per-request timing breakdown and counters, returned as the
+    "instrumentation" field of a validation response.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, Any] = {}
+
+    @classmethod
+    def for_request(cls, requested: bool = False) -> 'Instrumentation':
+        """A recording instance if the request or VALIDATOR_INSTRUMENTATION asks for one"""
+        return cls() if requested or INSTRUMENTATION_ENABLED else NULL_INSTRUMENTATION
+
+    def phase(self, name: str) -> _Phase:
+        return _Phase(self.phases, name)
+
+    def record(self, name: str, elapsed_ms: float):
+        """Add a phase timed elsewhere (e.g. request parsing)"""
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed_ms
+
+    def set(self, name: str, value: Any):
+        self.counters[name] = value
+
+    def update(self, counters: Dict[str, Any]):
+        self.counters.update(counters)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "phasesMs": {name: round(ms, 3) for name, ms in self.phases.items()},
+            "counters": dict(self.counters)
+        }
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class NullInstrumentation(Instrumentation):
+    """Instrumentation that records nothing; the default for every request"""
+    enabled = False
+
+    def phase(self, name: str) -> _NullPhase:
+        return _NULL_PHASE
+
+    def record(self, name: str, elapsed_ms: float):
+        pass
+
+    def set(self, name: str, value: Any):
+        pass
+
+    def update(self, counters: Dict[str, Any]):
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
@@ -0,0 +1,304 @@
+"""
+Compact binary level format and memory-mapped level packs.
+
+Level (little-endian), format version 1:
+
+    header     magic "TPLV", version u8, reserved u8, width u16, height u16,
+               vehicle count u16, obstacle count u16, levelId length u16
+    levelId    UTF-8 bytes
+    layout     width * height bytes, one cell character per byte, row-major
+    vehicles   16 bytes each: id (8 bytes, NUL padded), type u8, length u8,
+               x u16, y u16, orientation u8, movement rule u8
+    obstacles  18 bytes each: id (8 bytes, NUL padded), type u8, x u16, y u16,
+               then type-specific fields a u8, b u16, c u16, d u16:
+                 TRAFFIC_LIGHT  a=currentState, b=redDuration, c=greenDuration, d=currentTimer (0 = omitted)
+                 PEDESTRIAN     a=reserved, b=crossingTime, c=currentProgress, d=reserved
+
+Pack: magic "TPLP", version u16, the level blobs back to back, a table of
+u64 blob offsets, then a footer of level count u64 and table offset u64.
+The footer comes last so packs can be written in one streaming pass.
+"""
+import mmap
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from models.enums import Orientation, MovementRule
+from models.vehicles import VehicleType
+from models.obstacles import ObstacleType
+from core.layout_digest import encode_cells
+
+FORMAT_VERSION = 1
+
+_LEVEL_MAGIC = b"TPLV"
+_LEVEL_HEADER = struct.Struct("<4sBBHHHHH")
+_VEHICLE = struct.Struct("<8sBBHHBB")
+_OBSTACLE = struct.Struct("<8sBHHBHHH")
+_ID_SIZE = 8
+_DIMENSIONS = struct.Struct("<II")
+
+_PACK_MAGIC = b"TPLP"
+_PACK_HEADER = struct.Struct("<4sH")
+_PACK_FOOTER = struct.Struct("<QQ")
+_OFFSET = struct.Struct("<Q")
+
+# Enum codes are list positions; append only, never reorder
+VEHICLE_TYPES = [VehicleType.CAR, VehicleType.TRUCK, VehicleType.BULLDOZER]
+ORIENTATIONS = [Orientation.NORTH, Orientation.SOUTH, Orientation.EAST, Orientation.WEST]
+MOVEMENT_RULES = [MovementRule.STRAIGHT, MovementRule.LEFT, MovementRule.RIGHT,
+                  MovementRule.LEFT_U_TURN, MovementRule.RIGHT_U_TURN]
+OBSTACLE_TYPES = [ObstacleType.BOULDER, ObstacleType.TRAFFIC_LIGHT, ObstacleType.PEDESTRIAN]
+LIGHT_STATES = ["RED", "GREEN"]
+
+_VEHICLE_TYPE_CODES = {t.value: i for i, t in enumerate(VEHICLE_TYPES)}
+_ORIENTATION_CODES = {o.value: i for i, o in enumerate(ORIENTATIONS)}
+_MOVEMENT_RULE_CODES = {r.value: i for i, r in enumerate(MOVEMENT_RULES)}
+_OBSTACLE_TYPE_CODES = {t.value: i for i, t in enumerate(OBSTACLE_TYPES)}
+
+VehicleRecord = Tuple[str, VehicleType, int, int, int, Orientation, MovementRule]
+
+
+def is_binary_level(level_data: Any) -> bool:
+    return isinstance(level_data, (bytes, bytearray, memoryview))
+
+
+def _encode_id(item_id: str) -> bytes:
+    encoded = item_id.encode("utf-8")
+    if len(encoded) > _ID_SIZE:
+        raise ValueError(f"Id {item_id!r} is longer than {_ID_SIZE} bytes")
+    return encoded
+
+
+def _decode_id(raw: bytes) -> str:
+    return raw.rstrip(b"\0").decode("utf-8")
+
+
+def encode_level(level_data: Dict[str, Any]) -> bytes:
+    """Convert a level from the JSON schema into the binary format"""
+    grid = level_data["grid"]
+    width = grid["dimensions"]["width"]
+    height = grid["dimensions"]["height"]
+    cells = encode_cells(grid["layout"], width, height)
+
+    vehicles = level_data.get("vehicles", [])
+    obstacles = level_data.get("obstacles", [])
+    level_id = (level_data.get("levelId") or "").encode("utf-8")
+
+    parts = [
+        _LEVEL_HEADER.pack(_LEVEL_MAGIC, FORMAT_VERSION, 0, width, height,
+                           len(vehicles), len(obstacles), len(level_id)),
+        level_id,
+        cells,
+    ]
+    for v in vehicles:
+        parts.append(_VEHICLE.pack(
+            _encode_id(v["id"]), _VEHICLE_TYPE_CODES[v["type"]], v["length"],
+            v["position"]["x"], v["position"]["y"],
+            _ORIENTATION_CODES[v["orientation"]], _MOVEMENT_RULE_CODES[v["movementRule"]]
+        ))
+    for o in obstacles:
+        a = b = c = d = 0
+        if o["type"] == ObstacleType.TRAFFIC_LIGHT.value:
+            timing = o.get("timing", {})
+            a = LIGHT_STATES.index(o.get("currentState", "RED"))
+            b, c, d = timing.get("redDuration", 0), timing.get("greenDuration", 0), timing.get("currentTimer", 0)
+        elif o["type"] == ObstacleType.PEDESTRIAN.value:
+            b, c = o.get("crossingTime", 0), o.get("currentProgress", 0)
+        parts.append(_OBSTACLE.pack(
+            _encode_id(o["id"]), _OBSTACLE_TYPE_CODES[o["type"]],
+            o["position"]["x"], o["position"]["y"], a, b, c, d
+        ))
+    return b"".join(parts)
+
+
+class BinaryLevel:
+    """
+    Parsed view of a binary level. Records are decoded straight to enum
+    members; the layout stays as raw cell bytes until a list form is needed.
+    """
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        if len(view) < _LEVEL_HEADER.size:
+            raise ValueError("Binary level is truncated")
+        (magic, version, _, self.width, self.height,
+         vehicle_count, obstacle_count, id_length) = _LEVEL_HEADER.unpack_from(view, 0)
+        if magic != _LEVEL_MAGIC:
+            raise ValueError("Not a binary level")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary level version {version}")
+
+        offset = _LEVEL_HEADER.size
+        self.level_id = bytes(view[offset:offset + id_length]).decode("utf-8")
+        offset += id_length
+        area = self.width * self.height
+        self.cells = bytes(view[offset:offset + area])
+        offset += area
+        self._vehicles_offset = offset
+        offset += vehicle_count * _VEHICLE.size
+        self._obstacles_offset = offset
+        offset += obstacle_count * _OBSTACLE.size
+        if len(view) < offset or len(self.cells) != area:
+            raise ValueError("Binary level is truncated")
+
+        self._view = view
+        self.vehicle_count = vehicle_count
+        self.obstacle_count = obstacle_count
+
+    @property
+    def encoded_layout(self) -> bytes:
+        """The layout in encode_layout form (dimensions + cells), without re-encoding"""
+        return _DIMENSIONS.pack(self.width, self.height) + self.cells
+
+    def layout(self) -> List[List[str]]:
+        text = self.cells.decode("ascii")
+        return [list(text[y * self.width:(y + 1) * self.width]) for y in range(self.height)]
+
+    def vehicle_records(self) -> Iterator[VehicleRecord]:
+        records = _VEHICLE.iter_unpack(self._view[self._vehicles_offset:self._obstacles_offset])
+        try:
+            for raw_id, type_code, length, x, y, orientation, rule in records:
+                yield (_decode_id(raw_id), VEHICLE_TYPES[type_code], length, x, y,
+                       ORIENTATIONS[orientation], MOVEMENT_RULES[rule])
+        except IndexError:
+            raise ValueError("Binary level contains an unknown vehicle enum code") from None
+
+    def obstacle_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Obstacles in JSON-schema form, for obstacle_from_dict"""
+        end = self._obstacles_offset + self.obstacle_count * _OBSTACLE.size
+        for raw_id, type_code, x, y, a, b, c, d in _OBSTACLE.iter_unpack(self._view[self._obstacles_offset:end]):
+            if type_code >= len(OBSTACLE_TYPES) or a >= len(LIGHT_STATES):
+                raise ValueError("Binary level contains an unknown obstacle enum code")
+            obstacle_type = OBSTACLE_TYPES[type_code]
+            data = {"id": _decode_id(raw_id), "type": obstacle_type.value, "position": {"x": x, "y": y}}
+            if obstacle_type == ObstacleType.TRAFFIC_LIGHT:
+                data["currentState"] = LIGHT_STATES[a]
+                data["timing"] = {"redDuration": b, "greenDuration": c}
+                if d:  # 0 stands for an omitted timer
+                    data["timing"]["currentTimer"] = d
+            elif obstacle_type == ObstacleType.PEDESTRIAN:
+                data["crossingTime"] = b
+                data["currentProgress"] = c
+            yield data
+
+    def fingerprint_parts(self) -> Optional[Tuple[bytes, List[str]]]:
+        """
+        Content of the level with ids stripped, records sorted, plus ids in the
+        same order; the binary counterpart of validator.level_fingerprint.
+        None if two records are indistinguishable without their ids.
+        """
+        records = []
+        ids = []
+        for start, count, size in ((self._vehicles_offset, self.vehicle_count, _VEHICLE.size),
+                                   (self._obstacles_offset, self.obstacle_count, _OBSTACLE.size)):
+            entries = sorted(
+                (bytes(self._view[i + _ID_SIZE:i + size]), _decode_id(bytes(self._view[i:i + _ID_SIZE])))
+                for i in range(start, start + count * size, size)
+            )
+            contents = [content for content, _ in entries]
+            if len(set(contents)) != len(contents):
+                return None
+            records.append(b"|".join(contents))
+            ids.extend(item_id for _, item_id in entries)
+        return self.encoded_layout + b"#" + b"#".join(records), ids
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Decode back into the JSON schema (metadata is not stored)"""
+        return {
+            "levelId": self.level_id,
+            "grid": {
+                "dimensions": {"width": self.width, "height": self.height},
+                "layout": self.layout(),
+            },
+            "vehicles": [
+                {"id": vid, "type": vtype.value, "length": length, "position": {"x": x, "y": y},
+                 "orientation": orientation.value, "movementRule": rule.value}
+                for vid, vtype, length, x, y, orientation, rule in self.vehicle_records()
+            ],
+            "obstacles": list(self.obstacle_dicts()),
+        }
+
+
+def decode_level(buffer) -> Dict[str, Any]:
+    """Convert a binary level back into the JSON schema"""
+    return BinaryLevel(buffer).to_dict()
+
+
+def write_pack(path: str, levels: Iterable[Dict[str, Any]]) -> int:
+    """Encode JSON-schema levels into a pack file in one streaming pass; returns the count"""
+    offsets = []
+    with open(path, "wb") as f:
+        f.write(_PACK_HEADER.pack(_PACK_MAGIC, FORMAT_VERSION))
+        position = _PACK_HEADER.size
+        for level_data in levels:
+            blob = encode_level(level_data)
+            offsets.append(position)
+            f.write(blob)
+            position += len(blob)
+        offsets.append(position)  # end of the last blob
+        for offset in offsets:
+            f.write(_OFFSET.pack(offset))
+        f.write(_PACK_FOOTER.pack(len(offsets) - 1, position))
+    return len(offsets) - 1
+
+
+def is_level_pack(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(_PACK_MAGIC)) == _PACK_MAGIC
+    except OSError:
+        return False
+
+
+class LevelPack:
+    """
+    Memory-mapped pack of binary levels. Indexing returns the raw level blob
+    (a memoryview into the map), which LevelLoader.load_level accepts directly.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = _PACK_HEADER.unpack_from(self._mm, 0)
+        if magic != _PACK_MAGIC or version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} level pack")
+        self._count, self._table_offset = _PACK_FOOTER.unpack_from(self._mm, len(self._mm) - _PACK_FOOTER.size)
+        self._view = memoryview(self._mm)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _offset(self, index: int) -> int:
+        return _OFFSET.unpack_from(self._mm, self._table_offset + index * _OFFSET.size)[0]
+
+    def __getitem__(self, index: int) -> memoryview:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("level pack index out of range")
+        return self._view[self._offset(index):self._offset(index + 1)]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for index in range(self._count):
+            yield self[index]
+
+    def close(self):
+        try:
+            self._view.release()
+            self._mm.close()
+        except BufferError:
+            pass  # entries are still referenced; the map is closed when they are collected
+
+    def __enter__(self) -> 'LevelPack':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def peek_layout(buffer) -> Optional[bytes]:
+    """encode_layout form of a binary level's grid, or None if it is not one"""
+    try:
+        return BinaryLevel(buffer).encoded_layout
+    except (ValueError, struct.error):
+        return None
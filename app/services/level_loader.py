@@ -1,46 +1,39 @@
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple, Union
 from models.graph import RoadGraph, Position
 from models.vehicles import Vehicle
 from models.obstacles import obstacle_from_dict
 from models.game_state import GameState
 from core.graph_builder import GraphBuilder
 from core.path_calculator import PathCalculator
-from core.graph_cache import GraphCache
+from core.graph_cache import GraphCache, LayoutKey
+from core.graph_store import DiskGraphCache, GraphSnapshot
+from core.layout_symmetry import transform_layout, transform_dims
+from services.level_codec import BinaryLevel, is_binary_level
+from services.instrumentation import Instrumentation, NULL_INSTRUMENTATION
 
 
 class LevelLoader:
     """Loads and processes level data from JSON format"""
-    graph_cache = GraphCache()   
+    # Shared across requests in the process; backed by the bundled snapshot
+    # (GRAPH_SNAPSHOT) and the disk cache (GRAPH_CACHE_DIR) when configured
+    graph_cache = GraphCache(disk_cache=DiskGraphCache.from_env(), snapshot=GraphSnapshot.from_env())
 
-    def __init__(self):
+    def __init__(self, instrumentation: Instrumentation = NULL_INSTRUMENTATION):
         self.graph_builder = GraphBuilder()
         self.path_calculator = PathCalculator()
+        self.instrumentation = instrumentation
     
-    def load_level(self, level_data: dict) -> Tuple[RoadGraph, GameState]:
+    def load_level(self, level_data: Union[dict, bytes]) -> Tuple[RoadGraph, GameState]:
         """
         Load level from JSON data and return graph and initial state.
         Adds exit border around the grid as specified in the docs.
+        Also accepts a level in the binary format (see services.level_codec).
         """
-        # Extract grid data
-        grid_data = level_data["grid"]
-        original_width = grid_data["dimensions"]["width"]
-        original_height = grid_data["dimensions"]["height"]
-        original_layout = grid_data["layout"]
-        
-        # Add exit border
-        layout_with_exits = self._add_exit_border(original_layout)
-        width = original_width + 2
-        height = original_height + 2
-        
-        # Check cache first and retrieve graph if available 
-        # Create a new graph if not found in cache
-        graph = self.graph_cache.get(layout_with_exits)
-        if not graph:
-            graph = self.graph_builder.build_graph(width, height, layout_with_exits)
-            self.path_calculator.calculate_all_paths(graph)
-            self.graph_cache.put(layout_with_exits, graph)
+        if is_binary_level(level_data):
+            return self.load_binary_level(level_data)
 
-                
+        graph = self.load_graph(level_data["grid"])
+        
         # Load vehicles (adjust positions for border)
         vehicles = []
         for vehicle_data in level_data.get("vehicles", []):
@@ -73,8 +66,83 @@ class LevelLoader:
         
         return graph, initial_state
     
+    def load_binary_level(self, buffer) -> Tuple[RoadGraph, GameState]:
+        """
+        Load a level encoded with services.level_codec.encode_level.
+        The layout bytes feed the cache key directly and records decode
+        straight into vehicles, skipping the intermediate JSON dicts.
+        """
+        level = BinaryLevel(buffer)
+        with self.instrumentation.phase("cacheLookup"):
+            cache_key = self.graph_cache.get_cache_key_encoded(level.encoded_layout, level.layout)
+        graph = self._graph_for_key(cache_key, level.width, level.height, level.layout)
+        
+        # Positions are shifted by one for the exit border, as in load_level
+        vehicles = [
+            Vehicle(vehicle_id, vehicle_type, length, Position(x + 1, y + 1), orientation, movement_rule)
+            for vehicle_id, vehicle_type, length, x, y, orientation, movement_rule in level.vehicle_records()
+        ]
+        obstacles = {}
+        for obstacle_data in level.obstacle_dicts():
+            obstacle = obstacle_from_dict(obstacle_data)
+            obstacle.position = Position(obstacle.position.x + 1, obstacle.position.y + 1)
+            obstacles[obstacle.position] = obstacle
+        
+        initial_state = GameState(
+            active_vehicles={v.id: v for v in vehicles},
+            obstacles=obstacles,
+            exited_vehicles=[]
+        )
+        return graph, initial_state
+    
+    def load_graph(self, grid_data: dict) -> RoadGraph:
+        """Return the compiled graph (with exit border) for a level's grid, using the cache"""
+        original_width = grid_data["dimensions"]["width"]
+        original_height = grid_data["dimensions"]["height"]
+        original_layout = grid_data["layout"]
+        self._check_dimensions(original_layout, original_width, original_height)
+        
+        # Check cache first and retrieve graph if available.
+        # The key covers the layout as given: the exit border is the same for
+        # every layout, so it is added virtually when a graph is compiled.
+        # On a miss, compile the canonical rotation/mirror of the layout so the
+        # entry is shared by every variant, then view it in this orientation.
+        with self.instrumentation.phase("cacheLookup"):
+            cache_key = self.graph_cache.get_cache_key(original_layout, original_width, original_height)
+        return self._graph_for_key(cache_key, original_width, original_height, lambda: original_layout)
+    
+    def _graph_for_key(self, cache_key: LayoutKey, original_width: int, original_height: int,
+                       get_layout: Callable[[], List[List[str]]]) -> RoadGraph:
+        """Fetch the graph for a key, compiling the canonical layout on a miss"""
+        instrumentation = self.instrumentation
+        with instrumentation.phase("cacheLookup"):
+            graph = self.graph_cache.get(cache_key)
+        instrumentation.set("graphCache", "hit" if graph else "miss")
+        if not graph:
+            with instrumentation.phase("buildGraph"):
+                canonical_layout = transform_layout(get_layout(), cache_key.transform)
+                canonical_width, canonical_height = transform_dims(original_width, original_height, cache_key.transform)
+                canonical_graph = self.graph_builder.build_graph(
+                    canonical_width, canonical_height, canonical_layout, exit_border=True
+                )
+            with instrumentation.phase("calculateAllPaths"):
+                self.path_calculator.calculate_all_paths(canonical_graph)
+            self.graph_cache.put(cache_key, canonical_graph)
+            graph = self.graph_cache.orient(cache_key, canonical_graph)
+        return graph
+    
+    def _check_dimensions(self, layout: List[List[str]], width: int, height: int):
+        """Ensure the layout is a width x height rectangle"""
+        if len(layout) != height or any(len(row) != width for row in layout):
+            raise ValueError(
+                f"Grid layout does not match dimensions {width}x{height}"
+            )
+    
     def _add_exit_border(self, layout: List[List[str]]) -> List[List[str]]:
-        """Add 'E' exit nodes around the entire grid"""
+        """
+        Add 'E' exit nodes around the entire grid.
+        Only for display: graphs get their border from GraphBuilder(exit_border=True).
+        """
         height = len(layout)
         width = len(layout[0]) if height > 0 else 0
         
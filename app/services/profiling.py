@@ -0,0 +1,87 @@
+"""
+On-demand profiling of a single validation request.
+
+Enabled only when VALIDATOR_PROFILING=1 is set on the deployment *and* the
+request asks for it ("profile": true), so production payloads can be
+diagnosed in place without exposing the cost to every caller. cProfile,
+pstats and tracemalloc are imported on first use, keeping them out of the
+cold start.
+"""
+import os
+import re
+import time
+from typing import Any, Callable, Dict, Tuple
+
+PROFILING_ENABLED = os.environ.get("VALIDATOR_PROFILING", "").lower() in ("1", "true", "yes")
+# Directory for raw .prof dumps (e.g. /tmp); unset returns the summary only
+PROFILE_DIR = os.environ.get("VALIDATOR_PROFILE_DIR")
+PROFILE_TOP_N = int(os.environ.get("VALIDATOR_PROFILE_TOP_N", "25"))
+
+
+def _function_name(key: Tuple[str, int, str]) -> str:
+    filename, line, name = key
+    if filename == "~":
+        return name  # built-in
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+def run_profiled(fn: Callable[[], Any], label: str = "level",
+                 top_n: int = PROFILE_TOP_N) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Call fn under cProfile and tracemalloc.
+    Returns fn's result and a summary with the top functions by cumulative
+    time, the peak traced memory, and the allocation sites that grew most
+    during the call. Memory freed before fn returns (e.g. the solver's
+    frontier) is reflected in peakKb only.
+    """
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    profiler.enable()
+    try:
+        result = fn()
+    finally:
+        profiler.disable()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top_n]
+    summary: Dict[str, Any] = {
+        "topFunctions": [
+            {
+                "function": _function_name(key),
+                "calls": calls,
+                "totalTimeMs": round(total * 1000, 3),
+                "cumulativeTimeMs": round(cumulative * 1000, 3)
+            }
+            for key, (_, calls, total, cumulative, _) in rows
+        ],
+        "memory": {
+            "peakKb": round(peak / 1024, 1),
+            "topSites": [
+                {
+                    "site": f"{os.path.basename(diff.traceback[0].filename)}:{diff.traceback[0].lineno}",
+                    "sizeKb": round(diff.size_diff / 1024, 1),
+                    "count": diff.count_diff
+                }
+                for diff in after.compare_to(before, "lineno")[:top_n]
+                if diff.size_diff > 0
+            ]
+        }
+    }
+
+    if PROFILE_DIR:
+        safe_label = re.sub(r"[^\w.-]", "_", label)
+        path = os.path.join(PROFILE_DIR, f"profile-{safe_label}-{int(time.time() * 1000)}.prof")
+        try:
+            stats.dump_stats(path)
+            summary["dumpPath"] = path
+        except OSError:
+            pass  # the summary is still returned
+    return result, summary
@@ -1,10 +1,20 @@
-from typing import List, Tuple, Dict, Any
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import List, Tuple, Dict, Any, Optional, Iterable, Iterator, Union
 from models.graph import RoadGraph, Position
 from models.game_state import GameState
 from models.vehicles import Vehicle
 from models.enums import CellType
 from services.level_loader import LevelLoader
-from core.solver import Solver
+from core.solver import Solver, SolverResult, STRATEGIES, select_strategy
+from core.layout_digest import encode_layout, layout_digest, blake2b
+from services.level_codec import BinaryLevel, is_binary_level, peek_layout
+from services.instrumentation import Instrumentation
 
 
 class LevelValidator:
@@ -140,76 +150,559 @@ class LevelValidator:
         return errors
     
 
-def validate_level(level_data: Dict[str, Any]) -> Dict[str, Any]:
+def level_fingerprint(level_data: Dict[str, Any]) -> Optional[Tuple[str, List[str]]]:
+    """
+    Canonical fingerprint of a level's grid, vehicles and obstacles.
+    Ids, levelId and metadata are ignored, and vehicles/obstacles are sorted by
+    their content, so levels differing only in naming or ordering collide.
+    Returns (digest, ids in canonical order), or None if the level cannot be
+    fingerprinted unambiguously (malformed, or two indistinguishable records).
+    Binary levels are fingerprinted from their records directly.
+    """
+    if is_binary_level(level_data):
+        try:
+            parts = BinaryLevel(level_data).fingerprint_parts()
+        except ValueError:
+            return None
+        if parts is None:
+            return None
+        canonical, ids = parts
+        return blake2b(canonical, digest_size=16).hexdigest(), ids
+    try:
+        grid = level_data["grid"]
+        records = []
+        for group in ("vehicles", "obstacles"):
+            entries = sorted(
+                (json.dumps({k: v for k, v in item.items() if k != "id"}, sort_keys=True), item["id"])
+                for item in level_data.get(group, [])
+            )
+            contents = [content for content, _ in entries]
+            if len(set(contents)) != len(contents):
+                return None
+            records.append(entries)
+        canonical = json.dumps(
+            [grid["dimensions"], grid["layout"]] + [[c for c, _ in entries] for entries in records],
+            sort_keys=True
+        )
+    except (KeyError, TypeError, AttributeError, ValueError):
+        return None
+    ids = [item_id for entries in records for _, item_id in entries]
+    return blake2b(canonical.encode(), digest_size=16).hexdigest(), ids
+
+
+# Response fields holding a vehicle or obstacle id, or a list of them
+ID_FIELDS = ("solution", "partialSolution", "blocked", "blockedBy")
+# Prose fields, which may name ids among other words
+TEXT_FIELDS = ("reason", "message")
+# blockedBy values that are not ids
+BLOCKER_KINDS = ("INVALID_POSITION", "NO_PATH", "INVALID_PATH")
+
+
+def _remap_ids(value, mapping: Dict[str, str], pattern: Optional["re.Pattern"], field: Optional[str] = None):
+    """
+    Copy a response, renaming vehicle/obstacle ids: ID_FIELDS by exact match,
+    and whole-word occurrences in TEXT_FIELDS. Other strings are left alone.
+    """
+    if isinstance(value, dict):
+        return {k: _remap_ids(v, mapping, pattern, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_remap_ids(v, mapping, pattern, field) for v in value]
+    if isinstance(value, str) and mapping:
+        if field in ID_FIELDS:
+            return mapping.get(value, value)
+        if field in TEXT_FIELDS:
+            return pattern.sub(lambda m: mapping[m.group(0)], value)
+    return value
+
+
+def _id_pattern(ids: Iterable[str]) -> "re.Pattern":
+    # Longest ids first so that e.g. C1 never matches inside C10
+    alternatives = "|".join(re.escape(i) for i in sorted(ids, key=len, reverse=True))
+    return re.compile(rf"(?<![\w])(?:{alternatives})(?![\w])")
+
+
+def _ambiguous_ids(response: Dict[str, Any], ids: List[str]) -> bool:
+    """
+    Whether a response uses one of `ids` where it cannot be told from other
+    text, so that it cannot be remapped to new ids: an id that is a plain
+    word or number (not letters and digits mixed, e.g. "exits" or "2") found
+    in a TEXT_FIELDS string, or an id that is also one of BLOCKER_KINDS.
+    """
+    words = [i for i in ids if not (re.search(r"[^\W\d_]", i) and re.search(r"\d", i))]
+    if not words:
+        return False
+    pattern = _id_pattern(words)
+
+    def ambiguous(value, field: Optional[str]) -> bool:
+        if isinstance(value, dict):
+            return any(ambiguous(v, k) for k, v in value.items())
+        if isinstance(value, list):
+            return any(ambiguous(v, field) for v in value)
+        if not isinstance(value, str):
+            return False
+        if field == "blockedBy":
+            return value in BLOCKER_KINDS and value in words
+        return field in TEXT_FIELDS and pattern.search(value) is not None
+
+    return ambiguous(response, None)
+
+
+class _InFlight:
+    """
+    Result slot for a computation other threads wait on. A minimal
+    concurrent.futures.Future, which would pull logging into every cold start.
+    """
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._result = None
+        self._exception: Optional[BaseException] = None
+
+    def set_result(self, result):
+        self._result = result
+        self._done.set()
+
+    def set_exception(self, exception: BaseException):
+        self._exception = exception
+        self._done.set()
+
+    def exception(self) -> Optional[BaseException]:
+        return self._exception
+
+    def result(self):
+        self._done.wait()
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+
+class ResultCache:
+    """
+    Bounded LRU of validation responses keyed by level_fingerprint.
+    Concurrent requests for the same fingerprint are coalesced: the first one
+    computes, the others wait for its result.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self.cache: "OrderedDict[str, Tuple[Dict[str, Any], List[str]]]" = OrderedDict()
+        self.in_flight: Dict[str, _InFlight] = {}
+        self.lock = threading.Lock()
+
+    def get(self, fingerprint: str, ids: List[str]) -> Optional[Dict[str, Any]]:
+        """The cached response for `ids`, or None; never waits for one being computed"""
+        with self.lock:
+            entry = self.cache.get(fingerprint)
+            if entry is None:
+                return None
+            self.cache.move_to_end(fingerprint)
+        response, stored_ids = entry
+        return self._for_ids(response, stored_ids, ids)
+
+    def get_or_compute(self, fingerprint: str, ids: List[str], compute) -> Dict[str, Any]:
+        with self.lock:
+            entry = self.cache.get(fingerprint)
+            if entry is not None:
+                self.cache.move_to_end(fingerprint)
+            else:
+                future = self.in_flight.get(fingerprint)
+                owner = future is None
+                if owner:
+                    future = self.in_flight[fingerprint] = _InFlight()
+
+        if entry is None and not owner:
+            entry = future.result()
+            if entry is None:
+                return compute()
+        if entry is not None:
+            response, stored_ids = entry
+            return self._for_ids(response, stored_ids, ids)
+
+        # False if the response names ids ambiguously: waiters then compute their own
+        remappable = False
+        try:
+            response = compute()
+            remappable = not _ambiguous_ids(response, ids)
+            entry = (_remap_ids(response, {}, None), ids)
+            future.set_result(entry if remappable else None)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[fingerprint]
+                if future.exception() is None and remappable and self._is_cacheable(response):
+                    self.cache[fingerprint] = entry
+                    while len(self.cache) > self.max_size:
+                        self.cache.popitem(last=False)
+        return response
+
+    def _is_cacheable(self, response: Dict[str, Any]) -> bool:
+        # Server errors may be transient; everything else is a pure function of the level
+        return response.get("error", {}).get("code") != "SERVER_ERROR"
+
+    def _for_ids(self, response: Dict[str, Any], stored_ids: List[str], ids: List[str]) -> Dict[str, Any]:
+        mapping = {old: new for old, new in zip(stored_ids, ids) if old != new}
+        if not mapping:
+            return _remap_ids(response, {}, None)
+        return _remap_ids(response, mapping, _id_pattern(mapping))
+
+
+# Shared across requests in the process; RESULT_CACHE_SIZE=0 disables it
+result_cache = ResultCache(max_size=int(os.environ.get("RESULT_CACHE_SIZE", "256")))
+
+
+def validate_level(level_data: Union[Dict[str, Any], bytes],
+                   instrumentation: Optional[Instrumentation] = None,
+                   engine: Optional[str] = None) -> Dict[str, Any]:
     """
     Validate a traffic puzzle level for solvability.
+    Responses are memoized by level_fingerprint, so resubmissions that differ
+    only in levelId, metadata, ids or ordering are answered from the cache.
     
     Args:
-        level_data: Level configuration in JSON format
+        level_data: Level configuration in JSON format, or in the binary
+            format of services.level_codec
+        instrumentation: Records phase timings and solver counters into the
+            response's "instrumentation" field; defaults to
+            Instrumentation.for_request(), i.e. off unless VALIDATOR_INSTRUMENTATION is set
+        engine: Solver strategy to force (see core.solver.STRATEGIES); by
+            default select_strategy picks the cheapest exact one for the level
         
     Returns:
         Dictionary with validation results
     """
+    if engine is not None and engine not in STRATEGIES:
+        return {
+            "error": {
+                "code": "INVALID_REQUEST",
+                "message": f"Unknown engine {engine!r}; expected one of {', '.join(STRATEGIES)}"
+            }
+        }
+    if instrumentation is None:
+        instrumentation = Instrumentation.for_request()
+    fingerprint = level_fingerprint(level_data) if result_cache.max_size > 0 else None
+    if fingerprint is None:
+        instrumentation.set("resultCache", "bypass")
+        response = _validate_level(level_data, instrumentation, engine)
+    else:
+        digest, ids = fingerprint
+        if engine is not None:
+            # The automatic choice depends only on the level; a forced one does not
+            digest = f"{digest}:{engine}"
+        instrumentation.set("resultCache", "hit")
+
+        def compute():
+            instrumentation.set("resultCache", "miss")
+            return _validate_level(level_data, instrumentation, engine)
+
+        response = result_cache.get_or_compute(digest, ids, compute)
+    if instrumentation.enabled:
+        # Added after the result cache, so stored responses never carry timings
+        response["instrumentation"] = instrumentation.to_dict()
+    return response
+
+
+def profile_level(level_data: Union[Dict[str, Any], bytes],
+                  instrumentation: Optional[Instrumentation] = None,
+                  engine: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Validate a level under cProfile and tracemalloc (see services.profiling),
+    adding a "profile" field to the response. The result cache is bypassed so
+    the profile always covers a real solve.
+    """
+    from services.profiling import run_profiled
+
+    if instrumentation is None:
+        instrumentation = Instrumentation.for_request()
+    label = level_data.get("levelId") if isinstance(level_data, dict) else None
+    response, profile = run_profiled(lambda: _validate_level(level_data, instrumentation, engine),
+                                     label=str(label or "level"))
+    response["profile"] = profile
+    if instrumentation.enabled:
+        response["instrumentation"] = instrumentation.to_dict()
+    return response
+
+
+def _validate_level(level_data: Dict[str, Any], instrumentation: Instrumentation,
+                    engine: Optional[str] = None) -> Dict[str, Any]:
+    """Uncached validation: load, check initial state and solve"""
     try:
-        # Load level and build graph
-        loader = LevelLoader()
-        graph, initial_state = loader.load_level(level_data)
+        graph, initial_state, error = _load_checked(level_data, instrumentation)
+        if error is not None:
+            return error
         
-        # Validate initial state
-        validator = LevelValidator()
+        # Attempt to solve
+        solver = Solver(graph, engine or select_strategy(initial_state))
+        with instrumentation.phase("solve"):
+            result = solver.solve(initial_state)
+        instrumentation.update(result.stats)
+        return _solver_response(result, solver.strategy)
+    except Exception as e:
+        return _error_response(e)
+
+
+def _load_checked(level_data: Dict[str, Any], instrumentation: Instrumentation
+                  ) -> Tuple[RoadGraph, GameState, Optional[Dict[str, Any]]]:
+    """Load a level and check its initial state: (graph, state, error response or None)"""
+    # Load level and build graph
+    loader = LevelLoader(instrumentation)
+    graph, initial_state = loader.load_level(level_data)
+    
+    # Validate initial state
+    validator = LevelValidator()
+    with instrumentation.phase("validateInitialState"):
         is_valid, errors = validator.validate_initial_state(graph, initial_state)
-        
-        if not is_valid:
-            return {
-                "error": {
-                    "code": "INVALID_LEVEL_DATA",
-                    "message": "Level data failed validation",
-                    "details": [{"message": error} for error in errors]
-                }
+    
+    if not is_valid:
+        return graph, initial_state, {
+            "error": {
+                "code": "INVALID_LEVEL_DATA",
+                "message": "Level data failed validation",
+                "details": [{"message": error} for error in errors]
             }
+        }
+    return graph, initial_state, None
+
+
+def _solver_response(result: SolverResult, engine: str) -> Dict[str, Any]:
+    """Response for a SolverResult"""
+    if result.solvable:
+        response = {
+            "solvable": True,
+            "solution": result.solution,
+            "totalMoves": result.total_moves,
+            "engine": engine
+        }
+        if result.exit_ticks is not None:
+            response["exitTicks"] = result.exit_ticks
+        return response
+    else:
+        # Format blocking details for response
+        response = {
+            "solvable": False,
+            "partialSolution": result.solution,
+            "movesUntilBlock": len(result.solution),
+            "reason": result.reason,
+            "engine": engine
+        }
         
-        # Attempt to solve
-        solver = Solver(graph)
-        result = solver.solve(initial_state)
-        
-        if result.solvable:
-            return {
-                "solvable": True,
-                "solution": result.solution,
-                "totalMoves": result.total_moves
-            }
-        else:
-            # Format blocking details for response
-            response = {
-                "solvable": False,
-                "partialSolution": result.solution,
-                "movesUntilBlock": len(result.solution),
-                "reason": result.reason
-            }
-            
-            if result.blocking_details:
-                response["blockingDetails"] = result.blocking_details
-            
-            return response
-            
-    except KeyError as e:
+        if result.blocking_details:
+            response["blockingDetails"] = result.blocking_details
+        
+        return response
+
+
+def _error_response(e: Exception) -> Dict[str, Any]:
+    """Response for an exception raised while validating a level"""
+    if isinstance(e, KeyError):
         return {
             "error": {
                 "code": "INVALID_REQUEST",
                 "message": f"Missing required field: {str(e)}"
             }
         }
-    except ValueError as e:
+    if isinstance(e, ValueError):
         return {
             "error": {
                 "code": "VALIDATION_ERROR",
                 "message": str(e)
             }
         }
-    except Exception as e:
-        return {
-            "error": {
-                "code": "SERVER_ERROR",
-                "message": f"An unexpected error occurred: {str(e)}"
-            }
+    return {
+        "error": {
+            "code": "SERVER_ERROR",
+            "message": f"An unexpected error occurred: {str(e)}"
         }
+    }
+
+
+def validate_lockstep(levels: List[Union[Dict[str, Any], bytes]],
+                      timings: Optional[List[float]] = None) -> List[Dict[str, Any]]:
+    """
+    validate_level for many levels at once, with the same responses.
+    
+    Levels without traffic lights or pedestrians, for which validate_level
+    picks the greedy engine, are grouped by compiled graph (the GraphCache
+    hands levels sharing a layout the same RoadGraph) and each group is
+    solved by one core.lockstep.LockstepGreedy pass. Other levels are solved
+    one by one. Responses go through the result cache as in validate_level;
+    the "solve" phase of a level solved in lockstep is its share of the group's.
+    
+    If `timings` is given, it receives each level's time in ms: everything
+    done for that level alone (fingerprint, cache, load, checks and a
+    single-level solve) plus, in lockstep, its share of the group solve.
+    """
+    from core.lockstep import LockstepGreedy
+
+    responses: List[Optional[Dict[str, Any]]] = [None] * len(levels)
+    elapsed = [0.0] * len(levels)
+    instrumentations = [Instrumentation.for_request() for _ in levels]
+    fingerprints: List[Optional[Tuple[str, List[str]]]] = [None] * len(levels)
+    groups: Dict[int, Tuple[RoadGraph, List[Tuple[int, GameState]]]] = {}
+
+    def prepare(index: int, level_data: Union[Dict[str, Any], bytes]):
+        """Answer a level from the cache or on its own, or add it to its graph's group"""
+        instrumentation = instrumentations[index]
+        fingerprint = level_fingerprint(level_data) if result_cache.max_size > 0 else None
+        if fingerprint is not None:
+            cached = result_cache.get(*fingerprint)
+            if cached is not None:
+                instrumentation.set("resultCache", "hit")
+                responses[index] = cached
+                return
+        fingerprints[index] = fingerprint
+        instrumentation.set("resultCache", "bypass" if fingerprint is None else "miss")
+        try:
+            graph, initial_state, error = _load_checked(level_data, instrumentation)
+            if error is not None:
+                responses[index] = error
+                return
+            strategy = select_strategy(initial_state)
+            if strategy == "greedy":
+                groups.setdefault(id(graph), (graph, []))[1].append((index, initial_state))
+                return
+            solver = Solver(graph, strategy)
+            with instrumentation.phase("solve"):
+                result = solver.solve(initial_state)
+            instrumentation.update(result.stats)
+            responses[index] = _solver_response(result, solver.strategy)
+        except Exception as e:
+            responses[index] = _error_response(e)
+
+    for index, level_data in enumerate(levels):
+        start_time = time.perf_counter()
+        prepare(index, level_data)
+        elapsed[index] += (time.perf_counter() - start_time) * 1000
+
+    for graph, members in groups.values():
+        start_time = time.perf_counter()
+        try:
+            results = LockstepGreedy(graph).solve([state for _, state in members])
+        except Exception as e:
+            results = [e] * len(members)
+        share = (time.perf_counter() - start_time) * 1000 / len(members)
+        for (index, _), result in zip(members, results):
+            elapsed[index] += share
+            if isinstance(result, Exception):
+                responses[index] = _error_response(result)
+                continue
+            instrumentations[index].record("solve", share)
+            instrumentations[index].update(result.stats)
+            responses[index] = _solver_response(result, "greedy")
+
+    for index, response in enumerate(responses):
+        start_time = time.perf_counter()
+        fingerprint = fingerprints[index]
+        if fingerprint is not None:
+            digest, ids = fingerprint
+            response = responses[index] = result_cache.get_or_compute(digest, ids, lambda: response)
+        instrumentation = instrumentations[index]
+        if instrumentation.enabled:
+            response["instrumentation"] = instrumentation.to_dict()
+        elapsed[index] += (time.perf_counter() - start_time) * 1000
+    if timings is not None:
+        timings[:] = elapsed
+    return responses
+
+
+def _layout_group(level_data: Dict[str, Any]) -> Optional[str]:
+    """Raw layout digest used to route levels sharing a layout to the same worker"""
+    if is_binary_level(level_data):
+        encoded = peek_layout(level_data)
+        return layout_digest(encoded) if encoded is not None else None
+    try:
+        grid = level_data["grid"]
+        return layout_digest(encode_layout(grid["layout"], grid["dimensions"]["width"],
+                                           grid["dimensions"]["height"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _validate_chunk(chunk: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Worker entry point: validate a chunk of (index, level) pairs sharing a
+    layout in lockstep, with each level's own executionTimeMs
+    """
+    timings: List[float] = []
+    responses = validate_lockstep([level_data for _, level_data in chunk], timings)
+    results = []
+    for (index, _), result, elapsed_ms in zip(chunk, responses, timings):
+        result['executionTimeMs'] = round(elapsed_ms, 3)
+        results.append((index, result))
+    return results
+
+
+def validate_levels(levels: Iterable[Dict[str, Any]], workers: Optional[int] = None,
+                    chunksize: int = 16, ordered: bool = False,
+                    window: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Validate many levels across a process pool.
+    
+    Levels are read lazily, at most `window` at a time. Each read is grouped by
+    layout digest and dispatched in chunks of up to `chunksize` levels sharing a
+    layout, so a worker compiles each layout once and serves the rest of the
+    chunk from its own GraphCache.
+    
+    Args:
+        levels: Level configurations in JSON format (any iterable, read lazily)
+        workers: Worker processes; defaults to os.cpu_count(). 1 validates inline.
+        chunksize: Maximum levels per task
+        ordered: Yield results in input order instead of completion order
+        window: Maximum levels read but not yet yielded; defaults to 4 chunks per worker
+        
+    Yields:
+        (index, result) pairs, where index is the level's position in `levels`
+        and result is the validate_level response plus executionTimeMs
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for index, level_data in enumerate(levels):
+            yield from _validate_chunk([(index, level_data)])
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+    window = window or workers * chunksize * 4
+    source = enumerate(levels)
+    exhausted = False
+    outstanding = 0      # levels read but not yet yielded
+    pending = set()
+    buffered: Dict[int, Dict[str, Any]] = {}
+    next_index = 0
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            # Refill in half-window batches so grouping sees enough levels per layout
+            if not exhausted and outstanding <= window // 2:
+                batch = list(islice(source, window - outstanding))
+                exhausted = len(batch) < window - outstanding
+                outstanding += len(batch)
+                groups: Dict[Optional[str], List[Tuple[int, Dict[str, Any]]]] = {}
+                for index, level_data in batch:
+                    if isinstance(level_data, memoryview):
+                        # e.g. LevelPack entries: views into an mmap cannot be pickled
+                        level_data = level_data.tobytes()
+                    groups.setdefault(_layout_group(level_data), []).append((index, level_data))
+                for group in groups.values():
+                    for start in range(0, len(group), chunksize):
+                        pending.add(executor.submit(_validate_chunk, group[start:start + chunksize]))
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for index, result in future.result():
+                    if not ordered:
+                        outstanding -= 1
+                        yield index, result
+                        continue
+                    buffered[index] = result
+                    while next_index in buffered:
+                        outstanding -= 1
+                        yield next_index, buffered.pop(next_index)
+                        next_index += 1
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,51 @@
+"""
+Count every reachable state of each level, for difficulty research.
+
+    python -m app.tools.reachability levels/ --work-dir /scratch [--batch-size N]
+
+Takes the same inputs as bake_cache. Prints one JSON line per level: the
+number of distinct reachable states, new states per number of transitions,
+dead ends, the fewest transitions to a solution and the bytes spilled to
+disk. The search runs in core.external_search, so memory is bounded by
+--batch-size and --fan-in rather than by the number of states; put
+--work-dir on a disk with room for a few copies of the visited set.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+app_dir = Path(__file__).resolve().parent.parent
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from core.external_search import ReachabilityExplorer  # noqa: E402
+from services.level_loader import LevelLoader  # noqa: E402
+from tools.bake_cache import iter_levels  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Count the reachable states of levels with a disk-backed search")
+    parser.add_argument("paths", nargs="+", help="level files or directories")
+    parser.add_argument("--work-dir", help="directory for the search files (default: system temp)")
+    parser.add_argument("--batch-size", type=int, default=1 << 20, help="successor keys sorted in memory per run")
+    parser.add_argument("--fan-in", type=int, default=64, help="runs merged per pass")
+    args = parser.parse_args(argv)
+
+    loader = LevelLoader()
+    for level_data in iter_levels(args.paths):
+        level_id = level_data.get("levelId")
+        start = time.perf_counter()
+        try:
+            graph, state = loader.load_level(level_data)
+            explorer = ReachabilityExplorer(graph, args.work_dir, args.batch_size, args.fan_in)
+            result = explorer.explore(state).to_dict()
+        except (KeyError, TypeError, ValueError) as e:
+            result = {"error": str(e)}
+        result["elapsedS"] = round(time.perf_counter() - start, 3)
+        print(json.dumps({"levelId": level_id, **result}), flush=True)
+
+
+if __name__ == "__main__":
+    main()
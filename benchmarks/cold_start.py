@@ -0,0 +1,83 @@
+"""
+Cold-start latency with and without a baked graph snapshot.
+
+Each sample is a fresh interpreter that imports the Lambda entry point and
+validates one level, which is what a new Lambda container pays on its first
+request. Reports p50/p99 of (import + first request) per mode.
+
+    python benchmarks/cold_start.py [levels...] [--runs 30]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+app_dir = project_root / "app"
+
+# Runs inside the child interpreter; prints milliseconds for import + first level
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {app_dir!r})
+from lambda_function import lambda_handler
+level = json.load(open({level!r}))
+response = lambda_handler(level, None)
+assert response["statusCode"] == 200, response
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(level_path: str, runs: int, env: dict) -> list:
+    code = CHILD.format(app_dir=str(app_dir), level=level_path)
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                                capture_output=True, text=True).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("levels", nargs="*", default=[str(project_root / "docs" / "example.json")])
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(project_root))
+    from app.tools.bake_cache import bake
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = os.path.join(tmp, "graph_snapshot.bin")
+        bake(args.levels, snapshot)
+
+        base_env = {k: v for k, v in os.environ.items()
+                    if k not in ("GRAPH_SNAPSHOT", "GRAPH_SNAPSHOT_PRELOAD", "GRAPH_CACHE_DIR")}
+        modes = {
+            "no snapshot": dict(base_env, GRAPH_SNAPSHOT=""),
+            "snapshot (lazy)": dict(base_env, GRAPH_SNAPSHOT=snapshot, GRAPH_SNAPSHOT_PRELOAD="lazy"),
+            "snapshot (eager)": dict(base_env, GRAPH_SNAPSHOT=snapshot, GRAPH_SNAPSHOT_PRELOAD="eager"),
+        }
+
+        level = args.levels[0]
+        results = {}
+        print(f"{'mode':<18} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+        for name, env in modes.items():
+            samples = measure(level, args.runs, env)
+            results[name] = samples
+            print(f"{name:<18} {percentile(samples, 50):8.1f} {percentile(samples, 99):8.1f} "
+                  f"{statistics.mean(samples):8.1f}")
+        return results
+
+
+if __name__ == "__main__":
+    main()
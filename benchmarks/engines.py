@@ -0,0 +1,112 @@
+"""
+Solver engine comparison on synthetic levels (see benchmarks/generator.py).
+
+For every case of a run.py profile, plus cases with traffic lights, each
+engine solves the same level in a fresh process: the graph is compiled
+first and only Solver.solve is timed (median of --repeat runs). Reported
+per engine: solve time, states explored and generated, peak frontier,
+and the ticks the solution takes (exits plus waits), which astar minimizes.
+greedy only applies to levels without traffic lights, so it is skipped on
+the timed cases.
+
+    python benchmarks/engines.py --profile quick --out engines.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+benchmarks_dir = Path(__file__).resolve().parent
+app_dir = benchmarks_dir.parent / "app"
+sys.path.insert(0, str(benchmarks_dir))
+
+from run import PROFILES, _case, run_in_child  # noqa: E402
+
+# name -> (strategy, heuristic)
+ENGINES = {
+    "bfs": ("bfs", "remaining"),
+    "astar": ("astar", "remaining"),
+    "astar-chain": ("astar", "chain"),
+    "greedy": ("greedy", "remaining"),
+    "iddfs": ("iddfs", "remaining"),
+    "parallel": ("parallel", "remaining"),  # one worker per CPU, see solve_case
+}
+
+TIMED_CASES = [
+    _case("grid25_v8_lights6", 25, 8, seed=2, lights=6),
+    _case("grid30_v10_lights12", 30, 10, seed=6, lights=12, light_period=5),
+    _case("grid40_v12_lights20", 40, 12, seed=7, lights=20, light_period=4),
+]
+
+
+def solve_case(params: Dict[str, Any], engine: str, repeat: int, queue):
+    """Child process entry point: compile the level once, then time Solver.solve"""
+    import os
+    os.environ["GRAPH_SNAPSHOT"] = ""
+    os.environ.pop("GRAPH_CACHE_DIR", None)
+    sys.path.insert(0, str(app_dir))
+
+    from generator import generate_level
+    from core.solver import Solver
+    from services.level_loader import LevelLoader
+
+    graph, state = LevelLoader().load_level(generate_level(**params))
+    strategy, heuristic = ENGINES[engine]
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = Solver(graph, strategy, heuristic, workers=os.cpu_count()).solve(state)
+        times.append((time.perf_counter() - start) * 1000)
+    ticks = result.exit_ticks[-1] + 1 if result.exit_ticks else result.total_moves
+    queue.put({
+        "status": "ok",
+        "solvable": result.solvable,
+        "solveMs": round(statistics.median(times), 3),
+        "ticks": ticks if result.solvable else None,
+        **result.stats,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--engines", nargs="*", choices=sorted(ENGINES), default=list(ENGINES))
+    parser.add_argument("--repeat", type=int, default=3, help="solves per engine (median reported)")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds per case and engine")
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    report: Dict[str, Dict[str, Any]] = {}
+    for case in PROFILES[args.profile] + TIMED_CASES:
+        results = report[case["name"]] = {}
+        for engine in args.engines:
+            if engine == "greedy" and case["params"].get("lights"):
+                continue
+            result = results[engine] = run_in_child(solve_case, (case["params"], engine, args.repeat), args.timeout)
+            if result["status"] != "ok":
+                print(f"{case['name']:<28} {engine:<12} {result['status']}", flush=True)
+                continue
+            print(f"{case['name']:<28} {engine:<12} solve {result['solveMs']:10.2f}ms  "
+                  f"explored {result['statesExplored']:>8}  generated {result['statesGenerated']:>8}  "
+                  f"frontier {result['peakFrontier']:>7}  ticks {str(result['ticks']):>5}  "
+                  f"solvable={result['solvable']}", flush=True)
+        _check_agreement(case["name"], results)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.out}")
+
+
+def _check_agreement(name: str, results: Dict[str, Dict[str, Any]]):
+    """Every engine is exact, so a disagreement on solvability is a bug"""
+    verdicts: List[bool] = [r["solvable"] for r in results.values() if r["status"] == "ok"]
+    if len(set(verdicts)) > 1:
+        print(f"WARNING: {name}: engines disagree on solvability", flush=True)
+
+
+if __name__ == "__main__":
+    main()
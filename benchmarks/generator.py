@@ -0,0 +1,247 @@
+"""
+Deterministic synthetic level generator.
+
+Levels are a lattice of road bands: `lanes` adjacent rows (or columns) of
+'-' (or '|') every `spacing` cells, with '+' where bands cross. Vehicles are
+placed one at a time, and a vehicle is only accepted if its exit path is
+clear of every vehicle placed before it (and of boulders, unless it is a
+bulldozer). Exiting in reverse placement order is therefore always a
+solution, so solvable levels are solvable by construction.
+
+Unsolvable variants add one boulder on the exit path of a non-bulldozer,
+on a cell no bulldozer path crosses: since vehicles only move by exiting,
+that vehicle can never leave.
+
+Traffic lights (`lights`) go on free road cells. They all share one period
+and are all green at its start, so waiting for that tick before each exit
+keeps solvable levels solvable.
+
+    python benchmarks/generator.py --width 50 --height 50 --vehicles 20 --seed 1 > level.json
+"""
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+app_dir = Path(__file__).resolve().parent.parent / "app"
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from models.enums import CellType, Orientation, MovementRule  # noqa: E402
+from models.graph import Position, RoadGraph  # noqa: E402
+from models.game_state import GameState  # noqa: E402
+from models.obstacles import Boulder  # noqa: E402
+from models.vehicles import Vehicle, VehicleType  # noqa: E402
+from services.level_loader import LevelLoader  # noqa: E402
+
+RULE_MIXES: Dict[str, Dict[MovementRule, float]] = {
+    "straight": {MovementRule.STRAIGHT: 1.0},
+    "turns": {MovementRule.STRAIGHT: 0.4, MovementRule.LEFT: 0.3, MovementRule.RIGHT: 0.3},
+    "mixed": {MovementRule.STRAIGHT: 0.4, MovementRule.LEFT: 0.2, MovementRule.RIGHT: 0.2,
+              MovementRule.LEFT_U_TURN: 0.1, MovementRule.RIGHT_U_TURN: 0.1},
+}
+
+VEHICLE_LENGTHS = {VehicleType.CAR: 2, VehicleType.TRUCK: 3, VehicleType.BULLDOZER: 2}
+
+# Offset from the head to the next body cell, per orientation
+_TAIL_STEP = {
+    Orientation.NORTH: (0, 1),
+    Orientation.SOUTH: (0, -1),
+    Orientation.EAST: (-1, 0),
+    Orientation.WEST: (1, 0),
+}
+_CELL_ORIENTATIONS = {
+    CellType.HORIZONTAL_ROAD: (Orientation.EAST, Orientation.WEST),
+    CellType.VERTICAL_ROAD: (Orientation.NORTH, Orientation.SOUTH),
+    CellType.INTERSECTION: tuple(Orientation),
+}
+
+
+def generate_layout(width: int, height: int, lanes: int = 1, spacing: int = 6) -> List[List[str]]:
+    """Grid of road bands `lanes` wide every `spacing` cells, crossing at '+'"""
+    def in_band(i: int) -> bool:
+        return (i - 1) % spacing < lanes
+
+    layout = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            horizontal, vertical = in_band(y), in_band(x)
+            if horizontal and vertical:
+                row.append(CellType.INTERSECTION.value)
+            elif horizontal:
+                row.append(CellType.HORIZONTAL_ROAD.value)
+            elif vertical:
+                row.append(CellType.VERTICAL_ROAD.value)
+            else:
+                row.append(CellType.NON_PASSABLE.value)
+        layout.append(row)
+    return layout
+
+
+def _body(graph: RoadGraph, head: Position, orientation: Orientation, length: int) -> Optional[List[Position]]:
+    """Cells of a vehicle if every one is a road cell compatible with its orientation"""
+    dx, dy = _TAIL_STEP[orientation]
+    cells = []
+    for i in range(length):
+        position = Position(head.x + dx * i, head.y + dy * i)
+        node = graph.get_node(position.x, position.y)
+        if node is None or orientation not in _CELL_ORIENTATIONS.get(node.cell_type, ()):
+            return None
+        cells.append(position)
+    return cells
+
+
+def _exit_cells(graph: RoadGraph, vehicle: Vehicle) -> Optional[List[Position]]:
+    """Non-border cells of the vehicle's precomputed exit path, or None if it has none"""
+    node = graph.get_node(vehicle.position.x, vehicle.position.y)
+    path_info = graph.path_lookup.get(node.id, {}).get(vehicle.orientation, {}).get(vehicle.movement_rule)
+    if path_info is None or not path_info.valid:
+        return None
+    cells = []
+    for node_id in path_info.exit_path:
+        path_node = graph.nodes[node_id]
+        if not path_node.cell_type.is_exit:
+            cells.append(path_node.position)
+    return cells
+
+
+def generate_level(seed: int, width: int, height: int, vehicles: int, boulder_density: float = 0.0,
+                   lanes: int = 1, spacing: int = 6, rule_mix: str = "mixed",
+                   truck_ratio: float = 0.2, bulldozer_ratio: float = 0.1,
+                   solvable: bool = True, max_attempts: int = 200,
+                   lights: int = 0, light_period: int = 6) -> dict:
+    """
+    Generate a level in the JSON schema. The same arguments always give the
+    same level. Fewer vehicles than requested may be placed on crowded grids;
+    metadata records the request and the outcome.
+    """
+    rng = random.Random(seed)
+    layout = generate_layout(width, height, lanes, spacing)
+    grid = {"dimensions": {"width": width, "height": height}, "layout": layout}
+    graph = LevelLoader().load_graph(grid)  # internal coordinates are shifted by one
+
+    road_cells = [node.position for node in graph.nodes.values()
+                  if node.cell_type.is_road and not node.cell_type.is_exit]
+    road_cells.sort(key=lambda p: (p.y, p.x))
+
+    boulders = {position: Boulder(f"O{i + 1}", position)
+                for i, position in enumerate(rng.sample(road_cells, int(len(road_cells) * boulder_density)))}
+    state = GameState(active_vehicles={}, obstacles=boulders, exited_vehicles=[])
+
+    rules = list(RULE_MIXES[rule_mix])
+    weights = [RULE_MIXES[rule_mix][rule] for rule in rules]
+    placed: List[Vehicle] = []
+    occupied: Set[Position] = set()
+    exit_cells: Dict[str, List[Position]] = {}
+
+    for index in range(vehicles):
+        roll = rng.random()
+        if roll < bulldozer_ratio:
+            vehicle_type = VehicleType.BULLDOZER
+        elif roll < bulldozer_ratio + truck_ratio:
+            vehicle_type = VehicleType.TRUCK
+        else:
+            vehicle_type = VehicleType.CAR
+        prefix = {VehicleType.CAR: "C", VehicleType.TRUCK: "T", VehicleType.BULLDOZER: "B"}[vehicle_type]
+
+        for _ in range(max_attempts):
+            head = rng.choice(road_cells)
+            node = graph.get_node(head.x, head.y)
+            orientation = rng.choice(_CELL_ORIENTATIONS[node.cell_type])
+            body = _body(graph, head, orientation, VEHICLE_LENGTHS[vehicle_type])
+            if body is None or occupied.intersection(body) or boulders.keys() & set(body):
+                continue
+            vehicle = Vehicle(f"{prefix}{index + 1}", vehicle_type, VEHICLE_LENGTHS[vehicle_type], head,
+                              orientation, rng.choices(rules, weights)[0])
+            cells = _exit_cells(graph, vehicle)
+            if cells is None:
+                continue
+            # Clear of every earlier vehicle (and of boulders unless a bulldozer)
+            is_clear, _ = state.is_path_clear(
+                [graph.get_node(p.x, p.y).id for p in cells], vehicle, graph)
+            if not is_clear:
+                continue
+            placed.append(vehicle)
+            occupied.update(body)
+            exit_cells[vehicle.id] = cells
+            state = GameState(active_vehicles={v.id: v for v in placed}, obstacles=boulders,
+                              exited_vehicles=[])
+            break
+
+    obstacles = list(boulders.values())
+    if not solvable:
+        bulldozed = {p for v in placed if v.can_clear_obstacles() for p in exit_cells[v.id]}
+        candidates = [v for v in placed if not v.can_clear_obstacles()]
+        rng.shuffle(candidates)
+        for vehicle in candidates:
+            own = set(vehicle.get_occupied_cells())
+            cells = [p for p in exit_cells[vehicle.id]
+                     if p not in own and p not in occupied and p not in bulldozed and p not in boulders]
+            if cells:
+                obstacles.append(Boulder(f"O{len(obstacles) + 1}", rng.choice(cells)))
+                break
+        else:
+            raise ValueError("No vehicle can be blocked; use more vehicles or fewer bulldozers")
+
+    taken = occupied | {o.position for o in obstacles}
+    free_cells = [p for p in road_cells if p not in taken]
+    light_records = []
+    for i, position in enumerate(rng.sample(free_cells, min(lights, len(free_cells)))):
+        red = rng.randint(1, light_period - 1)
+        green = light_period - red
+        light_records.append({
+            "id": f"L{i + 1}", "type": "TRAFFIC_LIGHT", "position": {"x": position.x - 1, "y": position.y - 1},
+            "currentState": "GREEN",
+            "timing": {"redDuration": red, "greenDuration": green, "currentTimer": green}
+        })
+
+    return {
+        "levelId": f"synthetic_{width}x{height}_v{vehicles}_s{seed}",
+        "metadata": {
+            "generator": {
+                "seed": seed, "width": width, "height": height, "vehicles": vehicles,
+                "boulderDensity": boulder_density, "lanes": lanes, "spacing": spacing,
+                "ruleMix": rule_mix, "solvable": solvable, "lights": lights, "lightPeriod": light_period
+            },
+            "placedVehicles": len(placed)
+        },
+        "grid": grid,
+        "vehicles": [
+            {"id": v.id, "type": v.type.value, "length": v.length,
+             "position": {"x": v.position.x - 1, "y": v.position.y - 1},
+             "orientation": v.orientation.value, "movementRule": v.movement_rule.value}
+            for v in placed
+        ],
+        "obstacles": [
+            {"id": o.id, "type": o.type.value, "position": {"x": o.position.x - 1, "y": o.position.y - 1}}
+            for o in obstacles
+        ] + light_records
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=30)
+    parser.add_argument("--height", type=int, default=30)
+    parser.add_argument("--vehicles", type=int, default=10)
+    parser.add_argument("--boulder-density", type=float, default=0.0)
+    parser.add_argument("--lanes", type=int, default=1)
+    parser.add_argument("--spacing", type=int, default=6)
+    parser.add_argument("--rule-mix", choices=sorted(RULE_MIXES), default="mixed")
+    parser.add_argument("--unsolvable", action="store_true")
+    parser.add_argument("--lights", type=int, default=0)
+    parser.add_argument("--light-period", type=int, default=6)
+    args = parser.parse_args()
+    level = generate_level(args.seed, args.width, args.height, args.vehicles, args.boulder_density,
+                           args.lanes, args.spacing, args.rule_mix, solvable=not args.unsolvable,
+                           lights=args.lights, light_period=args.light_period)
+    json.dump(level, sys.stdout)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Cold-start import cost of the Lambda entry point, from `python -X importtime`.
+
+Each run is a fresh interpreter importing lambda_function (the bundled graph
+snapshot is disabled so only code is measured). Reports the median and p90
+cumulative import time and the modules with the largest self time, and
+fails if the median exceeds --budget-ms.
+
+    python benchmarks/import_time.py [--runs 20] [--budget-ms 60] [--module lambda_function]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+app_dir = Path(__file__).resolve().parent.parent / "app"
+
+
+def import_times(module: str) -> Tuple[float, Dict[str, float]]:
+    """(cumulative ms of `module`, self ms per imported module) for one cold import"""
+    env = dict(os.environ, GRAPH_SNAPSHOT="", PYTHONDONTWRITEBYTECODE="")
+    env.pop("GRAPH_CACHE_DIR", None)
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=app_dir, env=env, check=True, capture_output=True, text=True).stderr
+    total = 0.0
+    self_times: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        self_times[name.strip()] = int(self_us) / 1000
+        if name.strip() == module:
+            total = int(cumulative_us) / 1000
+    return total, self_times
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="lambda_function")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--top", type=int, default=15, help="modules to list by median self time")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if the median exceeds this")
+    args = parser.parse_args()
+
+    totals = []
+    per_module: Dict[str, List[float]] = defaultdict(list)
+    for _ in range(args.runs):
+        total, self_times = import_times(args.module)
+        totals.append(total)
+        for name, ms in self_times.items():
+            per_module[name].append(ms)
+
+    median = statistics.median(totals)
+    print(f"import {args.module}: median {median:.1f}ms, p90 {percentile(totals, 90):.1f}ms, "
+          f"min {min(totals):.1f}ms over {args.runs} runs; {len(per_module)} modules")
+    print(f"\n{'module':<40} {'self ms':>8}")
+    ranked = sorted(per_module.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, samples in ranked[:args.top]:
+        print(f"{name:<40} {statistics.median(samples):8.2f}")
+
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"\nOver budget: {median:.1f}ms > {args.budget_ms:.1f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Microbenchmark of layout cache keys across grid sizes.
+
+Compares the original key (joined string + md5, computed for get and again
+for put) with the current one (dimension-prefixed one-byte-per-cell encoding
++ blake2b, computed once per request), and shows the full warm-path cost of
+GraphCache.get_cache_key including the alias lookup.
+
+    python benchmarks/layout_digest.py [--sizes 10 50 100 200 300]
+"""
+import argparse
+import hashlib
+import random
+import sys
+import timeit
+from pathlib import Path
+
+app_dir = Path(__file__).resolve().parent.parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core.graph_cache import GraphCache  # noqa: E402
+from core.layout_digest import encode_layout, layout_digest  # noqa: E402
+
+
+def legacy_key(layout):
+    layout_str = ''.join([''.join(row) for row in layout])
+    return hashlib.md5(layout_str.encode()).hexdigest()
+
+
+def random_layout(size: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [[rng.choice("0-|+") for _ in range(size)] for _ in range(size)]
+
+
+def best_of(fn, number: int) -> float:
+    """Best per-call time in microseconds"""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 200, 300])
+    args = parser.parse_args()
+
+    print(f"{'grid':>9} {'legacy get+put':>15} {'encode':>9} {'blake2b':>9} {'get_cache_key':>14}")
+    for size in args.sizes:
+        layout = random_layout(size)
+        encoded = encode_layout(layout, size, size)
+        cache = GraphCache()
+        cache.get_cache_key(layout, size, size)  # populate the alias map: warm path
+        number = max(10, 200_000 // (size * size))
+
+        legacy = best_of(lambda: (legacy_key(layout), legacy_key(layout)), number)
+        encode = best_of(lambda: encode_layout(layout, size, size), number)
+        digest = best_of(lambda: layout_digest(encoded), number)
+        warm = best_of(lambda: cache.get_cache_key(layout, size, size), number)
+        print(f"{size:>4}x{size:<4} {legacy:>13.1f}us {encode:>7.1f}us {digest:>7.1f}us {warm:>12.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+HTTP load generator for app/local_server.py (or any endpoint with the same contract).
+
+Keeps `--concurrency` keep-alive connections busy for `--duration` seconds,
+cycling through the given levels, and reports sustained throughput, latency
+percentiles and status codes.
+
+    python -m app.local_server --workers 8 --warm docs/example.json &
+    python benchmarks/load.py docs/example.json --concurrency 32 --duration 30
+
+Start the server with RESULT_CACHE_SIZE=0 to measure solves rather than
+result-cache hits.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from itertools import cycle
+from pathlib import Path
+from typing import List, Tuple
+from urllib.parse import urlsplit
+
+app_dir = Path(__file__).resolve().parent.parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from tools.bake_cache import iter_levels  # noqa: E402
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(pct / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+async def _request(reader, writer, host: str, path: str, body: bytes) -> int:
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("server closed the connection")
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(url: str, bodies, deadline: float, samples: List[Tuple[float, int]]):
+    parts = urlsplit(url)
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = await _request(reader, writer, parts.netloc, parts.path or "/", next(bodies))
+            samples.append(((time.perf_counter() - start) * 1000, status))
+    finally:
+        writer.close()
+
+
+async def run_load(url: str, payloads: List[bytes], concurrency: int, duration: float) -> dict:
+    samples: List[Tuple[float, int]] = []
+    bodies = cycle(payloads)
+    start = time.perf_counter()
+    deadline = start + duration
+    results = await asyncio.gather(*(_client(url, bodies, deadline, samples) for _ in range(concurrency)),
+                                   return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for latency, _ in samples)
+    return {
+        "requests": len(samples),
+        "elapsedSeconds": round(elapsed, 3),
+        "throughput": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "latencyMs": {f"p{pct}": round(percentile(latencies, pct), 3) for pct in (50, 90, 99)} |
+                     {"max": round(latencies[-1], 3) if latencies else 0.0},
+        "statusCodes": dict(Counter(status for _, status in samples)),
+        "clientErrors": [repr(result) for result in results if isinstance(result, Exception)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("levels", nargs="+", help="level files/directories (.json / .ndjson)")
+    parser.add_argument("--url", default="http://127.0.0.1:8080/")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--out", help="write the report as JSON")
+    args = parser.parse_args()
+
+    payloads = [json.dumps(level).encode("utf-8") for level in iter_levels(args.levels)]
+    if not payloads:
+        parser.error("no levels found")
+    report = asyncio.run(run_load(args.url, payloads, args.concurrency, args.duration))
+
+    latency = report["latencyMs"]
+    print(f"{report['requests']} requests in {report['elapsedSeconds']:.1f}s: {report['throughput']:.1f} req/s "
+          f"with {args.concurrency} connections")
+    print(f"Latency ms: p50={latency['p50']:.2f} p90={latency['p90']:.2f} "
+          f"p99={latency['p99']:.2f} max={latency['max']:.2f}")
+    print(f"Status codes: {report['statusCodes']}")
+    for error in report["clientErrors"]:
+        print(f"Client error: {error}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
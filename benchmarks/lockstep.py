@@ -0,0 +1,93 @@
+"""
+Lockstep batch validation benchmark (services.validator.validate_lockstep).
+
+Generates a pack of levels sharing one layout, with different vehicles and
+boulders (half solvable). Reports milliseconds per level for the greedy
+solve alone (Solver per level against one LockstepGreedy pass) and for
+whole validation (validate_level per level against one validate_lockstep
+call), with the result cache off and the graph already compiled, and
+checks both validations give identical responses.
+
+    python benchmarks/lockstep.py --levels 500 --grid 30 --vehicles 12 --out lockstep.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+benchmarks_dir = Path(__file__).resolve().parent
+app_dir = benchmarks_dir.parent / "app"
+sys.path.insert(0, str(app_dir))
+sys.path.insert(0, str(benchmarks_dir))
+
+from generator import generate_level  # noqa: E402
+from core.lockstep import LockstepGreedy  # noqa: E402
+from core.movability import load_numpy  # noqa: E402
+from core.solver import Solver  # noqa: E402
+from services.level_loader import LevelLoader  # noqa: E402
+from services.validator import result_cache, validate_level, validate_lockstep  # noqa: E402
+
+
+def _best_ms(run, repeat: int, levels: int) -> float:
+    """Fastest of `repeat` runs, in milliseconds per level"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1000 / levels)
+    return min(times)
+
+
+def run_case(levels: int, grid: int, vehicles: int, repeat: int) -> Dict[str, Any]:
+    pack = [generate_level(seed=seed, width=grid, height=grid, vehicles=vehicles, lanes=2,
+                           boulder_density=0.05, bulldozer_ratio=0.2, solvable=seed % 2 == 0)
+            for seed in range(levels)]
+    result_cache.max_size = 0
+    loaded = [LevelLoader().load_level(level) for level in pack]
+    graph, states = loaded[0][0], [state for _, state in loaded]
+
+    expected = [validate_level(level) for level in pack]
+    if validate_lockstep(pack) != expected:
+        raise AssertionError("lockstep responses differ from validate_level")
+    return {
+        "levels": levels,
+        "grid": grid,
+        "vehicles": vehicles,
+        "numpy": load_numpy() is not None,
+        "solvable": sum(1 for response in expected if response.get("solvable")),
+        "solveMs": round(_best_ms(lambda: [Solver(graph, "greedy").solve(state) for state in states],
+                                  repeat, levels), 3),
+        "lockstepSolveMs": round(_best_ms(lambda: LockstepGreedy(graph).solve(states), repeat, levels), 3),
+        "validateMs": round(_best_ms(lambda: [validate_level(level) for level in pack], repeat, levels), 3),
+        "lockstepValidateMs": round(_best_ms(lambda: validate_lockstep(pack), repeat, levels), 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, default=500, help="levels in the pack")
+    parser.add_argument("--grid", type=int, default=30, help="grid width and height")
+    parser.add_argument("--vehicles", nargs="*", type=int, default=[12, 40])
+    parser.add_argument("--repeat", type=int, default=3, help="runs timed per measurement (fastest reported)")
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+    load_numpy()  # as in a worker that has already validated a chunk
+
+    report = []
+    for vehicles in args.vehicles:
+        result = run_case(args.levels, args.grid, vehicles, args.repeat)
+        report.append(result)
+        print(f"{result['levels']} levels of {vehicles:>3} vehicles, per level: "
+              f"solve {result['solveMs']:7.3f}ms -> {result['lockstepSolveMs']:7.3f}ms  "
+              f"validate {result['validateMs']:7.3f}ms -> {result['lockstepValidateMs']:7.3f}ms  "
+              f"(numpy={result['numpy']}, responses agree)", flush=True)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
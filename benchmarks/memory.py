@@ -0,0 +1,180 @@
+"""
+Memory benchmark: compiled graph size and peak solver memory.
+
+For every case of a run.py profile, in a fresh process:
+  graph   deep size of the compiled RoadGraph and of its path_lookup alone,
+          memory retained after compiling (tracemalloc), peak memory while
+          compiling, and the serialized size used by the disk cache/snapshot
+  solver  peak memory allocated during Solver.solve, with the peak visited
+          and frontier sizes, so bytes per search state can be derived
+
+--curves adds growth curves: graph memory over grid sizes (fixed density of
+roads), and solver peak over vehicle counts on a fixed grid. Use these to
+size GraphCache(max_size) (entries x bytes per graph) and Lambda memory.
+
+    python benchmarks/memory.py --profile quick --curves --out memory.json
+"""
+import argparse
+import gc
+import json
+import sys
+from enum import Enum
+from pathlib import Path
+from types import FunctionType, ModuleType
+from typing import Any, Dict, List
+
+benchmarks_dir = Path(__file__).resolve().parent
+app_dir = benchmarks_dir.parent / "app"
+sys.path.insert(0, str(benchmarks_dir))
+
+from run import PROFILES, run_in_child  # noqa: E402
+
+GRID_SIZES = [10, 25, 50, 75, 100, 150, 200]
+VEHICLE_COUNTS = [5, 10, 15, 20, 25, 30]
+
+
+def deep_sizeof(obj: Any) -> int:
+    """
+    Bytes reachable from obj (sys.getsizeof over the object graph, each
+    object counted once). Classes, modules, functions and enum members are
+    shared by every graph and are not counted.
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, (type, ModuleType, FunctionType, Enum)):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        if hasattr(current, "__dict__"):
+            stack.append(current.__dict__)
+        for slot in getattr(type(current), "__slots__", ()):
+            if hasattr(current, slot):
+                stack.append(getattr(current, slot))
+    return total
+
+
+def measure_case(params: Dict[str, Any], measure_solver: bool, queue):
+    """Child process entry point: compile and solve one generated level under tracemalloc"""
+    import os
+    import tracemalloc
+    os.environ["RESULT_CACHE_SIZE"] = "0"
+    os.environ["GRAPH_SNAPSHOT"] = ""
+    os.environ.pop("GRAPH_CACHE_DIR", None)
+    sys.path.insert(0, str(app_dir))
+
+    from generator import generate_level
+    from core.graph_cache import GraphCache
+    from core.graph_store import serialize_graph
+    from core.solver import Solver
+    from services.level_loader import LevelLoader
+
+    level = generate_level(**params)
+    LevelLoader.graph_cache = GraphCache()
+    gc.collect()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    loader = LevelLoader()
+    graph, state = loader.load_level(level)
+    gc.collect()
+    retained, compile_peak = tracemalloc.get_traced_memory()
+
+    canonical = getattr(graph, "base", graph)
+    result: Dict[str, Any] = {
+        "status": "ok",
+        "vehicles": len(state.active_vehicles),
+        "graph": {
+            "nodes": len(canonical.nodes),
+            "pathEntries": sum(len(by_rule) for by_orientation in canonical.path_lookup.values()
+                               for by_rule in by_orientation.values()),
+            "deepBytes": deep_sizeof(canonical),
+            "pathLookupDeepBytes": deep_sizeof(canonical.path_lookup),
+            "retainedBytes": retained - before,
+            "compilePeakBytes": compile_peak - before,
+            "serializedBytes": len(serialize_graph(canonical)),
+        },
+    }
+
+    if measure_solver:
+        gc.collect()
+        tracemalloc.reset_peak()
+        before_solve, _ = tracemalloc.get_traced_memory()
+        solved = Solver(graph).solve(state)
+        _, solve_peak = tracemalloc.get_traced_memory()
+        states = max(solved.stats["peakVisited"], 1)
+        result["solver"] = {
+            "solvable": solved.solvable,
+            "peakBytes": solve_peak - before_solve,
+            "bytesPerVisitedState": round((solve_peak - before_solve) / states),
+            **solved.stats,
+        }
+    tracemalloc.stop()
+    queue.put(result)
+
+
+def _mb(value: int) -> str:
+    return f"{value / 1024 / 1024:9.2f}"
+
+
+def print_row(name: str, result: Dict[str, Any]):
+    if result["status"] != "ok":
+        print(f"{name:<28} {result['status']}", flush=True)
+        return
+    graph = result["graph"]
+    line = (f"{name:<28} nodes {graph['nodes']:>7}  graph MB {_mb(graph['deepBytes'])} "
+            f"(paths {_mb(graph['pathLookupDeepBytes'])}, compile peak {_mb(graph['compilePeakBytes'])}, "
+            f"serialized {_mb(graph['serializedBytes'])})")
+    solver = result.get("solver")
+    if solver:
+        line += (f"  solve peak MB {_mb(solver['peakBytes'])}  visited {solver['peakVisited']:>7}  "
+                 f"{solver['bytesPerVisitedState']:>6} B/state")
+    print(line, flush=True)
+
+
+def run(named_params: List[tuple], measure_solver: bool, timeout: float) -> Dict[str, Any]:
+    results = {}
+    for name, params in named_params:
+        result = run_in_child(measure_case, (params, measure_solver), timeout)
+        result["params"] = params
+        results[name] = result
+        print_row(name, result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--curves", action="store_true", help="also sweep grid sizes and vehicle counts")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds per measurement")
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    report = {"cases": run([(case["name"], case["params"]) for case in PROFILES[args.profile]],
+                           measure_solver=True, timeout=args.timeout)}
+
+    if args.curves:
+        print("\nGraph memory by grid size")
+        report["gridCurve"] = run(
+            [(f"grid{size}", dict(seed=1, width=size, height=size, vehicles=1)) for size in GRID_SIZES],
+            measure_solver=False, timeout=args.timeout)
+        print("\nSolver peak by vehicle count (40x40 grid)")
+        report["vehicleCurve"] = run(
+            [(f"v{count}", dict(seed=1, width=40, height=40, vehicles=count)) for count in VEHICLE_COUNTS],
+            measure_solver=True, timeout=args.timeout)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Movability check benchmark: pure Python against NumPy (core.movability).
+
+For generated levels of 100+ vehicles, times Solver._scan on the initial
+state (median per call) and a whole Solver.solve with each check, and
+verifies both checks find the same movable vehicles along a run of exits.
+Needs NumPy installed; the solver itself does not.
+
+    python benchmarks/movability.py --vehicles 100 200 300 --out movability.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+benchmarks_dir = Path(__file__).resolve().parent
+app_dir = benchmarks_dir.parent / "app"
+sys.path.insert(0, str(app_dir))
+sys.path.insert(0, str(benchmarks_dir))
+
+from generator import generate_level  # noqa: E402
+from core.movability import load_numpy  # noqa: E402
+from core.solver import Solver  # noqa: E402
+from services.level_loader import LevelLoader  # noqa: E402
+
+
+def _scan_ms(solver: Solver, state, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solver._scan(state)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def _check_agreement(graph, state, pure: Solver, vectorized: Solver) -> int:
+    """Exit the first movable vehicle until none is left; returns the states compared"""
+    compared = 0
+    while True:
+        movable = [vehicle.id for vehicle, _ in pure._scan(state)[0]]
+        if movable != [vehicle.id for vehicle, _ in vectorized._scan(state)[0]]:
+            raise AssertionError(f"movable vehicles differ after {compared} exits")
+        compared += 1
+        if not movable:
+            return compared
+        vehicle = state.active_vehicles[movable[0]]
+        state = state.apply_vehicle_exit(vehicle.id, pure._path_info(vehicle).exit_path, graph)
+
+
+def run_case(vehicles: int, strategy: str, repeat: int) -> Dict[str, Any]:
+    side = max(40, int((vehicles * 30) ** 0.5))
+    level = generate_level(seed=vehicles, width=side, height=side, vehicles=vehicles, lanes=2,
+                           boulder_density=0.02, bulldozer_ratio=0.2)
+    graph, state = LevelLoader().load_level(level)
+    pure, vectorized = Solver(graph, strategy, vectorize=False), Solver(graph, strategy, vectorize=True)
+    pure._prepare(state)
+    vectorized._prepare(state)
+    result: Dict[str, Any] = {"vehicles": len(state.active_vehicles), "grid": side,
+                              "statesCompared": _check_agreement(graph, state, pure, vectorized)}
+    for name, solver in (("python", pure), ("numpy", vectorized)):
+        result[f"{name}ScanMs"] = round(_scan_ms(solver, state, repeat), 4)
+        start = time.perf_counter()
+        solved = solver.solve(state)
+        result[f"{name}SolveMs"] = round((time.perf_counter() - start) * 1000, 2)
+        result["solvable"] = solved.solvable
+    result["scanSpeedup"] = round(result["pythonScanMs"] / result["numpyScanMs"], 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vehicles", nargs="*", type=int, default=[100, 200, 300])
+    parser.add_argument("--strategy", default="greedy", help="solver strategy for the whole-solve timing")
+    parser.add_argument("--repeat", type=int, default=20, help="scans timed per check (median reported)")
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+    if load_numpy() is None:
+        sys.exit("numpy is not installed")
+
+    report = []
+    for vehicles in args.vehicles:
+        result = run_case(vehicles, args.strategy, args.repeat)
+        report.append(result)
+        print(f"{result['vehicles']:>4} vehicles  scan {result['pythonScanMs']:9.3f}ms -> "
+              f"{result['numpyScanMs']:7.3f}ms (x{result['scanSpeedup']})  "
+              f"solve {result['pythonSolveMs']:9.2f}ms -> {result['numpySolveMs']:9.2f}ms  "
+              f"({result['statesCompared']} states agree)", flush=True)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
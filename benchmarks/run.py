@@ -0,0 +1,232 @@
+"""
+Benchmark suite over synthetic levels (see benchmarks/generator.py).
+
+Every case runs in a fresh child process with the result cache off. It
+generates its level, then validates it `--repeat` times cold (graph cache
+reset before each run) and `--repeat` times warm, reporting medians.
+Instrumentation records the time spent in each stage (parse, cacheLookup,
+buildGraph, calculateAllPaths, validateInitialState, solve) and the solver
+counters. Cases exceeding `--timeout` are recorded as timeouts rather than
+stalling the suite.
+
+    python benchmarks/run.py --profile quick --save benchmarks/baseline.json
+    python benchmarks/run.py --profile quick --compare benchmarks/baseline.json --threshold 0.25
+
+With --compare, any stage slower than the baseline by more than the threshold
+(and by more than --min-ms, to ignore timer noise) is reported and the exit
+status is 1.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+benchmarks_dir = Path(__file__).resolve().parent
+app_dir = benchmarks_dir.parent / "app"
+
+STAGES = ["parse", "cacheLookup", "buildGraph", "calculateAllPaths", "validateInitialState", "solve"]
+
+
+def _case(name: str, width: int, vehicles: int, height: Optional[int] = None, **params) -> Dict[str, Any]:
+    return {"name": name, "params": dict(width=width, height=height or width, vehicles=vehicles, **params)}
+
+
+PROFILES: Dict[str, List[Dict[str, Any]]] = {
+    "quick": [
+        _case("grid10_v5", 10, 5, seed=1),
+        _case("grid25_v8", 25, 8, seed=2),
+        _case("grid50_v12", 50, 12, seed=3, boulder_density=0.02),
+        _case("grid25_v8_unsolvable", 25, 8, seed=2, solvable=False),
+        _case("grid30_v8_lanes2", 30, 8, seed=4, lanes=2, spacing=7),
+        _case("grid30_v8_straight", 30, 8, seed=5, rule_mix="straight"),
+    ],
+    "full": [
+        # Size and vehicle count scaling
+        _case("grid10_v5", 10, 5, seed=1),
+        _case("grid25_v10", 25, 10, seed=1),
+        _case("grid50_v20", 50, 20, seed=1),
+        _case("grid100_v50", 100, 50, seed=1),
+        _case("grid200_v100", 200, 100, seed=1),
+        _case("grid300_v200", 300, 200, seed=1),
+        # Boulder density
+        _case("grid50_v15_boulders05", 50, 15, seed=2, boulder_density=0.05),
+        _case("grid50_v15_boulders10", 50, 15, seed=2, boulder_density=0.10),
+        # Multi-lane intersection width
+        _case("grid50_v15_lanes2", 50, 15, seed=3, lanes=2, spacing=8),
+        _case("grid50_v15_lanes3", 50, 15, seed=3, lanes=3, spacing=9),
+        # Movement rule mix
+        _case("grid50_v15_straight", 50, 15, seed=4, rule_mix="straight"),
+        _case("grid50_v15_turns", 50, 15, seed=4, rule_mix="turns"),
+        _case("grid50_v15_mixed", 50, 15, seed=4, rule_mix="mixed"),
+        # Unsolvable
+        _case("grid50_v15_unsolvable", 50, 15, seed=5, solvable=False),
+        _case("grid100_v30_unsolvable", 100, 30, seed=5, solvable=False),
+    ],
+}
+
+
+def run_case(case: Dict[str, Any], repeat: int, queue: "multiprocessing.Queue"):
+    """Child process entry point: generate, validate cold then warm, report timings"""
+    os.environ["RESULT_CACHE_SIZE"] = "0"
+    os.environ["GRAPH_SNAPSHOT"] = ""
+    os.environ.pop("GRAPH_CACHE_DIR", None)
+    sys.path.insert(0, str(app_dir))
+    sys.path.insert(0, str(benchmarks_dir))
+
+    from generator import generate_level
+    from core.graph_cache import GraphCache
+    from services.instrumentation import Instrumentation
+    from services.level_loader import LevelLoader
+    from services.validator import validate_level
+
+    start = time.perf_counter()
+    level = generate_level(**case["params"])
+    generate_ms = (time.perf_counter() - start) * 1000
+    LevelLoader.graph_cache = GraphCache()  # generation compiled the layout; start cold
+    payload = json.dumps(level)
+
+    def timed_run() -> Dict[str, Any]:
+        instrumentation = Instrumentation()
+        run_start = time.perf_counter()
+        parse_start = time.perf_counter()
+        level_data = json.loads(payload)
+        instrumentation.record("parse", (time.perf_counter() - parse_start) * 1000)
+        response = validate_level(level_data, instrumentation)
+        response["totalMs"] = (time.perf_counter() - run_start) * 1000
+        return response
+
+    colds = []
+    for _ in range(repeat):
+        LevelLoader.graph_cache = GraphCache()
+        colds.append(timed_run())
+    warm = [timed_run()["totalMs"] for _ in range(repeat)]
+    cold = colds[0]
+    stages = {stage: statistics.median(run["instrumentation"]["phasesMs"].get(stage, 0.0) for run in colds)
+              for stage in STAGES}
+    queue.put({
+        "status": "error" if "error" in cold else "ok",
+        "error": cold.get("error"),
+        "solvable": cold.get("solvable"),
+        "expectedSolvable": case["params"].get("solvable", True),
+        "vehicles": level["metadata"]["placedVehicles"],
+        "generateMs": round(generate_ms, 3),
+        "coldMs": round(statistics.median(run["totalMs"] for run in colds), 3),
+        "warmMs": round(statistics.median(warm), 3),
+        "stagesMs": {stage: round(ms, 3) for stage, ms in stages.items()},
+        "counters": cold["instrumentation"]["counters"],
+    })
+
+
+def run_in_child(target, args: tuple, timeout: float) -> Dict[str, Any]:
+    """
+    Run target(*args, queue) in a fresh process and return the dict it puts
+    on the queue, or {"status": "timeout" | "crashed"}
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=target, args=args + (queue,))
+    process.start()
+    try:
+        result = queue.get(timeout=timeout)
+    except Exception:  # queue.Empty: the case did not finish in time, or crashed
+        result = {"status": "timeout" if process.is_alive() else "crashed"}
+    process.join(timeout=1)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+    return result
+
+
+def run_suite(cases: List[Dict[str, Any]], repeat: int, timeout: float) -> Dict[str, Any]:
+    results = {}
+    for case in cases:
+        result = run_in_child(run_case, (case, repeat), timeout)
+        result["params"] = case["params"]
+        results[case["name"]] = result
+        _print_row(case["name"], result)
+    return results
+
+
+def _print_row(name: str, result: Dict[str, Any]):
+    if result["status"] != "ok":
+        print(f"{name:<28} {result['status']}", flush=True)
+        return
+    stages = result["stagesMs"]
+    counters = result["counters"]
+    print(f"{name:<28} cold {result['coldMs']:10.1f}ms  warm {result['warmMs']:10.1f}ms  "
+          f"graph {stages.get('buildGraph', 0) + stages.get('calculateAllPaths', 0):10.1f}ms  "
+          f"solve {stages.get('solve', 0):10.1f}ms  "
+          f"states {counters.get('statesExplored', 0):>8}  solvable={result['solvable']}", flush=True)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_ms: float) -> List[str]:
+    """Regressions of current against baseline, as human-readable lines"""
+    regressions = []
+    for name, result in current["cases"].items():
+        before = baseline["cases"].get(name)
+        if before is None or before.get("status") != "ok":
+            continue
+        if result.get("status") != "ok":
+            regressions.append(f"{name}: {result.get('status')} (baseline ok)")
+            continue
+        if result["solvable"] != before["solvable"]:
+            regressions.append(f"{name}: solvable {before['solvable']} -> {result['solvable']}")
+        metrics = {f"stage {stage}": (before["stagesMs"].get(stage, 0.0), result["stagesMs"].get(stage, 0.0))
+                   for stage in STAGES}
+        metrics["warm total"] = (before["warmMs"], result["warmMs"])
+        for metric, (old, new) in metrics.items():
+            if new > old * (1 + threshold) and new - old > min_ms:
+                regressions.append(f"{name}: {metric} {old:.2f}ms -> {new:.2f}ms (+{(new / old - 1) * 100 if old else float('inf'):.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--cases", nargs="*", help="only run these case names")
+    parser.add_argument("--repeat", type=int, default=3, help="cold and warm runs per case (medians reported)")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds per case")
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    cases = [case for case in PROFILES[args.profile] if not args.cases or case["name"] in args.cases]
+    current = {
+        "meta": {
+            "profile": args.profile,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "cases": run_suite(cases, args.repeat, args.timeout),
+    }
+
+    for name, result in current["cases"].items():
+        if result["status"] == "ok" and result["solvable"] != result["expectedSolvable"]:
+            print(f"WARNING: {name} expected solvable={result['expectedSolvable']}, got {result['solvable']}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold, args.min_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold * 100:.0f}% against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
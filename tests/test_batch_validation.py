@@ -0,0 +1,184 @@
+import sys
+import copy
+import io
+import json
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+app_dir = project_root / 'app'
+sys.path.append(str(app_dir))
+
+from services.validator import validate_level, validate_levels, validate_lockstep, result_cache # type: ignore
+from services.level_loader import LevelLoader # type: ignore
+from core.lockstep import LockstepGreedy # type: ignore
+from core.solver import Solver # type: ignore
+from app.cli import validate_pack # type: ignore
+
+
+LEVEL = {
+    "levelId": "batch",
+    "grid": {
+        "dimensions": {"width": 5, "height": 3},
+        "layout": [
+            ["0", "0", "|", "0", "0"],
+            ["-", "-", "+", "-", "-"],
+            ["0", "0", "|", "0", "0"]
+        ]
+    },
+    "vehicles": [
+        {"id": "C01", "type": "CAR", "length": 2, "position": {"x": 1, "y": 1},
+         "orientation": "EAST", "movementRule": "STRAIGHT"}
+    ],
+    "obstacles": []
+}
+
+
+def make_levels(count):
+    """Levels alternating between solvable and blocked, plus one malformed entry"""
+    levels = []
+    for i in range(count):
+        level = copy.deepcopy(LEVEL)
+        level["levelId"] = f"batch_{i}"
+        if i % 2:
+            level["obstacles"].append({"id": "OB1", "type": "BOULDER", "position": {"x": 3, "y": 1}})
+        levels.append(level)
+    levels.append({"levelId": "broken"})
+    return levels
+
+
+def test_validate_levels_matches_sequential():
+    levels = make_levels(20)
+    expected = [validate_level(level) for level in levels]
+
+    results = list(validate_levels(iter(levels), workers=2, chunksize=3, ordered=True, window=8))
+    print(f"Validated {len(results)} levels")
+
+    assert [index for index, _ in results] == list(range(len(levels)))
+    for (_, result), want in zip(results, expected):
+        assert result.pop("executionTimeMs") >= 0
+        assert result == want
+
+
+def test_validate_levels_unordered_covers_every_index():
+    levels = make_levels(10)
+    indices = sorted(index for index, _ in validate_levels(levels, workers=2, chunksize=4))
+    assert indices == list(range(len(levels)))
+
+
+def test_validate_levels_inline():
+    results = list(validate_levels(make_levels(3), workers=1))
+    assert [result.get("solvable") for _, result in results] == [True, False, True, None]
+    assert results[-1][1]["error"]["code"] == "INVALID_REQUEST"
+
+
+def crossing_level(vehicles, boulders=()):
+    """7x7 level with one crossroad: vehicles as (id, type, x, y, orientation), boulders as (id, x, y)"""
+    layout = [["0"] * 7 for _ in range(7)]
+    for i in range(7):
+        layout[3][i], layout[i][3] = "-", "|"
+    layout[3][3] = "+"
+    return {
+        "levelId": "crossing",
+        "grid": {"dimensions": {"width": 7, "height": 7}, "layout": layout},
+        "vehicles": [{"id": vehicle_id, "type": vehicle_type, "length": 2, "position": {"x": x, "y": y},
+                      "orientation": orientation, "movementRule": "STRAIGHT"}
+                     for vehicle_id, vehicle_type, x, y, orientation in vehicles],
+        "obstacles": [{"id": boulder_id, "type": "BOULDER", "position": {"x": x, "y": y}}
+                      for boulder_id, x, y in boulders]
+    }
+
+
+def lockstep_levels():
+    """One layout: solvable, blocked by a boulder, cleared by a bulldozer, stuck after one exit, overlapping, malformed"""
+    car = ("C01", "CAR", 1, 3, "EAST")
+    return [
+        crossing_level([car]),
+        crossing_level([car], [("OB1", 5, 3)]),
+        crossing_level([car, ("B02", "BULLDOZER", 4, 3, "EAST")], [("OB1", 5, 3)]),
+        crossing_level([car, ("C02", "CAR", 3, 1, "SOUTH")], [("OB1", 3, 5)]),
+        crossing_level([car, ("C02", "CAR", 1, 3, "EAST")]),
+        {"levelId": "broken"}
+    ]
+
+
+def test_validate_lockstep_matches_validate_level():
+    levels = lockstep_levels()
+    expected = [validate_level(level) for level in levels]
+    assert [response.get("solvable") for response in expected] == [True, False, True, False, None, None]
+    assert expected[2]["solution"] == ["B02", "C01"] and expected[3]["partialSolution"] == ["C01"]
+    # Lockstep answers from the result cache too; turn it off so every level is solved
+    max_size, result_cache.max_size = result_cache.max_size, 0
+    try:
+        assert validate_lockstep(levels) == expected
+    finally:
+        result_cache.max_size = max_size
+    assert validate_lockstep(levels) == expected
+
+
+def test_lockstep_times_each_level():
+    """Per-level times, not the chunk's average: a cache hit costs far less than a solve"""
+    cars = [("C01", "CAR", 1, 3, "EAST"), ("C02", "CAR", 3, 1, "SOUTH")]
+    cached = crossing_level(cars, [("OB1", 3, 0)])
+    validate_level(cached)
+    timings = []
+    start = time.perf_counter()
+    responses = validate_lockstep([crossing_level(cars, [("OB1", 0, 3)]), cached, {"levelId": "broken"}], timings)
+    wall_ms = (time.perf_counter() - start) * 1000
+    assert responses[0]["solvable"] and responses[1] == validate_level(cached) and len(timings) == 3
+    assert timings[1] < timings[0]
+    assert sum(timings) <= wall_ms
+
+
+def test_lockstep_rounds_match_greedy_solver():
+    loaded = [LevelLoader().load_level(level) for level in lockstep_levels()[:4]]
+    graph = loaded[0][0]
+    assert all(other is graph for other, _ in loaded)
+    states = [state for _, state in loaded]
+    expected = [Solver(graph, "greedy").solve(state) for state in states]
+    assert LockstepGreedy(graph, vectorize=False).solve(states) == expected
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return
+    assert LockstepGreedy(graph, vectorize=True).solve(states) == expected
+
+
+def test_validate_pack_streams_ndjson():
+    """Every input line gets one output line, including unparseable ones"""
+    lines = [json.dumps(level) + "\n" for level in make_levels(4)]
+    lines.insert(2, "{not json\n")
+    out = io.StringIO()
+    stats = validate_pack(iter(lines), out, workers=1)
+    print(stats)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert sorted(record["line"] for record in records) == list(range(1, len(lines) + 1))
+    assert stats["levels"] == 5 and stats["invalid"] == 1
+    assert stats["solvable"] == 2 and stats["unsolvable"] == 2 and stats["errors"] == 1
+    assert records[0]["line"] == 1 and records[0]["levelId"] == "batch_0"
+
+
+def test_validate_pack_ordered_keeps_unparseable_lines_in_place():
+    lines = [json.dumps(level) + "\n" for level in make_levels(6)]
+    for line_number in (1, 4, 10):
+        lines.insert(line_number - 1, "{not json\n")
+    out = io.StringIO()
+    validate_pack(iter(lines), out, workers=2, chunksize=2, ordered=True, window=4)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [record["line"] for record in records] == list(range(1, len(lines) + 1))
+    assert [record["line"] for record in records if record.get("levelId") is None and
+            record["error"]["message"].startswith("Line is not")] == [1, 4, 10]
+
+
+if __name__ == "__main__":
+    test_validate_levels_matches_sequential()
+    test_validate_levels_unordered_covers_every_index()
+    test_validate_levels_inline()
+    test_validate_lockstep_matches_validate_level()
+    test_lockstep_times_each_level()
+    test_lockstep_rounds_match_greedy_solver()
+    test_validate_pack_streams_ndjson()
+    test_validate_pack_ordered_keeps_unparseable_lines_in_place()
@@ -0,0 +1,233 @@
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+app_dir = project_root / 'app'
+sys.path.append(str(app_dir))
+
+from core.graph_builder import GraphBuilder # type: ignore
+from core.path_calculator import PathCalculator # type: ignore
+from core.graph_cache import GraphCache # type: ignore
+from core.graph_store import DiskGraphCache, GraphSnapshot, write_snapshot # type: ignore
+from core.layout_symmetry import ( # type: ignore
+    TRANSFORMS, transform_layout, transform_point, transform_dims,
+    transform_orientation, transform_rule, canonicalize
+)
+from services.validator import validate_level # type: ignore
+from models.enums import Orientation, MovementRule # type: ignore
+
+
+LAYOUT = [
+    ["E", "E", "E", "E", "E", "E", "E"],
+    ["E", "0", "0", "|", "0", "0", "E"],
+    ["E", "-", "-", "+", "-", "-", "E"],
+    ["E", "0", "0", "|", "0", "0", "E"],
+    ["E", "E", "E", "E", "E", "E", "E"],
+]
+
+
+def build(layout):
+    graph = GraphBuilder().build_graph(len(layout[0]), len(layout), layout)
+    PathCalculator().calculate_all_paths(graph)
+    return graph
+
+
+def test_virtual_exit_border_matches_materialized_border():
+    """exit_border=True builds the same graph as an explicitly bordered layout"""
+    inner = [row[1:-1] for row in LAYOUT[1:-1]]
+    virtual = GraphBuilder().build_graph(len(inner[0]), len(inner), inner, exit_border=True)
+    PathCalculator().calculate_all_paths(virtual)
+    explicit = build(LAYOUT)
+
+    assert (virtual.width, virtual.height) == (explicit.width, explicit.height)
+    assert virtual.exit_positions == explicit.exit_positions
+    for node_id, node in explicit.nodes.items():
+        assert virtual.nodes[node_id].cell_type == node.cell_type
+        assert virtual.nodes[node_id].neighbors == node.neighbors
+    for node_id, by_orientation in explicit.path_lookup.items():
+        for orientation, by_rule in by_orientation.items():
+            for rule, path_info in by_rule.items():
+                assert virtual.path_lookup[node_id][orientation][rule] == path_info
+
+
+def test_disk_cache_round_trip():
+    """A graph written by one cache instance is served by a fresh one"""
+    with tempfile.TemporaryDirectory() as directory:
+        writer = GraphCache(disk_cache=DiskGraphCache(directory))
+        key = writer.get_cache_key(LAYOUT, len(LAYOUT[0]), len(LAYOUT))
+        writer.put(key, build(transform_layout(LAYOUT, key.transform)))
+
+        # Simulates a cold start: empty memory tier, same directory
+        reader = GraphCache(disk_cache=DiskGraphCache(directory))
+        graph = reader.get(reader.get_cache_key(LAYOUT, len(LAYOUT[0]), len(LAYOUT)))
+        assert graph is not None
+        assert reader.cache, "disk hit should be promoted to the memory tier"
+
+        node = graph.get_node(1, 2)
+        path_info = graph.path_lookup[node.id][Orientation.EAST][MovementRule.STRAIGHT]
+        print(f"Path from disk: {path_info.exit_path}")
+        assert path_info.valid
+        assert path_info.exit_point == graph.get_node(6, 2).position
+
+
+def test_disk_cache_ignores_corrupt_entries():
+    """Truncated or foreign files are treated as misses"""
+    with tempfile.TemporaryDirectory() as directory:
+        disk = DiskGraphCache(directory)
+        cache = GraphCache(disk_cache=disk)
+        key = cache.get_cache_key(LAYOUT, len(LAYOUT[0]), len(LAYOUT))
+        Path(disk._path(key.digest)).write_bytes(b"not a graph")
+        assert cache.get(key) is None
+
+        Path(disk._path(key.digest)).write_bytes(b"")
+        assert cache.get(key) is None
+
+
+def test_snapshot_serves_baked_layouts():
+    """Baked entries are found by key and decoded on first use only"""
+    cache = GraphCache()
+    key = cache.get_cache_key(LAYOUT, len(LAYOUT[0]), len(LAYOUT))
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "graph_snapshot.bin")
+        write_snapshot(path, {key.digest: build(transform_layout(LAYOUT, key.transform))})
+
+        snapshot = GraphSnapshot(path)
+        assert len(snapshot) == 1 and not snapshot.graphs
+
+        cold = GraphCache(snapshot=snapshot)
+        graph = cold.get(cold.get_cache_key(LAYOUT, len(LAYOUT[0]), len(LAYOUT)))
+        assert graph is not None
+        assert cold.get(key) is graph
+        assert not cold.cache, "snapshot entries live outside the LRU"
+        assert graph.path_lookup[graph.get_node(1, 2).id][Orientation.EAST][MovementRule.STRAIGHT].valid
+
+
+ASYMMETRIC_LAYOUT = [
+    ["E", "E", "E", "E", "E", "E", "E", "E"],
+    ["E", "0", "|", "0", "0", "|", "|", "E"],
+    ["E", "-", "+", "-", "-", "+", "+", "E"],
+    ["E", "0", "|", "0", "0", "+", "+", "E"],
+    ["E", "-", "+", "-", "-", "+", "|", "E"],
+    ["E", "E", "E", "E", "E", "E", "E", "E"],
+]
+
+
+def path_positions(graph, path_info):
+    return [graph.nodes[node_id].position for node_id in path_info.exit_path]
+
+
+def test_symmetric_variants_share_one_entry():
+    """Every rotation/mirror hits the same entry and sees the same paths as a direct build"""
+    cache = GraphCache()
+    digests = set()
+
+    for t in TRANSFORMS:
+        variant = transform_layout(ASYMMETRIC_LAYOUT, t)
+        key = cache.get_cache_key(variant, len(variant[0]), len(variant))
+        digests.add(key.digest)
+
+        graph = cache.get(key)
+        if graph is None:
+            canonical_graph = build(transform_layout(variant, key.transform))
+            cache.put(key, canonical_graph)
+            graph = cache.orient(key, canonical_graph)
+
+        expected = build(variant)
+        for node in expected.nodes.values():
+            view_node = graph.get_node(node.position.x, node.position.y)
+            assert view_node.position == node.position
+            assert view_node.cell_type == node.cell_type
+            if node.id not in expected.path_lookup:
+                assert view_node.id not in graph.path_lookup
+                continue
+            for orientation in Orientation:
+                for rule in MovementRule:
+                    want = expected.path_lookup[node.id][orientation][rule]
+                    got = graph.path_lookup[view_node.id][orientation][rule]
+                    assert got.valid == want.valid, (t, node.position, orientation, rule)
+                    assert path_positions(graph, got) == path_positions(expected, want)
+                    assert got.exit_point == want.exit_point
+
+    print(f"Variants: {len(TRANSFORMS)}, cache entries: {len(cache.cache)}")
+    assert len(digests) == 1
+    assert len(cache.cache) == 1
+
+
+def test_canonical_form_is_transform_invariant():
+    canonical, _ = canonicalize(ASYMMETRIC_LAYOUT)
+    for t in TRANSFORMS:
+        assert canonicalize(transform_layout(ASYMMETRIC_LAYOUT, t))[0] == canonical
+
+
+def transform_level(level_data, t):
+    """Rotate/mirror a whole level: layout, vehicles and obstacles"""
+    width = level_data["grid"]["dimensions"]["width"]
+    height = level_data["grid"]["dimensions"]["height"]
+    new_width, new_height = transform_dims(width, height, t)
+
+    def move(position):
+        x, y = transform_point(t, position["x"], position["y"], width, height)
+        return {"x": x, "y": y}
+
+    return {
+        "levelId": level_data["levelId"],
+        "grid": {
+            "dimensions": {"width": new_width, "height": new_height},
+            "layout": transform_layout(level_data["grid"]["layout"], t),
+        },
+        "vehicles": [
+            dict(v, position=move(v["position"]),
+                 orientation=transform_orientation(t, Orientation(v["orientation"])).value,
+                 movementRule=transform_rule(t, MovementRule(v["movementRule"])).value)
+            for v in level_data["vehicles"]
+        ],
+        "obstacles": [dict(o, position=move(o["position"])) for o in level_data["obstacles"]],
+    }
+
+
+def test_rotated_levels_validate_identically():
+    """Level 116 gives the same verdict in all 8 orientations"""
+    level_data = json.loads((project_root / "docs" / "example.json").read_text())
+    expected = validate_level(level_data)
+    assert expected["solvable"]
+
+    for t in TRANSFORMS:
+        result = validate_level(transform_level(level_data, t))
+        print(f"{t}: solvable={result.get('solvable')} moves={result.get('totalMoves')}")
+        assert result["solvable"] == expected["solvable"]
+        assert result["totalMoves"] == expected["totalMoves"]
+
+
+def test_multi_character_cells_do_not_alias_a_cached_layout():
+    """Cells joining into a cached layout's bytes are rejected, not served its graph"""
+    level_data = {
+        "levelId": "cells",
+        "grid": {"dimensions": {"width": 3, "height": 3},
+                 "layout": [["0", "|", "0"], ["-", "+", "-"], ["0", "|", "0"]]},
+        "vehicles": [{"id": "C1", "type": "CAR", "length": 1, "position": {"x": 0, "y": 1},
+                      "orientation": "EAST", "movementRule": "STRAIGHT"}],
+        "obstacles": [],
+    }
+    assert validate_level(level_data)["solvable"]
+
+    for layout in ([["0|", "0", ""], ["-+", "-", ""], ["0|", "0", ""]],
+                   [["0", "|", "0"], ["-", "+", "-"], ["0", "|", ["0"]]]):
+        malformed = dict(level_data, grid={"dimensions": {"width": 3, "height": 3}, "layout": layout})
+        result = validate_level(malformed)
+        assert result["error"]["code"] == "VALIDATION_ERROR", result
+        assert "single characters" in result["error"]["message"]
+
+
+if __name__ == "__main__":
+    test_virtual_exit_border_matches_materialized_border()
+    test_disk_cache_round_trip()
+    test_disk_cache_ignores_corrupt_entries()
+    test_snapshot_serves_baked_layouts()
+    test_symmetric_variants_share_one_entry()
+    test_canonical_form_is_transform_invariant()
+    test_rotated_levels_validate_identically()
+    test_multi_character_cells_do_not_alias_a_cached_layout()
@@ -9,6 +9,7 @@ sys.path.append(str(app_dir))
 
 import json
 from lambda_function import lambda_handler # type: ignore
+from services.validator import profile_level # type: ignore
 
 
 def test_lambda_with_level_116():
@@ -229,6 +230,133 @@ def test_invalid_json():
     print(f"Body: {response['body']}")
 
 
+BATCH_LEVEL = {
+    "levelId": "batch",
+    "grid": {
+        "dimensions": {"width": 5, "height": 3},
+        "layout": [
+            ["0", "0", "|", "0", "0"],
+            ["-", "-", "+", "-", "-"],
+            ["0", "0", "|", "0", "0"]
+        ]
+    },
+    "vehicles": [
+        {"id": "C01", "type": "CAR", "length": 2, "position": {"x": 1, "y": 1},
+         "orientation": "EAST", "movementRule": "STRAIGHT"}
+    ],
+    "obstacles": []
+}
+
+
+class FakeContext:
+    """Lambda context whose remaining time drops by 1s per check"""
+
+    def __init__(self, remaining_ms):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        self.remaining_ms -= 1000
+        return self.remaining_ms
+
+
+def test_batch_levels():
+    """A batch returns one result per level, in order, with timings"""
+    levels = [dict(BATCH_LEVEL, levelId=f"batch_{i}") for i in range(3)] + [{"levelId": "broken"}]
+    response = lambda_handler({'body': json.dumps({"levels": levels})}, FakeContext(60000))
+    body = json.loads(response['body'])
+    print(f"Batch: {body['validated']} validated in {body['executionTimeMs']}ms")
+
+    assert response['statusCode'] == 200
+    assert [r['levelId'] for r in body['results']] == ["batch_0", "batch_1", "batch_2", "broken"]
+    assert all(r['executionTimeMs'] >= 0 for r in body['results'])
+    assert body['results'][0]['solvable'] is True
+    assert body['results'][3]['error']['code'] == 'INVALID_REQUEST'
+
+
+def test_batch_rejects_entries_that_are_not_levels():
+    """Non-object entries are client errors of their own; the rest still validate"""
+    levels = [5, None, "x", BATCH_LEVEL]
+    response = lambda_handler({'body': json.dumps({"levels": levels})}, FakeContext(60000))
+    body = json.loads(response['body'])
+
+    assert response['statusCode'] == 200
+    assert [r.get('error', {}).get('code') for r in body['results']] == ['INVALID_REQUEST'] * 3 + [None]
+    assert body['results'][3]['solvable'] is True
+
+
+def test_batch_deadline_marks_unreached_levels():
+    levels = [dict(BATCH_LEVEL, levelId=f"batch_{i}") for i in range(5)]
+    # 1s margin: two levels fit before the remaining time drops below it
+    response = lambda_handler({"levels": levels}, FakeContext(3500))
+    body = json.loads(response['body'])
+
+    assert body['validated'] == 2 and body['notReached'] == 3
+    assert [r.get('error', {}).get('code') for r in body['results']] == [None, None] + ['NOT_REACHED'] * 3
+
+
+def test_instrumentation_is_opt_in():
+    level = dict(BATCH_LEVEL, vehicles=BATCH_LEVEL["vehicles"] + [
+        {"id": "C02", "type": "CAR", "length": 2, "position": {"x": 4, "y": 1},
+         "orientation": "EAST", "movementRule": "STRAIGHT"}
+    ])
+    plain = json.loads(lambda_handler({'body': json.dumps(level)}, None)['body'])
+    assert 'instrumentation' not in plain
+
+    event = {'body': json.dumps(level), 'queryStringParameters': {'instrument': 'true'}}
+    body = json.loads(lambda_handler(event, None)['body'])
+    print(body['instrumentation'])
+    assert body['solvable'] == plain['solvable']
+    assert 'parse' in body['instrumentation']['phasesMs']
+    # The first request was answered by the solver, this one by the result cache
+    assert body['instrumentation']['counters']['resultCache'] == 'hit'
+
+    body = json.loads(lambda_handler(dict(level, instrument=True, grid=dict(level['grid'], layout=[
+        ["0", "0", "|", "0", "0"],
+        ["-", "-", "+", "-", "-"],
+        ["0", "0", "|", "0", "+"]
+    ])), None)['body'])
+    counters = body['instrumentation']['counters']
+    assert counters['resultCache'] == 'miss'
+    assert counters['statesExplored'] >= 1
+    assert counters['statesGenerated'] == counters['peakVisited'] - 1 + counters['statesDeduplicated']
+    assert 'solve' in body['instrumentation']['phasesMs']
+
+
+def test_profile_level():
+    response = profile_level(BATCH_LEVEL)
+    assert response['solvable'] is True
+    functions = [row['function'] for row in response['profile']['topFunctions']]
+    assert any('solve' in name for name in functions)
+    assert response['profile']['memory']['peakKb'] > 0
+
+    # The request flag alone is ignored unless VALIDATOR_PROFILING is set
+    body = json.loads(lambda_handler(dict(BATCH_LEVEL, profile=True), None)['body'])
+    assert 'profile' not in body
+
+
+def test_engine_override_needs_debug_deployment():
+    """Without VALIDATOR_PROFILING a forced engine is ignored, in the body and the query string"""
+    body = json.loads(lambda_handler(dict(BATCH_LEVEL, engine="bfs"), None)['body'])
+    assert body['engine'] == 'greedy'
+    event = {'body': json.dumps(BATCH_LEVEL), 'queryStringParameters': {'engine': 'iddfs'}}
+    assert json.loads(lambda_handler(event, None)['body'])['engine'] == 'greedy'
+
+
+def test_parallel_engine_is_refused_per_request():
+    """Even on a debug deployment, a request cannot make a solve fork worker processes"""
+    import lambda_function
+    enabled, lambda_function.PROFILING_ENABLED = lambda_function.PROFILING_ENABLED, True
+    try:
+        assert json.loads(lambda_handler(dict(BATCH_LEVEL, engine="bfs"), None)['body'])['engine'] == 'bfs'
+        response = lambda_handler(dict(BATCH_LEVEL, engine="parallel"), None)
+        assert response['statusCode'] == 400
+        assert json.loads(response['body'])['error']['code'] == 'INVALID_REQUEST'
+        batch = lambda_handler({'levels': [BATCH_LEVEL], 'engine': 'parallel'}, None)
+        assert batch['statusCode'] == 400
+    finally:
+        lambda_function.PROFILING_ENABLED = enabled
+
+
 if __name__ == "__main__":
     import cProfile
     import pstats
@@ -0,0 +1,86 @@
+import sys
+import io
+import json
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+app_dir = project_root / 'app'
+sys.path.append(str(app_dir))
+
+from services.level_codec import encode_level, decode_level, write_pack, LevelPack # type: ignore
+from services.validator import validate_level, level_fingerprint # type: ignore
+from app.cli import validate_pack # type: ignore
+
+
+EXAMPLE = json.loads((project_root / "docs" / "example.json").read_text())
+
+
+def test_round_trip():
+    """Decoding an encoded level gives back the JSON schema (minus metadata)"""
+    level = dict(EXAMPLE)
+    level["obstacles"] = level["obstacles"] + [
+        {"id": "TL1", "type": "TRAFFIC_LIGHT", "position": {"x": 2, "y": 3}, "currentState": "GREEN",
+         "timing": {"redDuration": 3, "greenDuration": 2, "currentTimer": 1}},
+        {"id": "P1", "type": "PEDESTRIAN", "position": {"x": 4, "y": 5},
+         "crossingTime": 3, "currentProgress": 1},
+    ]
+    blob = encode_level(level)
+    decoded = decode_level(blob)
+    print(f"{len(json.dumps(level))} JSON bytes -> {len(blob)} binary bytes")
+
+    assert decoded["levelId"] == level["levelId"]
+    assert decoded["grid"] == level["grid"]
+    assert decoded["vehicles"] == level["vehicles"]
+    assert decoded["obstacles"] == level["obstacles"]
+
+
+def test_binary_level_validates_like_json():
+    blob = encode_level(EXAMPLE)
+    assert validate_level(blob) == validate_level(EXAMPLE)
+    assert level_fingerprint(blob) is not None
+
+    truncated = validate_level(blob[:-3])
+    assert truncated["error"]["code"] == "VALIDATION_ERROR"
+
+
+def test_encode_rejects_what_the_format_cannot_hold():
+    """Cells must be one character each and ids at most 8 bytes"""
+    layout = [row[:] for row in EXAMPLE["grid"]["layout"]]
+    layout[0][0], layout[0][1] = layout[0][0] + layout[0][1], ""
+    for level in ({**EXAMPLE, "grid": {**EXAMPLE["grid"], "layout": layout}},
+                  {**EXAMPLE, "vehicles": [dict(EXAMPLE["vehicles"][0], id="VEHICLE_1")]}):
+        try:
+            encode_level(level)
+        except ValueError as e:
+            print(f"Rejected: {e}")
+        else:
+            raise AssertionError("encode_level accepted a level the format cannot hold")
+
+
+def test_level_pack():
+    levels = [EXAMPLE, {**EXAMPLE, "levelId": "second", "obstacles": []}]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/levels.tplp"
+        assert write_pack(path, levels) == 2
+
+        pack = LevelPack(path)
+        assert len(pack) == 2
+        assert decode_level(pack[-1])["levelId"] == "second"
+
+        out = io.StringIO()
+        stats = validate_pack(pack, out, workers=1)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [record["levelId"] for record in records] == [EXAMPLE["levelId"], "second"]
+        assert records[0]["solvable"] == validate_level(EXAMPLE)["solvable"]
+        assert stats["levels"] == 2
+        pack.close()
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_binary_level_validates_like_json()
+    test_encode_rejects_what_the_format_cannot_hold()
+    test_level_pack()
@@ -0,0 +1,70 @@
+import sys
+import json
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+app_dir = project_root / 'app'
+sys.path.append(str(app_dir))
+
+from app.local_server import serve # type: ignore
+
+
+LEVEL = {
+    "levelId": "server",
+    "grid": {
+        "dimensions": {"width": 5, "height": 3},
+        "layout": [
+            ["0", "0", "|", "0", "0"],
+            ["-", "-", "+", "-", "-"],
+            ["0", "0", "|", "0", "0"]
+        ]
+    },
+    "vehicles": [
+        {"id": "C01", "type": "CAR", "length": 2, "position": {"x": 1, "y": 1},
+         "orientation": "EAST", "movementRule": "STRAIGHT"}
+    ],
+    "obstacles": []
+}
+
+
+async def _post(port, body, path="/"):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = []
+    for payload in (body, b"{not json"):  # two requests on one keep-alive connection
+        writer.write(f"POST {path} HTTP/1.1\r\nContent-Length: {len(payload)}\r\n\r\n".encode() + payload)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := await reader.readline()) != b"\r\n":
+            name, _, value = line.decode().partition(":")
+            headers[name.lower()] = value.strip()
+        responses.append((status, json.loads(await reader.readexactly(int(headers["content-length"])))))
+    writer.close()
+    return responses
+
+
+def test_server_speaks_lambda_contract():
+    async def scenario():
+        pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("fork"))
+        ready = asyncio.get_running_loop().create_future()
+        server = asyncio.create_task(serve("127.0.0.1", 0, pool, 10000, ready))
+        try:
+            port = await ready
+            return await _post(port, json.dumps(LEVEL).encode())
+        finally:
+            server.cancel()
+            pool.shutdown()
+
+    (status, body), (bad_status, bad_body) = asyncio.run(scenario())
+    print(body)
+    assert status == 200 and body["solvable"] is True and body["solution"] == ["C01"]
+    assert bad_status == 400 and bad_body["error"]["code"] == "INVALID_REQUEST"
+
+
+if __name__ == "__main__":
+    test_server_speaks_lambda_contract()
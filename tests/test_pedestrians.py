@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+app_dir = project_root / 'app'
+sys.path.append(str(app_dir))
+
+from services.level_loader import LevelLoader # type: ignore
+from services.validator import validate_level # type: ignore
+from core.timeline import Timeline # type: ignore
+from models.graph import Position # type: ignore
+from models.obstacles import Pedestrian # type: ignore
+
+
+def pedestrian(pedestrian_id, x, y, crossing_time, progress=0):
+    return {"id": pedestrian_id, "type": "PEDESTRIAN", "position": {"x": x, "y": y},
+            "crossingTime": crossing_time, "currentProgress": progress}
+
+
+def two_lane_road(level_id, obstacles, vehicles=None):
+    """An eastbound two-lane road (rows 0 and 1) with a vertical road at x=5"""
+    return {
+        "levelId": level_id,
+        "grid": {
+            "dimensions": {"width": 7, "height": 3},
+            "layout": [
+                ["-", "-", "-", "-", "-", "+", "-"],
+                ["-", "-", "-", "-", "-", "+", "-"],
+                ["0", "0", "0", "0", "0", "|", "0"]
+            ]
+        },
+        "vehicles": vehicles if vehicles is not None else [
+            {"id": "C01", "type": "CAR", "length": 2, "position": {"x": 1, "y": 0},
+             "orientation": "EAST", "movementRule": "STRAIGHT"}
+        ],
+        "obstacles": obstacles
+    }
+
+
+def test_walk_covers_every_cell_there_and_back():
+    walker = Pedestrian("P", Position(0, 0), crossing_time=2)
+    assert [walker.cells_at(tick, 2) for tick in range(4)] == [[0], [1], [1], [0]]
+    # Faster than a cell per tick: several cells at once
+    runner = Pedestrian("R", Position(0, 0), crossing_time=1)
+    assert runner.cells_at(0, 3) == [0, 1, 2] and runner.cells_at(1, 3) == [2, 1, 0]
+
+
+def test_timeline_masks_cover_the_crossing():
+    graph, state = LevelLoader().load_level(two_lane_road("masks", [pedestrian("P01", 3, 1, 2)]))
+    timeline = Timeline(state.obstacles.values(), graph)
+    # Internal coordinates are shifted by the exit border
+    assert timeline.crossings["P01"] == [Position(4, 1), Position(4, 2)]
+    assert timeline.period == 4
+    lane = timeline.path_mask([Position(4, 1)])
+    assert [bool(timeline.blocked_mask(tick) & lane) for tick in range(4)] == [True, False, False, True]
+
+
+def test_vehicle_passes_while_pedestrian_is_in_the_other_lane():
+    result = validate_level(two_lane_road("cross", [pedestrian("P01", 3, 0, 2)]))
+    assert result["solvable"] is True and result["exitTicks"] == [1]
+
+
+def test_pedestrian_on_intersection_is_rejected():
+    result = validate_level(two_lane_road("bad", [pedestrian("P01", 5, 0, 2)]))
+    assert result["error"]["code"] == "VALIDATION_ERROR"
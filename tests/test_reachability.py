@@ -0,0 +1,58 @@
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+app_dir = project_root / 'app'
+sys.path.append(str(app_dir))
+
+from services.level_loader import LevelLoader # type: ignore
+from core.solver import Solver # type: ignore
+from core.external_search import ReachabilityExplorer # type: ignore
+
+
+def blocked_level():
+    """C01 waits for a light green every sixth tick; a boulder holds C02 forever"""
+    return {
+        "levelId": "blocked",
+        "grid": {
+            "dimensions": {"width": 5, "height": 3},
+            "layout": [
+                ["-", "-", "-", "-", "-"],
+                ["0", "0", "0", "0", "0"],
+                ["-", "-", "-", "-", "-"]
+            ]
+        },
+        "vehicles": [
+            {"id": f"C0{i + 1}", "type": "CAR", "length": 2, "position": {"x": 1, "y": y},
+             "orientation": "EAST", "movementRule": "STRAIGHT"}
+            for i, y in enumerate((0, 2))
+        ],
+        "obstacles": [
+            {"id": "L1", "type": "TRAFFIC_LIGHT", "position": {"x": 3, "y": 0}, "currentState": "RED",
+             "timing": {"redDuration": 5, "greenDuration": 1}},
+            {"id": "O1", "type": "BOULDER", "position": {"x": 4, "y": 2}}
+        ]
+    }
+
+
+def test_counts_match_breadth_first_search():
+    blocked = blocked_level()
+    with open(project_root / "docs" / "example.json") as f:
+        level_116 = json.load(f)
+    # Level 116's only solved state is in the last layer, and the blocked
+    # level is unsolvable, so BFS explores every reachable state of both
+    for level in (level_116, blocked):
+        graph, state = LevelLoader().load_level(level)
+        expected = Solver(graph).solve(state)
+        with tempfile.TemporaryDirectory() as work_dir:
+            # Tiny runs and fan-in to exercise multi-pass merging
+            report = ReachabilityExplorer(graph, work_dir, batch_size=5, fan_in=2).explore(state)
+            assert not list(Path(work_dir).iterdir())
+        assert report.states == sum(report.layers) == expected.stats["statesExplored"]
+        assert report.solvable == expected.solvable
+        if expected.solvable:
+            assert report.solution_depth == expected.total_moves
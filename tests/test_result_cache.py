@@ -0,0 +1,134 @@
+import sys
+import copy
+import json
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+app_dir = project_root / 'app'
+sys.path.append(str(app_dir))
+
+from services.validator import validate_level, level_fingerprint, ResultCache # type: ignore
+
+
+DEADLOCK_LEVEL = {
+    "levelId": "deadlock",
+    "metadata": {"difficulty": "hard", "targetMoves": 2},
+    "grid": {
+        "dimensions": {"width": 5, "height": 1},
+        "layout": [["-", "-", "-", "-", "-"]]
+    },
+    "vehicles": [
+        {"id": "C01", "type": "CAR", "length": 2, "position": {"x": 1, "y": 0},
+         "orientation": "EAST", "movementRule": "STRAIGHT"},
+        {"id": "C02", "type": "CAR", "length": 2, "position": {"x": 2, "y": 0},
+         "orientation": "WEST", "movementRule": "STRAIGHT"}
+    ],
+    "obstacles": []
+}
+
+
+def renamed(level_data, names):
+    """Copy of a level with new vehicle ids, reversed order and new metadata"""
+    level = copy.deepcopy(level_data)
+    level["levelId"] = "resubmitted"
+    level["metadata"] = {"difficulty": "easy"}
+    for vehicle in level["vehicles"]:
+        vehicle["id"] = names[vehicle["id"]]
+    level["vehicles"].reverse()
+    return level
+
+
+def test_fingerprint_ignores_ids_order_and_metadata():
+    original = level_fingerprint(DEADLOCK_LEVEL)
+    variant = level_fingerprint(renamed(DEADLOCK_LEVEL, {"C01": "X", "C02": "Y"}))
+    assert original[0] == variant[0]
+    assert original[1] == ["C01", "C02"]
+    assert variant[1] == ["X", "Y"]
+
+
+def test_cached_response_is_remapped_to_new_ids():
+    """Blocking details from the cache name the resubmitted vehicles"""
+    first = validate_level(DEADLOCK_LEVEL)
+    # Swapped names check the remapping is simultaneous, not sequential
+    second = validate_level(renamed(DEADLOCK_LEVEL, {"C01": "C02", "C02": "C01"}))
+    print(json.dumps(second, indent=2))
+
+    assert first["solvable"] is False
+    swap = {"C01": "C02", "C02": "C01"}
+    for before, after in zip(first["blockingDetails"], second["blockingDetails"]):
+        assert after["blocked"] == swap[before["blocked"]]
+        assert after["blockedBy"] == swap[before["blockedBy"]]
+
+    # Callers may mutate responses (lambda_handler adds timing) without touching the cache
+    second["executionTimeMs"] = 1.0
+    assert "executionTimeMs" not in validate_level(DEADLOCK_LEVEL)
+
+
+def test_word_and_number_ids_leave_prose_alone():
+    """Ids that are also words or numbers in the reason never rename the prose"""
+    reason = "No vehicle can move after 0 exits; exits never block other vehicles, so no order gets further."
+    for names in ({"C01": "0", "C02": "exits"}, {"C01": "X0", "C02": "X1"}, {"C01": "exits", "C02": "0"}):
+        response = validate_level(renamed(DEADLOCK_LEVEL, names))
+        assert response["reason"] == reason
+        assert {detail["blocked"] for detail in response["blockingDetails"]} == set(names.values())
+        assert response["engine"] == "greedy"
+
+    # Stored under such ids, a response cannot be remapped, so it is not cached
+    cache = ResultCache(max_size=4)
+    calls = []
+
+    def compute(ids):
+        calls.append(ids)
+        return {"solvable": False, "partialSolution": [ids[0]], "reason": f"after 2 exits, {ids[0]} blocks {ids[1]}",
+                "blockingDetails": [{"blocked": ids[1], "blockedBy": ids[0], "reason": "BOULDER blocks path"}]}
+
+    assert cache.get_or_compute("fp", ["2", "exits"], lambda: compute(["2", "exits"]))["reason"] == \
+        "after 2 exits, 2 blocks exits"
+    assert not cache.cache
+    served = cache.get_or_compute("fp", ["X0", "X1"], lambda: compute(["X0", "X1"]))
+    assert served["reason"] == "after 2 exits, X0 blocks X1" and len(calls) == 2
+
+    # Mixed ids are remapped by exact match in id fields and whole words in prose
+    served = cache.get_or_compute("fp", ["2", "exits"], lambda: compute(["2", "exits"]))
+    assert served == {"solvable": False, "partialSolution": ["2"], "reason": "after 2 exits, 2 blocks exits",
+                      "blockingDetails": [{"blocked": "exits", "blockedBy": "2", "reason": "BOULDER blocks path"}]}
+    assert len(calls) == 2
+
+
+def test_concurrent_duplicates_are_coalesced():
+    cache = ResultCache(max_size=4)
+    calls = []
+    release = threading.Event()
+
+    def compute(vehicle_id):
+        calls.append(vehicle_id)
+        release.wait(5)
+        return {"solvable": True, "solution": [vehicle_id], "totalMoves": 1}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda i=i: results.append(
+            cache.get_or_compute("fp", [f"V{i}"], lambda: compute(f"V{i}"))))
+        for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    while not cache.in_flight:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(r["solution"][0] for r in results) == ["V0", "V1", "V2", "V3"]
+
+
+if __name__ == "__main__":
+    test_fingerprint_ignores_ids_order_and_metadata()
+    test_cached_response_is_remapped_to_new_ids()
+    test_word_and_number_ids_leave_prose_alone()
+    test_concurrent_duplicates_are_coalesced()
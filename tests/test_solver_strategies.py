@@ -0,0 +1,143 @@
+import sys
+import json
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+app_dir = project_root / 'app'
+sys.path.append(str(app_dir))
+
+from services.level_loader import LevelLoader # type: ignore
+from services.validator import validate_level # type: ignore
+from core.solver import Solver, select_strategy # type: ignore
+from core.movability import load_numpy # type: ignore
+
+
+def lanes_level():
+    """C01 waits for a light that is green only at ticks 5, 11, ...; C02 is free"""
+    return {
+        "levelId": "strategies",
+        "grid": {
+            "dimensions": {"width": 5, "height": 3},
+            "layout": [
+                ["-", "-", "-", "-", "-"],
+                ["0", "0", "0", "0", "0"],
+                ["-", "-", "-", "-", "-"]
+            ]
+        },
+        "vehicles": [
+            {"id": f"C0{i + 1}", "type": "CAR", "length": 2, "position": {"x": 1, "y": y},
+             "orientation": "EAST", "movementRule": "STRAIGHT"}
+            for i, y in enumerate((0, 2))
+        ],
+        "obstacles": [
+            {"id": "L1", "type": "TRAFFIC_LIGHT", "position": {"x": 3, "y": 0}, "currentState": "RED",
+             "timing": {"redDuration": 5, "greenDuration": 1}}
+        ]
+    }
+
+
+def test_astar_finds_fewest_ticks():
+    graph, state = LevelLoader().load_level(lanes_level())
+    breadth_first = Solver(graph).solve(state)
+    best_first = Solver(graph, strategy="astar").solve(state)
+    assert breadth_first.solvable and best_first.solvable
+    # C02 leaves while C01 waits instead of after it
+    assert best_first.solution == ["C02", "C01"] and best_first.exit_ticks == [0, 5]
+    assert best_first.exit_ticks[-1] <= breadth_first.exit_ticks[-1]
+
+
+def test_astar_agrees_with_bfs_on_level_116():
+    with open(project_root / "docs" / "example.json") as f:
+        graph, state = LevelLoader().load_level(json.load(f))
+    expected = Solver(graph).solve(state)
+    for heuristic in ("remaining", "chain"):
+        result = Solver(graph, strategy="astar", heuristic=heuristic).solve(state)
+        assert result.solvable == expected.solvable
+        assert result.total_moves == expected.total_moves
+        assert result.stats["statesExplored"] <= expected.stats["statesExplored"]
+
+
+def test_unknown_strategy_is_rejected():
+    graph, _ = LevelLoader().load_level(lanes_level())
+    try:
+        Solver(graph, strategy="dfs")
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError")
+
+
+def test_greedy_agrees_with_bfs_on_level_116():
+    with open(project_root / "docs" / "example.json") as f:
+        graph, state = LevelLoader().load_level(json.load(f))
+    expected = Solver(graph).solve(state)
+    result = Solver(graph, strategy="greedy").solve(state)
+    assert result.solvable == expected.solvable
+    assert sorted(result.solution) == sorted(expected.solution)
+
+
+def test_engine_is_selected_from_level_features():
+    with open(project_root / "docs" / "example.json") as f:
+        level = json.load(f)
+    _, state = LevelLoader().load_level(level)
+    assert select_strategy(state) == "greedy"
+    _, timed_state = LevelLoader().load_level(lanes_level())
+    assert select_strategy(timed_state) == "astar"
+
+    automatic = validate_level(level)
+    forced = validate_level(level, engine="bfs")
+    assert automatic["engine"] == "greedy" and forced["engine"] == "bfs"
+    assert automatic["solvable"] == forced["solvable"]
+    assert validate_level(lanes_level())["engine"] == "astar"
+
+
+def test_forced_engine_is_checked():
+    assert validate_level(lanes_level(), engine="dfs")["error"]["code"] == "INVALID_REQUEST"
+    assert validate_level(lanes_level(), engine="greedy")["error"]["code"] == "VALIDATION_ERROR"
+
+
+
+def test_iddfs_agrees_with_bfs():
+    blocked = lanes_level()
+    blocked["obstacles"].append({"id": "O1", "type": "BOULDER", "position": {"x": 4, "y": 2}})
+    with open(project_root / "docs" / "example.json") as f:
+        level_116 = json.load(f)
+    for level in (lanes_level(), blocked, level_116):
+        graph, state = LevelLoader().load_level(level)
+        expected = Solver(graph).solve(state)
+        # Also without the transposition table, and with one far too small
+        for table_size in (1 << 10, 0, 2):
+            result = Solver(graph, strategy="iddfs", table_size=table_size).solve(state)
+            assert result.solvable == expected.solvable
+            assert result.total_moves == expected.total_moves
+
+
+def test_parallel_is_deterministic_across_worker_counts():
+    blocked = lanes_level()
+    blocked["obstacles"].append({"id": "O1", "type": "BOULDER", "position": {"x": 4, "y": 2}})
+    with open(project_root / "docs" / "example.json") as f:
+        level_116 = json.load(f)
+    for level in (lanes_level(), blocked, level_116):
+        graph, state = LevelLoader().load_level(level)
+        expected = Solver(graph).solve(state)
+        results = [Solver(graph, strategy="parallel", workers=workers).solve(state) for workers in (1, 3)]
+        for result in results:
+            assert result.solvable == expected.solvable
+            assert result.total_moves == expected.total_moves
+            assert result.stats["peakVisited"] == results[0].stats["peakVisited"]
+        assert results[0].solution == results[1].solution
+        assert results[0].exit_ticks == results[1].exit_ticks
+
+
+def test_vectorized_movability_matches_python():
+    with open(project_root / "docs" / "example.json") as f:
+        graph, state = LevelLoader().load_level(json.load(f))
+    expected = Solver(graph, vectorize=False).solve(state)
+    if load_numpy() is None:
+        # Without NumPy the default falls back to the pure-Python check
+        assert Solver(graph).solve(state).solution == expected.solution
+        return
+    result = Solver(graph, vectorize=True).solve(state)
+    assert result.solution == expected.solution
+    assert result.stats == expected.stats
@@ -0,0 +1,90 @@
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+app_dir = project_root / 'app'
+sys.path.append(str(app_dir))
+
+from services.validator import validate_level # type: ignore
+from core.timeline import Timeline # type: ignore
+from models.graph import Position # type: ignore
+from models.obstacles import TrafficLight, LightState # type: ignore
+
+
+def light(light_id, x, y, state, red, green, timer=None):
+    timing = {"redDuration": red, "greenDuration": green}
+    if timer is not None:
+        timing["currentTimer"] = timer
+    return {"id": light_id, "type": "TRAFFIC_LIGHT", "position": {"x": x, "y": y},
+            "currentState": state, "timing": timing}
+
+
+def car(vehicle_id, y):
+    return {"id": vehicle_id, "type": "CAR", "length": 2, "position": {"x": 1, "y": y},
+            "orientation": "EAST", "movementRule": "STRAIGHT"}
+
+
+def two_lane_level(level_id, vehicles, obstacles):
+    """Two independent eastbound lanes (rows 0 and 2)"""
+    return {
+        "levelId": level_id,
+        "grid": {
+            "dimensions": {"width": 5, "height": 3},
+            "layout": [
+                ["-", "-", "-", "-", "-"],
+                ["0", "0", "0", "0", "0"],
+                ["-", "-", "-", "-", "-"]
+            ]
+        },
+        "vehicles": vehicles,
+        "obstacles": obstacles
+    }
+
+
+def test_light_schedule():
+    # GREEN for 1 more tick, then RED for 3 and GREEN for 2
+    signal = TrafficLight("L", Position(0, 0), LightState.GREEN, 3, 2, 1)
+    assert [signal.is_red_at(tick) for tick in range(6)] == [False, True, True, True, False, False]
+
+    timeline = Timeline([signal])
+    assert timeline.period == 5
+    mask = timeline.path_mask([Position(0, 0), Position(1, 0)])
+    assert mask == timeline.cells[Position(0, 0)]
+    assert timeline.next_clear(mask, 0) == 4
+    assert timeline.next_clear(mask, 4) == 9
+
+
+def test_vehicle_waits_for_green():
+    result = validate_level(two_lane_level("wait", [car("C01", 0)], [light("L1", 3, 0, "RED", 3, 2)]))
+    assert result["solvable"] is True
+    assert result["solution"] == ["C01"] and result["exitTicks"] == [3]
+
+
+def test_exit_order_follows_light_timing():
+    # L1 is green only at tick 0, so C01 must go first; L2 turns green at tick 1
+    result = validate_level(two_lane_level(
+        "timing", [car("C01", 0), car("C02", 2)],
+        [light("L1", 3, 0, "GREEN", 5, 1), light("L2", 3, 2, "RED", 1, 5)]))
+    assert result["solution"] == ["C01", "C02"] and result["exitTicks"] == [0, 1]
+
+
+def test_light_behind_boulder_is_unsolvable():
+    result = validate_level(two_lane_level(
+        "stuck", [car("C01", 0)],
+        [light("L1", 3, 0, "GREEN", 2, 2), {"id": "OB01", "type": "BOULDER", "position": {"x": 4, "y": 0}}]))
+    assert result["solvable"] is False
+    assert result["blockingDetails"][0]["blockedBy"] == "OB01"
+
+
+def test_invalid_timing_is_rejected():
+    result = validate_level(two_lane_level("bad", [car("C01", 0)], [light("L1", 3, 0, "RED", 2, 2, timer=3)]))
+    assert result["error"]["code"] == "VALIDATION_ERROR"
+
+
+def test_binary_level_keeps_light_schedule():
+    from services.level_codec import encode_level # type: ignore
+    level = two_lane_level("binary", [car("C01", 0)], [light("L1", 3, 0, "RED", 3, 1, timer=2)])
+    result = validate_level(encode_level(level))
+    assert result["exitTicks"] == validate_level(level)["exitTicks"] == [2]